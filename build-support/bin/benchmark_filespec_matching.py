@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Compares matching many paths against many Filespecs one at a time, and in a single batch.
+
+Run with `./pants run build-support/bin:benchmark_filespec_matching -- --help`.
+"""
+
+import argparse
+import time
+from typing import List, Tuple
+
+from pants.source.filespec import Filespec, FilespecMatcher, matches_filespecs
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark Filespec glob matching.")
+    parser.add_argument(
+        "--targets", type=int, default=10000, help="The number of Filespecs (one per target)."
+    )
+    parser.add_argument("--paths", type=int, default=10000, help="The number of paths to match.")
+    return parser
+
+
+def generate(num_targets: int, num_paths: int) -> Tuple[List[Filespec], Tuple[str, ...]]:
+    """Generate one Filespec per target directory, and paths spread evenly across directories."""
+    specs: List[Filespec] = [
+        {"includes": [f"src/dir{i}/*.py"], "excludes": [f"src/dir{i}/*_test.py"]}
+        for i in range(num_targets)
+    ]
+    paths = tuple(f"src/dir{i % num_targets}/file{i}.py" for i in range(num_paths))
+    return specs, paths
+
+
+def time_call(func) -> float:
+    start = time.time()
+    func()
+    return time.time() - start
+
+
+def main() -> None:
+    args = create_parser().parse_args()
+    specs, paths = generate(args.targets, args.paths)
+
+    compile_elapsed = time_call(lambda: [FilespecMatcher.create(spec) for spec in specs])
+    matchers = [FilespecMatcher.create(spec) for spec in specs]
+    individual_elapsed = time_call(lambda: [matcher.matches(paths) for matcher in matchers])
+    batch_elapsed = time_call(lambda: matches_filespecs(specs, paths=paths))
+
+    print(f"Matching {len(paths)} paths against {len(specs)} Filespecs:")
+    print(f"  compiling matchers:        {compile_elapsed:.3f}s")
+    print(f"  one native call per spec:  {individual_elapsed:.3f}s")
+    print(f"  single batched call:       {batch_elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
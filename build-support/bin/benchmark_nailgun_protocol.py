@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Measures nailgun chunk framing throughput over a local socketpair.
+
+Run with `./pants run build-support/bin:benchmark_nailgun_protocol -- --help`.
+"""
+
+import argparse
+import socket
+import threading
+import time
+
+from pants.java.nailgun_protocol import ChunkType, NailgunProtocol
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark nailgun protocol chunk framing.")
+    parser.add_argument(
+        "--chunk-size", type=int, default=64 * 1024, help="The payload size of each chunk in bytes."
+    )
+    parser.add_argument(
+        "--total-size",
+        type=int,
+        default=512 * 1024 * 1024,
+        help="The total number of payload bytes to send.",
+    )
+    return parser
+
+
+def run(chunk_size: int, total_size: int) -> float:
+    """Streams `total_size` bytes of stdout chunks, and returns the elapsed time in seconds."""
+    num_chunks = max(1, total_size // chunk_size)
+    payload = b"x" * chunk_size
+    reader, writer = socket.socketpair()
+
+    def send_all() -> None:
+        for _ in range(num_chunks):
+            NailgunProtocol.send_stdout(writer, payload)
+        NailgunProtocol.send_exit_with_code(writer, 0)
+
+    start = time.time()
+    sender = threading.Thread(target=send_all, daemon=True)
+    sender.start()
+    received = 0
+    while True:
+        chunk_type, chunk = NailgunProtocol.read_chunk(reader, return_bytes=True)
+        if chunk_type == ChunkType.EXIT:
+            break
+        received += len(chunk)
+    elapsed = time.time() - start
+    sender.join()
+    reader.close()
+    writer.close()
+    assert received == num_chunks * chunk_size
+    return elapsed
+
+
+def main() -> None:
+    args = create_parser().parse_args()
+    elapsed = run(args.chunk_size, args.total_size)
+    mb = args.total_size / (1024 * 1024)
+    print(
+        f"Sent {mb:.0f} MiB in {args.chunk_size}-byte chunks in {elapsed:.3f}s "
+        f"({mb / elapsed:.1f} MiB/s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Times the edit-run loop of a `python_binary`, with and without incremental PEX assembly.
+
+Each iteration edits a first-party source of the binary, and then runs `./pants run` (or
+`./pants binary`) on it. For example:
+
+    ./pants run build-support/bin:benchmark_python_run_loop -- \
+        --target=src/python/pants/bin:pants_local_binary \
+        --source=src/python/pants/bin/pants_loader.py \
+        -- --version
+"""
+
+import argparse
+import statistics
+import subprocess
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the edit-run loop of a python_binary.")
+    parser.add_argument("--target", required=True, help="The address of the python_binary.")
+    parser.add_argument(
+        "--source", required=True, help="A first-party source of the binary, to edit between runs."
+    )
+    parser.add_argument("--goal", choices=("run", "binary"), default="run")
+    parser.add_argument("--iterations", type=int, default=5, help="The number of edit-runs.")
+    parser.add_argument(
+        "args", nargs="*", help="Arguments to pass to the binary (for the `run` goal only)."
+    )
+    return parser
+
+
+def time_edit_runs(
+    *, source: Path, pants_args: Sequence[str], iterations: int, original: str
+) -> List[float]:
+    # Warm up: the first run also resolves requirements, which we are not interested in.
+    subprocess.run(pants_args, check=True, stdout=subprocess.DEVNULL)
+    timings = []
+    for i in range(iterations):
+        source.write_text(f"{original}\n# Edit {i} at {time.time()}.\n")
+        start = time.time()
+        subprocess.run(pants_args, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.time() - start)
+    return timings
+
+
+def main() -> None:
+    args = create_parser().parse_args()
+    source = Path(args.source)
+    original = source.read_text()
+    run_args = ["--", *args.args] if args.goal == "run" and args.args else []
+    try:
+        for label, flags in (("full", []), ("incremental", ["--python-binary-incremental"])):
+            pants_args = ["./pants", *flags, args.goal, args.target, *run_args]
+            timings = time_edit_runs(
+                source=source, pants_args=pants_args, iterations=args.iterations, original=original
+            )
+            print(
+                f"{label:>12}: mean {statistics.mean(timings):.3f}s, "
+                f"min {min(timings):.3f}s, max {max(timings):.3f}s "
+                f"over {len(timings)} edit-{args.goal}s"
+            )
+    finally:
+        source.write_text(original)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
 from abc import ABCMeta
 from dataclasses import dataclass
 from textwrap import dedent
+from typing import Optional, cast
 
 from pants.core.util_rules.distdir import DistDir
 from pants.engine.console import Console
@@ -24,6 +25,9 @@ class CreatedAWSLambda:
     zip_file_relpath: str
     runtime: str
     handler: str
+    # The layer of third-party requirements that the code bundle must be deployed with, if any.
+    # The layer is contained in `digest`, and may be shared by several code bundles.
+    layer_relpath: Optional[str] = None
 
 
 @union
@@ -36,6 +40,25 @@ class AWSLambdaSubsystem(LineOriented, GoalSubsystem):
 
     name = "awslambda"
 
+    @classmethod
+    def register_options(cls, register):
+        super().register_options(register)
+        register(
+            "--layered",
+            type=bool,
+            default=False,
+            help=(
+                "Package the third-party requirements of each function into a separate AWS "
+                "Lambda layer, rather than into the code bundle of the function. Functions with "
+                "the same runtime and requirements share a single layer, which is only built "
+                "once, and the code bundles then contain only first-party code."
+            ),
+        )
+
+    @property
+    def layered(self) -> bool:
+        return cast(bool, self.options.layered)
+
 
 class AWSLambdaGoal(Goal):
     subsystem_cls = AWSLambdaSubsystem
@@ -65,14 +88,20 @@ async def create_awslambda(
     with awslambda_subsystem.line_oriented(console) as print_stdout:
         for awslambda in awslambdas:
             output_path = distdir.relpath / awslambda.zip_file_relpath
+            layer_line = (
+                f"\n  Layer: {distdir.relpath / awslambda.layer_relpath}"
+                if awslambda.layer_relpath
+                else ""
+            )
             print_stdout(
                 dedent(
                     f"""\
                     Wrote code bundle to {output_path}
                       Runtime: {awslambda.runtime}
-                      Handler: {awslambda.handler}
-                    """
+                      Handler: {awslambda.handler}"""
                 )
+                + layer_line
+                + "\n"
             )
     return AWSLambdaGoal(exit_code=0)
 
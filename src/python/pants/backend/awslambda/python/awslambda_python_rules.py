@@ -1,10 +1,14 @@
 # Copyright 2019 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import hashlib
+import json
 from dataclasses import dataclass
+from typing import Optional, Tuple
 
 from pants.backend.awslambda.common.awslambda_common_rules import (
     AWSLambdaFieldSet,
+    AWSLambdaSubsystem,
     CreatedAWSLambda,
 )
 from pants.backend.awslambda.python.lambdex import Lambdex
@@ -27,9 +31,9 @@ from pants.backend.python.rules.pex_from_targets import (
     TwoStepPexFromTargetsRequest,
 )
 from pants.core.util_rules import strip_source_roots
-from pants.engine.fs import Digest, MergeDigests
+from pants.engine.fs import EMPTY_DIGEST, AddPrefix, CreateDigest, Digest, FileContent, MergeDigests
 from pants.engine.process import ProcessResult
-from pants.engine.rules import Get, collect_rules, rule
+from pants.engine.rules import Get, MultiGet, collect_rules, rule
 from pants.engine.unions import UnionRule
 
 
@@ -46,39 +50,172 @@ class LambdexSetup:
     requirements_pex: Pex
 
 
-@rule(desc="Create Python AWS Lambda")
-async def create_python_awslambda(
-    field_set: PythonAwsLambdaFieldSet, lambdex_setup: LambdexSetup
-) -> CreatedAWSLambda:
-    # Lambdas typically use the .zip suffix, so we use that instead of .pex.
-    pex_filename = f"{field_set.address.target_name}.zip"
+# Ensure we can resolve manylinux wheels in addition to any AMI-specific wheels, and when we're
+# executing Pex on Linux, allow a local interpreter to be resolved if available and matching the
+# AMI platform.
+_PLATFORM_RESOLVE_ARGS = ("--manylinux=manylinux2014", "--resolve-local-platforms")
+
+# The module that the handler shim of a layered lambda is written to: the AWS-facing handler
+# function of a layered lambda is always `pants_lambda_handler.handler`.
+_HANDLER_SHIM_MODULE = "pants_lambda_handler"
+
+HANDLER_SHIM = """\
+from {module} import {function} as _handler
+
+
+def handler(event, context):
+    return _handler(event, context)
+"""
+
+# Builds the zips of layered lambdas, deterministically: entries are sorted, timestamps are fixed
+# and permissions are normalized, so that the same inputs always produce byte-identical zips.
+#
+# `layer` mode copies the installed distributions in the `.deps` of a requirements-only PEX into
+# the `python/` directory of a zip, which is where AWS Lambda expects to find them in a layer.
+# `function` mode zips the contents of a directory.
+PACKAGER_SCRIPT = """\
+import os
+import sys
+import zipfile
+
+
+def layer_entries(pex_path):
+    entries = {}
+    with zipfile.ZipFile(pex_path) as pex:
+        for info in pex.infolist():
+            parts = info.filename.split("/", 2)
+            if len(parts) < 3 or parts[0] != ".deps" or info.filename.endswith("/"):
+                continue
+            executable = bool((info.external_attr >> 16) & 0o111)
+            entries.setdefault("python/" + parts[2], (pex.read(info), executable))
+    return entries
+
+
+def function_entries(directory):
+    entries = {}
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, "rb") as fp:
+                entries[os.path.relpath(path, directory)] = (fp.read(), os.access(path, os.X_OK))
+    return entries
+
+
+def write_zip(dest, entries):
+    with zipfile.ZipFile(dest, "w") as zf:
+        for arcname in sorted(entries):
+            data, executable = entries[arcname]
+            info = zipfile.ZipInfo(arcname, date_time=(1980, 1, 1, 0, 0, 0))
+            info.external_attr = (0o100755 if executable else 0o100644) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, data)
+
+
+if __name__ == "__main__":
+    mode, src, dest = sys.argv[1:]
+    write_zip(dest, layer_entries(src) if mode == "layer" else function_entries(src))
+"""
+
+
+def lambda_platform(runtime: PythonAwsLambdaRuntime) -> str:
+    """Returns the Pex platform string of the given AWS Lambda runtime."""
     # We hardcode the platform value to the appropriate one for each AWS Lambda runtime.
     # (Running the "hello world" lambda in the example code will report the platform, and can be
     # used to verify correctness of these platform strings.)
-    py_major, py_minor = field_set.runtime.to_interpreter_version()
+    py_major, py_minor = runtime.to_interpreter_version()
     platform = f"linux_x86_64-cp-{py_major}{py_minor}-cp{py_major}{py_minor}"
     # set pymalloc ABI flag - this was removed in python 3.8 https://bugs.python.org/issue36707
     if py_major <= 3 and py_minor < 8:
         platform += "m"
     if (py_major, py_minor) == (2, 7):
         platform += "u"
-    pex_request = TwoStepPexFromTargetsRequest(
-        PexFromTargetsRequest(
-            addresses=[field_set.address],
-            entry_point=None,
-            output_filename=pex_filename,
-            platforms=PexPlatforms([platform]),
-            additional_args=[
-                # Ensure we can resolve manylinux wheels in addition to any AMI-specific wheels.
-                "--manylinux=manylinux2014",
-                # When we're executing Pex on Linux, allow a local interpreter to be resolved if
-                # available and matching the AMI platform.
-                "--resolve-local-platforms",
-            ],
+    return platform
+
+
+def parse_handler(handler: str) -> Tuple[str, str]:
+    """Parses a handler of the form `module.dotted.name[:handler_func]`, as accepted by lambdex."""
+    module, _, function = handler.partition(":")
+    return module, function or "handler"
+
+
+@dataclass(frozen=True)
+class LambdaPackager:
+    """A PEX and script used to build the zips of layered lambdas."""
+
+    pex: Pex
+    script_digest: Digest
+
+    script_name = "lambda_packager.py"
+
+    def process(
+        self, mode: str, src: str, dest: str, input_digest: Digest, description: str
+    ) -> PexProcess:
+        return PexProcess(
+            self.pex,
+            argv=(self.script_name, mode, src, dest),
+            input_digest=input_digest,
+            output_files=(dest,),
+            description=description,
         )
+
+
+@dataclass(frozen=True)
+class PythonAwsLambdaLayerRequest:
+    """A request for a layer of the given third-party requirements, for the given platform.
+
+    NB: This deliberately contains nothing specific to any one lambda, so that lambdas with the
+    same runtime and requirements share a single (memoized) layer.
+    """
+
+    platform: str
+    requirements: PexRequirements
+
+    @property
+    def zip_file_relpath(self) -> str:
+        key = json.dumps([self.platform, list(self.requirements)]).encode()
+        return f"awslambda_layers/{self.platform}-{hashlib.sha256(key).hexdigest()[:16]}.zip"
+
+
+@dataclass(frozen=True)
+class PythonAwsLambdaLayer:
+    digest: Digest
+    zip_file_relpath: str
+
+
+@dataclass(frozen=True)
+class LayeredPythonAwsLambdaRequest:
+    field_set: PythonAwsLambdaFieldSet
+    platform: str
+    pex_from_targets_request: PexFromTargetsRequest
+
+
+@rule(desc="Create Python AWS Lambda")
+async def create_python_awslambda(
+    field_set: PythonAwsLambdaFieldSet,
+    awslambda_subsystem: AWSLambdaSubsystem,
+    lambdex_setup: LambdexSetup,
+) -> CreatedAWSLambda:
+    # Lambdas typically use the .zip suffix, so we use that instead of .pex.
+    pex_filename = f"{field_set.address.target_name}.zip"
+    platform = lambda_platform(field_set.runtime)
+    pex_from_targets_request = PexFromTargetsRequest(
+        addresses=[field_set.address],
+        entry_point=None,
+        output_filename=pex_filename,
+        platforms=PexPlatforms([platform]),
+        additional_args=_PLATFORM_RESOLVE_ARGS,
     )
+    if awslambda_subsystem.layered:
+        return await Get(
+            CreatedAWSLambda,
+            LayeredPythonAwsLambdaRequest(field_set, platform, pex_from_targets_request),
+        )
 
-    pex_result = await Get(TwoStepPex, TwoStepPexFromTargetsRequest, pex_request)
+    pex_result = await Get(
+        TwoStepPex,
+        TwoStepPexFromTargetsRequest,
+        TwoStepPexFromTargetsRequest(pex_from_targets_request),
+    )
     input_digest = await Get(
         Digest, MergeDigests((pex_result.pex.digest, lambdex_setup.requirements_pex.digest))
     )
@@ -104,6 +241,100 @@ async def create_python_awslambda(
     )
 
 
+@rule(desc="Create layered Python AWS Lambda")
+async def create_layered_python_awslambda(
+    request: LayeredPythonAwsLambdaRequest, packager: LambdaPackager
+) -> CreatedAWSLambda:
+    field_set = request.field_set
+    zip_filename = request.pex_from_targets_request.output_filename
+    # NB: We only use the PexRequest to compute the (stripped) sources and the requirements of the
+    # closure: no PEX containing the first-party sources is ever built.
+    pex_request = await Get(PexRequest, PexFromTargetsRequest, request.pex_from_targets_request)
+
+    layer: Optional[PythonAwsLambdaLayer] = None
+    if pex_request.requirements:
+        layer = await Get(
+            PythonAwsLambdaLayer,
+            PythonAwsLambdaLayerRequest(request.platform, pex_request.requirements),
+        )
+
+    module, function = parse_handler(field_set.handler.value)
+    shim_digest = await Get(
+        Digest,
+        CreateDigest(
+            [
+                FileContent(
+                    f"{_HANDLER_SHIM_MODULE}.py",
+                    HANDLER_SHIM.format(module=module, function=function).encode(),
+                )
+            ]
+        ),
+    )
+    function_dir = "function"
+    function_digest = await Get(
+        Digest, MergeDigests((pex_request.sources or EMPTY_DIGEST, shim_digest))
+    )
+    function_digest = await Get(Digest, AddPrefix(function_digest, function_dir))
+    input_digest = await Get(
+        Digest, MergeDigests((function_digest, packager.pex.digest, packager.script_digest))
+    )
+    result = await Get(
+        ProcessResult,
+        PexProcess,
+        packager.process(
+            "function",
+            function_dir,
+            zip_filename,
+            input_digest=input_digest,
+            description=f"Packaging {zip_filename}",
+        ),
+    )
+
+    output_digest = result.output_digest
+    if layer:
+        output_digest = await Get(Digest, MergeDigests((output_digest, layer.digest)))
+    return CreatedAWSLambda(
+        digest=output_digest,
+        zip_file_relpath=zip_filename,
+        runtime=field_set.runtime.value,
+        handler=f"{_HANDLER_SHIM_MODULE}.handler",
+        layer_relpath=layer.zip_file_relpath if layer else None,
+    )
+
+
+@rule(desc="Create Python AWS Lambda layer")
+async def create_python_awslambda_layer(
+    request: PythonAwsLambdaLayerRequest, packager: LambdaPackager
+) -> PythonAwsLambdaLayer:
+    requirements_pex_filename = "requirements.pex"
+    requirements_pex = await Get(
+        Pex,
+        PexRequest(
+            output_filename=requirements_pex_filename,
+            requirements=request.requirements,
+            platforms=PexPlatforms([request.platform]),
+            additional_args=_PLATFORM_RESOLVE_ARGS,
+        ),
+    )
+    input_digest = await Get(
+        Digest,
+        MergeDigests((requirements_pex.digest, packager.pex.digest, packager.script_digest)),
+    )
+    zip_file_relpath = request.zip_file_relpath
+    result = await Get(
+        ProcessResult,
+        PexProcess,
+        packager.process(
+            "layer",
+            requirements_pex_filename,
+            zip_file_relpath,
+            input_digest=input_digest,
+            description=f"Packaging AWS Lambda layer {zip_file_relpath}",
+        ),
+    )
+    return PythonAwsLambdaLayer(digest=result.output_digest, zip_file_relpath=zip_file_relpath)
+
+
 @rule(desc="Set up lambdex")
 async def setup_lambdex(lambdex: Lambdex) -> LambdexSetup:
     requirements_pex = await Get(
@@ -118,6 +349,23 @@ async def setup_lambdex(lambdex: Lambdex) -> LambdexSetup:
     return LambdexSetup(requirements_pex=requirements_pex,)
 
 
+@rule(desc="Set up lambda packager")
+async def setup_lambda_packager(lambdex: Lambdex) -> LambdaPackager:
+    # NB: The packager only uses the stdlib, so it runs in a requirements-free PEX.
+    script = FileContent(LambdaPackager.script_name, PACKAGER_SCRIPT.encode())
+    pex, script_digest = await MultiGet(
+        Get(
+            Pex,
+            PexRequest(
+                output_filename="lambda_packager.pex",
+                interpreter_constraints=PexInterpreterConstraints(lambdex.interpreter_constraints),
+            ),
+        ),
+        Get(Digest, CreateDigest([script])),
+    )
+    return LambdaPackager(pex=pex, script_digest=script_digest)
+
+
 def rules():
     return [
         *collect_rules(),
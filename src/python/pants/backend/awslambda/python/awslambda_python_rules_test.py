@@ -3,11 +3,14 @@
 
 import textwrap
 from io import BytesIO
-from typing import Tuple
+from typing import Dict, Tuple
 from zipfile import ZipFile
 
 from pants.backend.awslambda.common.awslambda_common_rules import CreatedAWSLambda
-from pants.backend.awslambda.python.awslambda_python_rules import PythonAwsLambdaFieldSet
+from pants.backend.awslambda.python.awslambda_python_rules import (
+    PythonAwsLambdaFieldSet,
+    parse_handler,
+)
 from pants.backend.awslambda.python.awslambda_python_rules import rules as awslambda_python_rules
 from pants.backend.awslambda.python.target_types import PythonAWSLambda
 from pants.backend.python.target_types import PythonLibrary
@@ -34,6 +37,13 @@ class TestPythonAWSLambdaCreation(ExternalToolTestBase):
         return [PythonAWSLambda, PythonLibrary]
 
     def create_python_awslambda(self, addr: str) -> Tuple[str, bytes]:
+        created_awslambda, contents = self.create_python_awslambda_contents(addr)
+        assert len(contents) == 1
+        return created_awslambda.zip_file_relpath, contents[created_awslambda.zip_file_relpath]
+
+    def create_python_awslambda_contents(
+        self, addr: str, *extra_args: str
+    ) -> Tuple[CreatedAWSLambda, Dict[str, bytes]]:
         target = self.request_single_product(WrappedTarget, Address.parse(addr)).target
         created_awslambda = self.request_single_product(
             CreatedAWSLambda,
@@ -43,6 +53,7 @@ class TestPythonAWSLambdaCreation(ExternalToolTestBase):
                     args=[
                         "--backend-packages=pants.backend.awslambda.python",
                         "--source-root-patterns=src/python",
+                        *extra_args,
                     ]
                 ),
             ),
@@ -50,8 +61,10 @@ class TestPythonAWSLambdaCreation(ExternalToolTestBase):
         created_awslambda_digest_contents = self.request_single_product(
             DigestContents, created_awslambda.digest
         )
-        assert len(created_awslambda_digest_contents) == 1
-        return created_awslambda.zip_file_relpath, created_awslambda_digest_contents[0].content
+        return (
+            created_awslambda,
+            {fc.path: fc.content for fc in created_awslambda_digest_contents},
+        )
 
     def test_create_hello_world_lambda(self) -> None:
         self.create_file(
@@ -91,3 +104,71 @@ class TestPythonAWSLambdaCreation(ExternalToolTestBase):
         names = set(zipfile.namelist())
         assert "lambdex_handler.py" in names
         assert "foo/bar/hello_world.py" in names
+
+    def test_create_layered_lambdas(self) -> None:
+        self.create_file(
+            "src/python/foo/bar/hello_world.py",
+            textwrap.dedent(
+                """
+                import six
+
+                def handler(event, context):
+                    print(six.text_type('Hello, World!'))
+                """
+            ),
+        )
+        self.create_file(
+            "src/python/foo/bar/BUILD",
+            textwrap.dedent(
+                """
+                python_requirement_library(
+                  name='six',
+                  requirements=['six==1.15.0'],
+                )
+
+                python_library(
+                  name='hello_world',
+                  sources=['hello_world.py'],
+                  dependencies=[':six'],
+                )
+
+                python_awslambda(
+                  name='hello_world_lambda',
+                  dependencies=[':hello_world'],
+                  handler='foo.bar.hello_world',
+                  runtime='python3.7'
+                )
+
+                python_awslambda(
+                  name='other_lambda',
+                  dependencies=[':hello_world'],
+                  handler='foo.bar.hello_world:handler',
+                  runtime='python3.7'
+                )
+                """
+            ),
+        )
+
+        created, contents = self.create_python_awslambda_contents(
+            "src/python/foo/bar:hello_world_lambda", "--awslambda-layered"
+        )
+        other_created, other_contents = self.create_python_awslambda_contents(
+            "src/python/foo/bar:other_lambda", "--awslambda-layered"
+        )
+        assert "pants_lambda_handler.handler" == created.handler
+        assert created.layer_relpath is not None
+        assert created.layer_relpath.startswith("awslambda_layers/")
+        # Both lambdas share the same layer, and their code bundles are identical.
+        assert created.layer_relpath == other_created.layer_relpath
+        assert contents[created.layer_relpath] == other_contents[created.layer_relpath]
+        assert contents["hello_world_lambda.zip"] == other_contents["other_lambda.zip"]
+
+        function_names = set(ZipFile(BytesIO(contents["hello_world_lambda.zip"])).namelist())
+        assert {"pants_lambda_handler.py", "foo/bar/hello_world.py"} == function_names
+        layer_names = set(ZipFile(BytesIO(contents[created.layer_relpath])).namelist())
+        assert "python/six.py" in layer_names
+
+
+def test_parse_handler() -> None:
+    assert ("foo.bar", "handler") == parse_handler("foo.bar")
+    assert ("foo.bar", "main") == parse_handler("foo.bar:main")
@@ -10,9 +10,9 @@ from typing import Any, Dict, Set, Tuple, cast
 from pants.base.exiter import PANTS_FAILED_EXIT_CODE, PANTS_SUCCEEDED_EXIT_CODE
 from pants.engine.collection import Collection
 from pants.engine.console import Console
-from pants.engine.fs import Digest, DigestContents, SourcesSnapshot
+from pants.engine.fs import Digest, DigestContents, DigestSubset, PathGlobs, SourcesSnapshot
 from pants.engine.goal import Goal, GoalSubsystem
-from pants.engine.rules import Get, collect_rules, goal_rule
+from pants.engine.rules import Get, MultiGet, collect_rules, goal_rule, rule
 from pants.option.subsystem import Subsystem
 from pants.util.frozendict import FrozenDict
 from pants.util.memo import memoized_method
@@ -49,11 +49,24 @@ class ValidateSubsystem(GoalSubsystem):
             default=DetailLevel.nonmatching,
             help="How much detail to emit to the console.",
         )
+        register(
+            "--batch-size",
+            type=int,
+            default=256,
+            advanced=True,
+            help="The number of files to validate in each batch. Results are memoized per batch, "
+            "so smaller batches are re-validated less often when files change, at the cost of "
+            "more overhead per file.",
+        )
 
     @property
     def detail_level(self) -> DetailLevel:
         return cast(DetailLevel, self.options.detail_level)
 
+    @property
+    def batch_size(self) -> int:
+        return cast(int, self.options.batch_size)
+
 
 class Validate(Goal):
     subsystem_cls = ValidateSubsystem
@@ -135,8 +148,12 @@ class SourceFileValidation(Subsystem):
         )
 
     @memoized_method
-    def get_multi_matcher(self):
-        return MultiMatcher(ValidationConfig.from_dict(self.options.config))
+    def get_validation_config(self) -> ValidationConfig:
+        return ValidationConfig.from_dict(self.options.config)
+
+    @memoized_method
+    def get_multi_matcher(self) -> "MultiMatcher":
+        return MultiMatcher(self.get_validation_config())
 
 
 @dataclass(frozen=True)
@@ -228,7 +245,7 @@ class MultiMatcher:
 
     def check_source_file(self, path, content):
         content_pattern_names, encoding = self.get_applicable_content_pattern_names(path)
-        matching, nonmatching = self.check_content(content_pattern_names, content, encoding)
+        matching, nonmatching = self.check_content(sorted(content_pattern_names), content, encoding)
         return RegexMatchResult(path, matching, nonmatching)
 
     def check_content(self, content_pattern_names, content, encoding):
@@ -243,10 +260,14 @@ class MultiMatcher:
         if not content_pattern_names or not encoding:
             return (), ()
 
+        # NB: Each pattern must still be searched for separately: combining them into a single
+        # alternation would not be equivalent, since the match of one pattern could consume text
+        # that another pattern needs, and inline flags like `(?m)` apply to a whole regex.
+        text = content.decode(encoding)
         matching = []
         nonmatching = []
         for content_pattern_name in content_pattern_names:
-            if self._content_matchers[content_pattern_name].matches(content.decode(encoding)):
+            if self._content_matchers[content_pattern_name].matches(text):
                 matching.append(content_pattern_name)
             else:
                 nonmatching.append(content_pattern_name)
@@ -277,6 +298,30 @@ class MultiMatcher:
         return applicable_content_pattern_names, content_encoding
 
 
+@dataclass(frozen=True)
+class SourceFileValidationRequest:
+    """A batch of files to validate against a config.
+
+    Results are memoized by the engine for each distinct digest and config, so a batch is only
+    re-validated when one of its files or the config changes.
+    """
+
+    digest: Digest
+    config: ValidationConfig
+
+
+@rule
+async def validate_source_files(request: SourceFileValidationRequest) -> RegexMatchResults:
+    # NB: Compiling the patterns for each batch is cheap relative to reading the batch's files, and
+    # `re` caches compiled patterns.
+    multi_matcher = MultiMatcher(request.config)
+    digest_contents = await Get(DigestContents, Digest, request.digest)
+    return RegexMatchResults(
+        multi_matcher.check_source_file(file_content.path, file_content.content)
+        for file_content in digest_contents
+    )
+
+
 # TODO: Consider switching this to `lint`. The main downside is that we would no longer be able to
 #  run on files with no owning targets, such as running on BUILD files.
 @goal_rule
@@ -286,23 +331,38 @@ async def validate(
     validate_subsystem: ValidateSubsystem,
     source_file_validation: SourceFileValidation,
 ) -> Validate:
+    config = source_file_validation.get_validation_config()
     multi_matcher = source_file_validation.get_multi_matcher()
-    digest_contents = await Get(DigestContents, Digest, sources_snapshot.snapshot.digest)
-    regex_match_results = RegexMatchResults(
-        multi_matcher.check_source_file(file_content.path, file_content.content)
-        for file_content in sorted(digest_contents, key=lambda fc: fc.path)
+    # Only files with applicable content patterns need to be read. Files are batched so that
+    # results can be memoized for unchanged batches.
+    paths = [
+        path
+        for path in sources_snapshot.snapshot.files
+        if multi_matcher.get_applicable_content_pattern_names(path)[0]
+    ]
+    batch_size = max(1, validate_subsystem.batch_size)
+    batch_digests = await MultiGet(
+        Get(
+            Digest,
+            DigestSubset(
+                sources_snapshot.snapshot.digest, PathGlobs.for_paths(paths[i : i + batch_size])
+            ),
+        )
+        for i in range(0, len(paths), batch_size)
     )
 
     detail_level = validate_subsystem.detail_level
     num_matched_all = 0
     num_nonmatched_some = 0
-    for rmr in regex_match_results:
+
+    def report(rmr: RegexMatchResult) -> None:
+        nonlocal num_matched_all, num_nonmatched_some
         if not rmr.matching and not rmr.nonmatching:
-            continue
+            return
         if detail_level == DetailLevel.names:
             if rmr.nonmatching:
                 console.print_stdout(rmr.path)
-            continue
+            return
 
         if rmr.nonmatching:
             icon = "X"
@@ -319,6 +379,16 @@ async def validate(
         ):
             console.print_stdout("{} {}:{}{}".format(icon, rmr.path, matched_msg, nonmatched_msg))
 
+    batch_results = await MultiGet(
+        Get(RegexMatchResults, SourceFileValidationRequest(digest, config))
+        for digest in batch_digests
+    )
+    # NB: Batches are contiguous ranges of the sorted paths, so reporting them in order reports
+    # files in sorted order.
+    for batch_result in batch_results:
+        for rmr in sorted(batch_result, key=lambda rmr: rmr.path):
+            report(rmr)
+
     if detail_level not in (DetailLevel.none, DetailLevel.names):
         console.print_stdout("\n{} files matched all required patterns.".format(num_matched_all))
         console.print_stdout(
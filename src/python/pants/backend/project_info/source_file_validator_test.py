@@ -3,12 +3,37 @@
 
 import textwrap
 import unittest
+from typing import Dict, List
 
 from pants.backend.project_info.source_file_validator import (
+    DetailLevel,
     Matcher,
     MultiMatcher,
     RegexMatchResult,
+    RegexMatchResults,
+    SourceFileValidation,
+    SourceFileValidationRequest,
+    ValidateSubsystem,
     ValidationConfig,
+    validate,
+    validate_source_files,
+)
+from pants.base.exiter import PANTS_FAILED_EXIT_CODE
+from pants.engine.fs import (
+    EMPTY_DIGEST,
+    Digest,
+    DigestContents,
+    DigestSubset,
+    FileContent,
+    Snapshot,
+    SourcesSnapshot,
+)
+from pants.testutil.engine.util import (
+    MockConsole,
+    MockGet,
+    create_goal_subsystem,
+    create_subsystem,
+    run_rule,
 )
 
 
@@ -155,3 +180,94 @@ class MultiMatcherTest(unittest.TestCase):
             "required_matches uses unknown content " "pattern names: unknown_content_pattern1",
         ):
             MultiMatcher(ValidationConfig.from_dict(bad_config2))
+
+
+class ValidateGoalTest(unittest.TestCase):
+    config = {
+        "path_patterns": [{"name": "python_src", "pattern": r"\.py$"}],
+        "content_patterns": [
+            {"name": "header", "pattern": "^# Copyright"},
+            {"name": "no_print", "pattern": r"print\(", "inverted": True},
+        ],
+        "required_matches": {"python_src": ("header", "no_print")},
+    }
+
+    files = {
+        "a.py": b"# Copyright\n",
+        "b.py": b"# Copyright\nprint('hi')\n",
+        "c.py": b"nothing\n",
+        "README.md": b"not validated\n",
+    }
+
+    def test_validate_source_files(self) -> None:
+        request = SourceFileValidationRequest(EMPTY_DIGEST, ValidationConfig.from_dict(self.config))
+        result = run_rule(
+            validate_source_files,
+            rule_args=[request],
+            mock_gets=[
+                MockGet(
+                    product_type=DigestContents,
+                    subject_type=Digest,
+                    mock=lambda _: DigestContents(
+                        FileContent(path, content) for path, content in self.files.items()
+                    ),
+                )
+            ],
+        )
+        assert sorted(result, key=lambda rmr: rmr.path) == [
+            RegexMatchResult("README.md", (), ()),
+            RegexMatchResult("a.py", ("header", "no_print"), ()),
+            RegexMatchResult("b.py", ("header",), ("no_print",)),
+            RegexMatchResult("c.py", ("no_print",), ("header",)),
+        ]
+
+    def test_validate_batches(self) -> None:
+        digests: Dict[Digest, List[str]] = {}
+
+        def subset(request: DigestSubset) -> Digest:
+            digest = Digest(str(len(digests)).rjust(64, "0"), len(digests))
+            digests[digest] = list(request.globs.globs)
+            return digest
+
+        validated: List[Digest] = []
+
+        def validate_batch(request: SourceFileValidationRequest) -> RegexMatchResults:
+            validated.append(request.digest)
+            multi_matcher = MultiMatcher(request.config)
+            return RegexMatchResults(
+                multi_matcher.check_source_file(path, self.files[path])
+                for path in digests[request.digest]
+            )
+
+        console = MockConsole(use_colors=False)
+        result = run_rule(
+            validate,
+            rule_args=[
+                console,
+                SourcesSnapshot(Snapshot(EMPTY_DIGEST, tuple(sorted(self.files)), ())),
+                create_goal_subsystem(
+                    ValidateSubsystem, detail_level=DetailLevel.all, batch_size=2,
+                ),
+                create_subsystem(SourceFileValidation, config=self.config),
+            ],
+            mock_gets=[
+                MockGet(product_type=Digest, subject_type=DigestSubset, mock=subset),
+                MockGet(
+                    product_type=RegexMatchResults,
+                    subject_type=SourceFileValidationRequest,
+                    mock=validate_batch,
+                ),
+            ],
+        )
+        assert result.exit_code == PANTS_FAILED_EXIT_CODE
+        # Files without applicable patterns are not read.
+        assert list(digests.values()) == [["a.py", "b.py"], ["c.py"]]
+        assert validated == list(digests)
+        assert console.stdout.getvalue().splitlines() == [
+            "V a.py: Matched: header,no_print",
+            "X b.py: Matched: header Didn't match: no_print",
+            "X c.py: Matched: no_print Didn't match: header",
+            "",
+            "1 files matched all required patterns.",
+            "2 files failed to match at least one required pattern.",
+        ]
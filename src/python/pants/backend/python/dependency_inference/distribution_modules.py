@@ -0,0 +1,181 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""An index of the top-level modules provided by resolved third-party distributions.
+
+The index is computed from the metadata of the distributions in a requirements-only PEX, by a
+process which reads the PEX. Both the PEX and that process are cached (and persisted) by the engine,
+so the index is only recomputed when the resolved distributions change.
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Tuple
+
+from pants.backend.python.rules import pex
+from pants.backend.python.rules.pex import Pex, PexRequest, PexRequirements
+from pants.backend.python.rules.pex_environment import PexEnvironment
+from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests
+from pants.engine.process import Process, ProcessResult
+from pants.engine.rules import Get, MultiGet, RootRule, collect_rules, rule
+from pants.python.python_requirement import PythonRequirement
+from pants.util.frozendict import FrozenDict
+from pants.util.logging import LogLevel
+from pants.util.strutil import pluralize
+
+logger = logging.getLogger(__name__)
+
+
+def canonicalize_project_name(name: str) -> str:
+    """Normalizes a project name as PEP 503 does, e.g. `Un_Normalized.Project` ->
+    `un-normalized-project`."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+# Prints a JSON object of the top-level modules of each distribution in a PEX, by the canonical
+# name of its project. The modules are read from the `top_level.txt` of the distribution if it has
+# one, and otherwise derived from the paths in its `RECORD`.
+#
+# NB: This must run under any interpreter that can bootstrap a PEX, including Python 2.7.
+INDEX_SCRIPT = r"""
+import json
+import re
+import sys
+import zipfile
+
+
+def canonicalize(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def modules_from_record(record):
+    modules = set()
+    for line in record.splitlines():
+        path = line.split(",", 1)[0]
+        top_level = path.split("/", 1)[0]
+        if (
+            not top_level
+            or top_level.startswith(".")
+            or top_level.endswith((".dist-info", ".data"))
+            or top_level == "__pycache__"
+        ):
+            continue
+        if "/" in path:
+            if re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", top_level):
+                modules.add(top_level)
+        else:
+            match = re.match(r"^([A-Za-z_][A-Za-z0-9_]*)(\.[^/]*)?\.(py|so|pyd)$", top_level)
+            if match:
+                modules.add(match.group(1))
+    return modules
+
+
+def index(pex_path):
+    top_levels = {}
+    records = {}
+    with zipfile.ZipFile(pex_path) as pex:
+        for name in pex.namelist():
+            # Installed distributions are at `.deps/<wheel>/<project>-<version>.dist-info/<file>`.
+            parts = name.split("/")
+            if len(parts) != 4 or parts[0] != ".deps" or not parts[2].endswith(".dist-info"):
+                continue
+            project = canonicalize(parts[2][: -len(".dist-info")].rsplit("-", 1)[0])
+            if parts[3] == "top_level.txt":
+                top_levels[project] = pex.read(name).decode("utf-8")
+            elif parts[3] == "RECORD":
+                records[project] = pex.read(name).decode("utf-8")
+    modules = {}
+    for project in set(top_levels) | set(records):
+        if project in top_levels:
+            found = set(
+                line.strip().replace("/", ".")
+                for line in top_levels[project].splitlines()
+                if line.strip()
+            )
+        else:
+            found = modules_from_record(records[project])
+        modules[project] = sorted(found)
+    return modules
+
+
+if __name__ == "__main__":
+    json.dump(index(sys.argv[1]), sys.stdout, sort_keys=True)
+"""
+
+
+@dataclass(frozen=True)
+class DistributionModulesRequest:
+    """Resolve the given requirements, and index the modules provided by their distributions.
+
+    NB: The resolve includes the transitive dependencies of the requirements, which are indexed as
+    well. Callers should only consult the index for the requirements that they asked for.
+    """
+
+    requirements: PexRequirements
+
+
+@dataclass(frozen=True)
+class DistributionModules:
+    """The top-level modules provided by each resolved distribution, by canonical project name."""
+
+    modules_by_project: FrozenDict[str, Tuple[str, ...]]
+
+    def modules_for(self, python_req: PythonRequirement) -> Tuple[str, ...]:
+        """The modules provided by the requirement, preferring any explicitly specified modules.
+
+        Falls back to the (defaulted) modules of the requirement if its distribution was not
+        indexed, or did not appear to provide any modules.
+        """
+        if python_req.has_explicit_modules:
+            return python_req.modules
+        return (
+            self.modules_by_project.get(canonicalize_project_name(python_req.project_name))
+            or python_req.modules
+        )
+
+
+@rule(desc="Index the modules of third-party distributions", level=LogLevel.DEBUG)
+async def index_distribution_modules(
+    request: DistributionModulesRequest, pex_environment: PexEnvironment
+) -> DistributionModules:
+    if not pex_environment.bootstrap_python or not request.requirements:
+        return DistributionModules(FrozenDict())
+    pex_filename = "distribution_modules.pex"
+    script_name = "__index_distribution_modules.py"
+    requirements_pex, script_digest = await MultiGet(
+        Get(
+            Pex,
+            PexRequest(
+                output_filename=pex_filename,
+                requirements=request.requirements,
+                description=(
+                    f"Resolving {pluralize(len(request.requirements), 'requirement')} to index "
+                    f"their modules: {', '.join(request.requirements)}"
+                ),
+            ),
+        ),
+        Get(Digest, CreateDigest([FileContent(script_name, INDEX_SCRIPT.encode())])),
+    )
+    input_digest = await Get(Digest, MergeDigests((requirements_pex.digest, script_digest)))
+    result = await Get(
+        ProcessResult,
+        Process(
+            argv=(pex_environment.bootstrap_python, script_name, pex_filename),
+            input_digest=input_digest,
+            env=pex_environment.environment_dict,
+            description=f"Indexing the modules of {', '.join(request.requirements)}",
+            level=LogLevel.DEBUG,
+        ),
+    )
+    modules_by_project = json.loads(result.stdout.decode())
+    return DistributionModules(
+        FrozenDict(
+            (project, tuple(modules)) for project, modules in sorted(modules_by_project.items())
+        )
+    )
+
+
+def rules():
+    return [*collect_rules(), *pex.rules(), RootRule(DistributionModulesRequest)]
@@ -5,6 +5,13 @@ from dataclasses import dataclass
 from pathlib import PurePath
 from typing import Dict, Optional, Set
 
+from pants.backend.python.dependency_inference import distribution_modules
+from pants.backend.python.dependency_inference.distribution_modules import (
+    DistributionModules,
+    DistributionModulesRequest,
+)
+from pants.backend.python.dependency_inference.subsystem import PythonInference
+from pants.backend.python.rules.pex import PexRequirements
 from pants.backend.python.target_types import PythonRequirementsField, PythonSources
 from pants.base.specs import AddressSpecs, DescendantAddresses
 from pants.core.util_rules.determine_source_files import SourceFilesRequest
@@ -99,15 +106,39 @@ class ThirdPartyModuleToAddressMapping:
 
 
 @rule
-async def map_third_party_modules_to_addresses() -> ThirdPartyModuleToAddressMapping:
+async def map_third_party_modules_to_addresses(
+    python_inference: PythonInference,
+) -> ThirdPartyModuleToAddressMapping:
     all_targets = await Get(Targets, AddressSpecs([DescendantAddresses("")]))
+    requirement_targets = tuple(
+        tgt for tgt in all_targets if tgt.has_field(PythonRequirementsField)
+    )
+    if python_inference.distribution_modules:
+        # NB: We resolve each target separately (rather than all requirements at once), so that
+        # conflicting requirements in different targets don't fail the resolve, and so that
+        # editing one target's requirements only invalidates its own resolve.
+        distribution_modules_per_target = await MultiGet(
+            Get(
+                DistributionModules,
+                DistributionModulesRequest(
+                    PexRequirements(
+                        str(python_req.requirement)
+                        for python_req in tgt[PythonRequirementsField].value
+                    )
+                ),
+            )
+            for tgt in requirement_targets
+        )
+    else:
+        distribution_modules_per_target = tuple(
+            DistributionModules(FrozenDict()) for _ in requirement_targets
+        )
+
     modules_to_addresses: Dict[str, Address] = {}
     modules_with_multiple_owners: Set[str] = set()
-    for tgt in all_targets:
-        if not tgt.has_field(PythonRequirementsField):
-            continue
+    for tgt, dist_modules in zip(requirement_targets, distribution_modules_per_target):
         for python_req in tgt[PythonRequirementsField].value:
-            for module in python_req.modules:
+            for module in dist_modules.modules_for(python_req):
                 if module in modules_to_addresses:
                     modules_with_multiple_owners.add(module)
                 else:
@@ -145,4 +176,4 @@ async def map_module_to_address(
 
 
 def rules():
-    return collect_rules()
+    return [*collect_rules(), *distribution_modules.rules()]
@@ -7,6 +7,11 @@ from typing import Optional
 
 import pytest
 
+from pants.backend.python.dependency_inference import distribution_modules
+from pants.backend.python.dependency_inference.distribution_modules import (
+    DistributionModules,
+    canonicalize_project_name,
+)
 from pants.backend.python.dependency_inference.module_mapper import (
     FirstPartyModuleToAddressMapping,
     PythonModule,
@@ -16,15 +21,16 @@ from pants.backend.python.dependency_inference.module_mapper import (
     map_module_to_address,
     map_third_party_modules_to_addresses,
 )
+from pants.backend.python.dependency_inference.subsystem import PythonInference
 from pants.backend.python.target_types import PythonLibrary, PythonRequirementLibrary
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.core.util_rules import determine_source_files, strip_source_roots
 from pants.engine.addresses import Address
-from pants.engine.rules import RootRule
+from pants.engine.rules import RootRule, SubsystemRule
 from pants.python.python_requirement import PythonRequirement
 from pants.testutil.engine.util import Params
+from pants.testutil.external_tool_test_base import ExternalToolTestBase
 from pants.testutil.option.util import create_options_bootstrapper
-from pants.testutil.test_base import TestBase
 from pants.util.frozendict import FrozenDict
 
 
@@ -74,7 +80,22 @@ def test_third_party_modules_mapping() -> None:
     assert mapping.address_for_module("pants.task.task.Task") == pants_addr
 
 
-class ModuleMapperTest(TestBase):
+def test_distribution_modules() -> None:
+    assert "un-normalized-project" == canonicalize_project_name("Un_Normalized.Project")
+    dist_modules = DistributionModules(
+        FrozenDict({"ansicolors": ("colors",), "pyyaml": ("_yaml", "yaml"), "empty": ()})
+    )
+    assert ("colors",) == dist_modules.modules_for(PythonRequirement("ansicolors==1.21"))
+    assert ("_yaml", "yaml") == dist_modules.modules_for(PythonRequirement("PyYAML"))
+    # Explicit modules take precedence over the index.
+    assert ("ansi",) == dist_modules.modules_for(PythonRequirement("ansicolors", modules=["ansi"]))
+    # Requirements that are not indexed, or that don't seem to provide any modules, fall back to
+    # the default module.
+    assert ("req1",) == dist_modules.modules_for(PythonRequirement("req1"))
+    assert ("empty",) == dist_modules.modules_for(PythonRequirement("empty"))
+
+
+class ModuleMapperTest(ExternalToolTestBase):
     @classmethod
     def alias_groups(cls) -> BuildFileAliases:
         return BuildFileAliases(objects={"python_requirement": PythonRequirement})
@@ -88,6 +109,8 @@ class ModuleMapperTest(TestBase):
             map_first_party_modules_to_addresses,
             map_module_to_address,
             map_third_party_modules_to_addresses,
+            *distribution_modules.rules(),
+            SubsystemRule(PythonInference),
             RootRule(PythonModule),
         )
 
@@ -167,6 +190,41 @@ class ModuleMapperTest(TestBase):
             }
         )
 
+    def test_map_third_party_modules_to_addresses_from_distributions(self) -> None:
+        self.add_to_build_file(
+            "3rdparty/python",
+            dedent(
+                """\
+                python_requirement_library(
+                  name='ansicolors',
+                  requirements=[python_requirement('ansicolors==1.1.8')],
+                )
+
+                python_requirement_library(
+                  name='pyyaml',
+                  requirements=[python_requirement('PyYAML==5.3.1', modules=['custom_yaml'])],
+                )
+                """
+            ),
+        )
+        result = self.request_single_product(
+            ThirdPartyModuleToAddressMapping,
+            Params(
+                create_options_bootstrapper(
+                    args=[
+                        "--backend-packages=pants.backend.python",
+                        "--python-infer-distribution-modules",
+                    ]
+                )
+            ),
+        )
+        assert result.mapping == FrozenDict(
+            {
+                "colors": Address.parse("3rdparty/python:ansicolors"),
+                "custom_yaml": Address.parse("3rdparty/python:pyyaml"),
+            }
+        )
+
     def test_map_module_to_address(self) -> None:
         options_bootstrapper = create_options_bootstrapper(
             args=["--source-root-patterns=['source_root1', 'source_root2', '/']"]
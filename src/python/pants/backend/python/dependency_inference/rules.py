@@ -3,12 +3,12 @@
 
 import itertools
 from pathlib import PurePath
-from typing import cast
 
 from pants.backend.python.dependency_inference import module_mapper
 from pants.backend.python.dependency_inference.import_parser import find_python_imports
 from pants.backend.python.dependency_inference.module_mapper import PythonModule, PythonModuleOwner
 from pants.backend.python.dependency_inference.python_stdlib.combined import combined_stdlib
+from pants.backend.python.dependency_inference.subsystem import PythonInference
 from pants.backend.python.rules import ancestor_files
 from pants.backend.python.rules.ancestor_files import AncestorFiles, AncestorFilesRequest
 from pants.backend.python.target_types import PythonSources, PythonTestsSources
@@ -25,57 +25,6 @@ from pants.engine.target import (
 )
 from pants.engine.unions import UnionRule
 from pants.option.global_options import OwnersNotFoundBehavior
-from pants.option.subsystem import Subsystem
-
-
-class PythonInference(Subsystem):
-    """Options controlling which dependencies will be inferred for Python targets."""
-
-    options_scope = "python-infer"
-
-    @classmethod
-    def register_options(cls, register):
-        super().register_options(register)
-        register(
-            "--imports",
-            default=True,
-            type=bool,
-            help=(
-                "Infer a target's imported dependencies by parsing import statements from sources."
-            ),
-        )
-        register(
-            "--inits",
-            default=True,
-            type=bool,
-            help=(
-                "Infer a target's dependencies on any __init__.py files existing for the packages "
-                "it is located in (recursively upward in the directory structure). Regardless of "
-                "whether inference is disabled, empty ancestor __init__.py files will still be "
-                "included even without an explicit dependency, but ones containing any code (even "
-                "just comments) will not, and must be brought in via an explicit dependency."
-            ),
-        )
-        register(
-            "--conftests",
-            default=True,
-            type=bool,
-            help=(
-                "Infer a test target's dependencies on any conftest.py files in parent directories."
-            ),
-        )
-
-    @property
-    def imports(self) -> bool:
-        return cast(bool, self.options.imports)
-
-    @property
-    def inits(self) -> bool:
-        return cast(bool, self.options.inits)
-
-    @property
-    def conftests(self) -> bool:
-        return cast(bool, self.options.conftests)
 
 
 class InferPythonDependencies(InferDependenciesRequest):
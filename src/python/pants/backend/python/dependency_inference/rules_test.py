@@ -23,11 +23,11 @@ from pants.engine.target import InferredDependencies, WrappedTarget
 from pants.python.python_requirement import PythonRequirement
 from pants.source.source_root import all_roots
 from pants.testutil.engine.util import Params
+from pants.testutil.external_tool_test_base import ExternalToolTestBase
 from pants.testutil.option.util import create_options_bootstrapper
-from pants.testutil.test_base import TestBase
 
 
-class PythonDependencyInferenceTest(TestBase):
+class PythonDependencyInferenceTest(ExternalToolTestBase):
     @classmethod
     def alias_groups(cls) -> BuildFileAliases:
         return BuildFileAliases(objects={"python_requirement": PythonRequirement})
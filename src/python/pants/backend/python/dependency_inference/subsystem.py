@@ -0,0 +1,75 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from typing import cast
+
+from pants.option.subsystem import Subsystem
+
+
+class PythonInference(Subsystem):
+    """Options controlling which dependencies will be inferred for Python targets."""
+
+    options_scope = "python-infer"
+
+    @classmethod
+    def register_options(cls, register):
+        super().register_options(register)
+        register(
+            "--imports",
+            default=True,
+            type=bool,
+            help=(
+                "Infer a target's imported dependencies by parsing import statements from sources."
+            ),
+        )
+        register(
+            "--inits",
+            default=True,
+            type=bool,
+            help=(
+                "Infer a target's dependencies on any __init__.py files existing for the packages "
+                "it is located in (recursively upward in the directory structure). Regardless of "
+                "whether inference is disabled, empty ancestor __init__.py files will still be "
+                "included even without an explicit dependency, but ones containing any code (even "
+                "just comments) will not, and must be brought in via an explicit dependency."
+            ),
+        )
+        register(
+            "--conftests",
+            default=True,
+            type=bool,
+            help=(
+                "Infer a test target's dependencies on any conftest.py files in parent directories."
+            ),
+        )
+
+        register(
+            "--distribution-modules",
+            default=False,
+            type=bool,
+            advanced=True,
+            help=(
+                "Determine the modules provided by third-party requirements from the metadata "
+                "(`top_level.txt`, or else `RECORD`) of their resolved distributions, rather than "
+                "assuming that each requirement provides a module named after its project. This "
+                "requires resolving the requirements of each `python_requirement_library` (which "
+                "is cached). Modules explicitly set via `python_requirement(modules=...)` or the "
+                "`module_mapping` of `python_requirements` take precedence."
+            ),
+        )
+
+    @property
+    def imports(self) -> bool:
+        return cast(bool, self.options.imports)
+
+    @property
+    def inits(self) -> bool:
+        return cast(bool, self.options.inits)
+
+    @property
+    def conftests(self) -> bool:
+        return cast(bool, self.options.conftests)
+
+    @property
+    def distribution_modules(self) -> bool:
+        return cast(bool, self.options.distribution_modules)
@@ -1,10 +1,9 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-import os
 from typing import Iterable, Mapping, Optional
 
-from pkg_resources import Requirement
+from pants.python.requirements_file import parse_requirements_file
 
 
 class PythonRequirements:
@@ -60,28 +59,12 @@ class PythonRequirements:
             `modules=["django"]`.
         """
 
-        requirements = []
-        repository = None
-
-        requirements_path = os.path.join(self._parse_context.rel_path, requirements_relpath)
-        with open(requirements_path, "r") as fp:
-            for line in fp:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    if not line.startswith("-"):
-                        requirements.append(line)
-                    else:
-                        # handle flags we know about
-                        flag_value = line.split(" ", 1)
-                        if len(flag_value) == 2:
-                            flag = flag_value[0].strip()
-                            value = flag_value[1].strip()
-                            if flag in ("-f", "--find-links"):
-                                if repository is not None:
-                                    raise ValueError(
-                                        "Only 1 --find-links url is supported per requirements file"
-                                    )
-                                repository = value
+        # NB: The file is read via the ParseContext so that the engine tracks it, and parsed
+        # results are memoized by the content of the file.
+        parsed = parse_requirements_file(self._parse_context.read_file(requirements_relpath))
+        if len(parsed.find_links) > 1:
+            raise ValueError("Only 1 --find-links url is supported per requirements file")
+        repository = parsed.find_links[0] if parsed.find_links else None
 
         requirements_file_target_name = requirements_relpath
         self._parse_context.create_object(
@@ -91,8 +74,7 @@ class PythonRequirements:
         )
         requirements_dep = f":{requirements_file_target_name}"
 
-        for req_str in requirements:
-            parsed_req = Requirement.parse(req_str)
+        for parsed_req in parsed.requirements:
             python_req_object = self._parse_context.create_object(
                 "python_requirement",
                 parsed_req,
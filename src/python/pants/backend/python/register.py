@@ -14,6 +14,7 @@ from pants.backend.python.rules import (
     ancestor_files,
     coverage,
     create_python_binary,
+    incremental_pex,
     pex,
     pex_cli,
     pex_environment,
@@ -62,6 +63,7 @@ def rules():
         *pex_from_targets.rules(),
         *pytest_runner.rules(),
         *create_python_binary.rules(),
+        *incremental_pex.rules(),
         *python_native_code.rules(),
         *repl.rules(),
         *run_python_binary.rules(),
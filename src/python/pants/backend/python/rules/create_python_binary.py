@@ -1,10 +1,14 @@
 # Copyright 2019 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import dataclasses
+import logging
 from dataclasses import dataclass
 from typing import Tuple
 
-from pants.backend.python.rules.pex import PexPlatforms, TwoStepPex
+from pants.backend.python.rules.incremental_pex import AppendSourcesToPexRequest
+from pants.backend.python.rules.pex import Pex, PexPlatforms, PexRequest, TwoStepPex
+from pants.backend.python.rules.pex_environment import PexEnvironment
 from pants.backend.python.rules.pex_from_targets import (
     PexFromTargetsRequest,
     TwoStepPexFromTargetsRequest,
@@ -24,10 +28,13 @@ from pants.backend.python.target_types import PythonPlatforms as PythonPlatforms
 from pants.core.goals.binary import BinaryFieldSet, CreatedBinary
 from pants.core.util_rules.determine_source_files import SourceFiles
 from pants.core.util_rules.strip_source_roots import StrippedSourceFiles
+from pants.engine.fs import EMPTY_DIGEST
 from pants.engine.rules import Get, collect_rules, rule
 from pants.engine.target import HydratedSources, HydrateSourcesRequest
 from pants.engine.unions import UnionRule
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class PythonBinaryFieldSet(BinaryFieldSet):
@@ -63,9 +70,25 @@ class PythonBinaryFieldSet(BinaryFieldSet):
         return tuple(args)
 
 
+def use_incremental_assembly(
+    python_binary_defaults: PythonBinaryDefaults, pex_environment: PexEnvironment
+) -> bool:
+    if not python_binary_defaults.incremental:
+        return False
+    if not pex_environment.bootstrap_python:
+        logger.warning(
+            "Ignoring `--python-binary-incremental`, because no bootstrap Python interpreter was "
+            "found from the option `interpreter_search_paths` in the `[python-setup]` scope."
+        )
+        return False
+    return True
+
+
 @rule
 async def create_python_binary(
-    field_set: PythonBinaryFieldSet, python_binary_defaults: PythonBinaryDefaults
+    field_set: PythonBinaryFieldSet,
+    python_binary_defaults: PythonBinaryDefaults,
+    pex_environment: PexEnvironment,
 ) -> CreatedBinary:
     entry_point = field_set.entry_point.value
     if entry_point is None:
@@ -79,19 +102,26 @@ async def create_python_binary(
             stripped_binary_sources.snapshot.files
         )
     output_filename = f"{field_set.address.target_name}.pex"
-    two_step_pex = await Get(
-        TwoStepPex,
-        TwoStepPexFromTargetsRequest(
-            PexFromTargetsRequest(
-                addresses=[field_set.address],
-                entry_point=entry_point,
-                platforms=PexPlatforms.create_from_platforms_field(field_set.platforms),
-                output_filename=output_filename,
-                additional_args=field_set.generate_additional_args(python_binary_defaults),
-            )
-        ),
+    pex_from_targets_request = PexFromTargetsRequest(
+        addresses=[field_set.address],
+        entry_point=entry_point,
+        platforms=PexPlatforms.create_from_platforms_field(field_set.platforms),
+        output_filename=output_filename,
+        additional_args=field_set.generate_additional_args(python_binary_defaults),
     )
-    pex = two_step_pex.pex
+    if use_incremental_assembly(python_binary_defaults, pex_environment):
+        pex_request = await Get(PexRequest, PexFromTargetsRequest, pex_from_targets_request)
+        # NB: The base PEX does not depend on the sources, so it is only rebuilt when the
+        # requirements (or settings) of the binary change.
+        base_pex_request = dataclasses.replace(
+            pex_request, output_filename="base.pex", sources=None
+        )
+        base_pex = await Get(Pex, PexRequest, base_pex_request)
+        sources = pex_request.sources or EMPTY_DIGEST
+        pex = await Get(Pex, AppendSourcesToPexRequest(base_pex, sources, output_filename))
+    else:
+        two_step_pex = await Get(TwoStepPex, TwoStepPexFromTargetsRequest(pex_from_targets_request))
+        pex = two_step_pex.pex
     return CreatedBinary(digest=pex.digest, binary_name=pex.output_filename)
 
 
@@ -0,0 +1,211 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Incremental assembly of PEXes from a cached base PEX and first-party sources.
+
+A PEX built by Pex itself is re-zipped from scratch, including all of its requirements, whenever any
+of its sources change. Instead, the helpers here start from a base PEX which does not contain any
+first-party sources (and so is only rebuilt when its requirements change), and either:
+
+ * append the sources to a copy of the base PEX, for `binary`. The copy is a plain byte copy of the
+   base, so only the (small) source entries are compressed.
+ * extract the base PEX into a loose directory that is run in place, next to the loose sources,
+   for `run`. Nothing is zipped at all.
+
+Both run small stdlib-only scripts with the bootstrap interpreter of the `PexEnvironment`, so they
+are only available when one was found.
+"""
+
+import shlex
+from dataclasses import dataclass
+
+from pants.backend.python.rules.pex import Pex
+from pants.backend.python.rules.pex_environment import PexEnvironment
+from pants.engine.fs import AddPrefix, CreateDigest, Digest, FileContent, MergeDigests
+from pants.engine.process import Process, ProcessResult
+from pants.engine.rules import Get, MultiGet, RootRule, collect_rules, rule
+from pants.util.logging import LogLevel
+
+# Copies a base PEX and appends the files of a directory to the copy, deterministically. Appended
+# entries are sorted and have fixed timestamps and permissions.
+#
+# The entries of the base PEX are not rewritten, except for PEX-INFO: its `code_hash` is updated to
+# cover the appended sources, since it keys the cache that the sources of a PEX may be extracted
+# to. Newer versions of Pex also key that cache by a `pex_hash`, which is additionally embedded in
+# `__main__.py`, so it is updated in both. Stale entries are dropped from the central directory, and
+# their replacements appended.
+#
+# NB: This must run under any interpreter that can bootstrap a PEX, including Python 2.7.
+APPEND_SCRIPT = """\
+import hashlib
+import json
+import os
+import shutil
+import sys
+import zipfile
+
+
+def append_sources(base, output, sources_dir):
+    shutil.copy(base, output)
+    sources = []
+    for dirpath, _, filenames in os.walk(sources_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            sources.append((os.path.relpath(path, sources_dir).replace(os.sep, "/"), path))
+    sources.sort()
+
+    code_hash = hashlib.sha1()
+    with zipfile.ZipFile(output, "a") as zf:
+
+        def pop(arcname):
+            stale = zf.getinfo(arcname)
+            data = zf.read(stale)
+            zf.filelist.remove(stale)
+            del zf.NameToInfo[arcname]
+            return data
+
+        def write(arcname, data):
+            info = zipfile.ZipInfo(arcname, date_time=(1980, 1, 1, 0, 0, 0))
+            info.external_attr = 0o100644 << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, data)
+
+        for arcname, path in sources:
+            with open(path, "rb") as fp:
+                data = fp.read()
+            code_hash.update(arcname.encode("utf-8"))
+            code_hash.update(data)
+            write(arcname, data)
+
+        pex_info = json.loads(pop("PEX-INFO").decode("utf-8"))
+        pex_info["code_hash"] = code_hash.hexdigest()
+        stale_pex_hash = pex_info.get("pex_hash")
+        if stale_pex_hash:
+            pex_hash = hashlib.sha1(stale_pex_hash.encode("utf-8"))
+            pex_hash.update(pex_info["code_hash"].encode("utf-8"))
+            pex_info["pex_hash"] = pex_hash.hexdigest()
+            main = pop("__main__.py").decode("utf-8")
+            write("__main__.py", main.replace(stale_pex_hash, pex_info["pex_hash"]).encode("utf-8"))
+        write("PEX-INFO", json.dumps(pex_info, sort_keys=True).encode("utf-8"))
+
+
+if __name__ == "__main__":
+    append_sources(*sys.argv[1:])
+"""
+
+# Runs a loose (extracted) PEX that is next to the launcher, with the bootstrap interpreter.
+LAUNCHER_SCRIPT = """\
+#!/bin/sh
+exec {bootstrap_python} "$(dirname "$0")/{pex_dir}" "$@"
+"""
+
+
+@dataclass(frozen=True)
+class AppendSourcesToPexRequest:
+    """Append the given sources to a copy of the base PEX, named `output_filename`.
+
+    The base PEX should not contain any sources.
+    """
+
+    base: Pex
+    sources: Digest
+    output_filename: str
+
+
+@dataclass(frozen=True)
+class LoosePexRequest:
+    """Extract the given PEX into a loose directory, to be run via an executable launcher."""
+
+    pex: Pex
+    launcher_name: str
+
+
+@dataclass(frozen=True)
+class LoosePex:
+    """A loose PEX directory, and the launcher (relative to the digest root) that runs it."""
+
+    digest: Digest
+    launcher_name: str
+
+
+def _bootstrap_python(pex_environment: PexEnvironment) -> str:
+    if not pex_environment.bootstrap_python:
+        raise ValueError(
+            "Incremental PEX assembly requires a bootstrap Python interpreter, but none was found "
+            "from the option `interpreter_search_paths` in the `[python-setup]` scope."
+        )
+    return pex_environment.bootstrap_python
+
+
+@rule(desc="Append sources to PEX", level=LogLevel.DEBUG)
+async def append_sources_to_pex(
+    request: AppendSourcesToPexRequest, pex_environment: PexEnvironment
+) -> Pex:
+    bootstrap_python = _bootstrap_python(pex_environment)
+    script_name = "__append_sources.py"
+    sources_dir = "__sources"
+    base_filename = f"__base.{request.base.output_filename}"
+    script_digest, sources_digest, base_digest = await MultiGet(
+        Get(Digest, CreateDigest([FileContent(script_name, APPEND_SCRIPT.encode())])),
+        Get(Digest, AddPrefix(request.sources, sources_dir)),
+        Get(Digest, AddPrefix(request.base.digest, base_filename)),
+    )
+    input_digest = await Get(Digest, MergeDigests((script_digest, sources_digest, base_digest)))
+    result = await Get(
+        ProcessResult,
+        Process(
+            argv=(
+                bootstrap_python,
+                script_name,
+                f"{base_filename}/{request.base.output_filename}",
+                request.output_filename,
+                sources_dir,
+            ),
+            input_digest=input_digest,
+            env=pex_environment.environment_dict,
+            output_files=(request.output_filename,),
+            description=f"Appending sources to {request.output_filename}",
+            level=LogLevel.DEBUG,
+        ),
+    )
+    return Pex(digest=result.output_digest, output_filename=request.output_filename)
+
+
+@rule(desc="Extract loose PEX", level=LogLevel.DEBUG)
+async def create_loose_pex(request: LoosePexRequest, pex_environment: PexEnvironment) -> LoosePex:
+    bootstrap_python = _bootstrap_python(pex_environment)
+    pex_filename = request.pex.output_filename
+    pex_dir = f"{pex_filename}-loose"
+    extract_result, launcher_digest = await MultiGet(
+        Get(
+            ProcessResult,
+            Process(
+                argv=(bootstrap_python, "-m", "zipfile", "-e", pex_filename, pex_dir),
+                input_digest=request.pex.digest,
+                env=pex_environment.environment_dict,
+                output_directories=(pex_dir,),
+                description=f"Extracting {pex_filename}",
+                level=LogLevel.DEBUG,
+            ),
+        ),
+        Get(
+            Digest,
+            CreateDigest(
+                [
+                    FileContent(
+                        request.launcher_name,
+                        LAUNCHER_SCRIPT.format(
+                            bootstrap_python=shlex.quote(bootstrap_python), pex_dir=pex_dir
+                        ).encode(),
+                        is_executable=True,
+                    )
+                ]
+            ),
+        ),
+    )
+    digest = await Get(Digest, MergeDigests((extract_result.output_digest, launcher_digest)))
+    return LoosePex(digest=digest, launcher_name=request.launcher_name)
+
+
+def rules():
+    return [*collect_rules(), RootRule(AppendSourcesToPexRequest), RootRule(LoosePexRequest)]
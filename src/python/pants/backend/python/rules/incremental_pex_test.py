@@ -0,0 +1,112 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import json
+import os
+import zipfile
+from typing import Dict
+
+from pants.backend.python.rules.incremental_pex import (
+    AppendSourcesToPexRequest,
+    LoosePex,
+    LoosePexRequest,
+)
+from pants.backend.python.rules.incremental_pex import rules as incremental_pex_rules
+from pants.backend.python.rules.pex import Pex, PexRequest
+from pants.backend.python.rules.pex import rules as pex_rules
+from pants.engine.fs import CreateDigest, Digest, FileContent, MergeDigests, Snapshot
+from pants.engine.process import Process, ProcessResult
+from pants.engine.rules import RootRule
+from pants.testutil.engine.util import Params
+from pants.testutil.external_tool_test_base import ExternalToolTestBase
+from pants.testutil.option.util import create_options_bootstrapper
+
+
+class IncrementalPexTest(ExternalToolTestBase):
+    @classmethod
+    def rules(cls):
+        return (
+            *super().rules(),
+            *pex_rules(),
+            *incremental_pex_rules(),
+            RootRule(PexRequest),
+        )
+
+    def request_with_options(self, product, subject):
+        options_bootstrapper = create_options_bootstrapper(
+            args=["--backend-packages=pants.backend.python"]
+        )
+        return self.request_single_product(product, Params(subject, options_bootstrapper))
+
+    def create_sources(self, files: Dict[str, str]) -> Digest:
+        return self.request_single_product(
+            Digest,
+            CreateDigest(FileContent(path, content.encode()) for path, content in files.items()),
+        )
+
+    def create_base_pex(self) -> Pex:
+        return self.request_with_options(
+            Pex, PexRequest(output_filename="base.pex", entry_point="main")
+        )
+
+    def append_and_run(self, base: Pex, sources: Digest) -> Dict:
+        pex = self.request_with_options(
+            Pex, AppendSourcesToPexRequest(base, sources, output_filename="app.pex")
+        )
+        self.scheduler.write_digest(pex.digest)
+        with zipfile.ZipFile(os.path.join(self.build_root, "app.pex")) as zf:
+            pex_info = json.loads(zf.read("PEX-INFO").decode())
+            files = zf.namelist()
+        result = self.request_single_product(
+            ProcessResult,
+            Process(
+                argv=("python", "app.pex"),
+                env={"PATH": os.getenv("PATH", "")},
+                input_digest=pex.digest,
+                description="Run the appended pex",
+            ),
+        )
+        return {"info": pex_info, "files": files, "stdout": result.stdout}
+
+    def test_append_sources(self) -> None:
+        base = self.create_base_pex()
+        first = self.append_and_run(
+            base,
+            self.create_sources({"main.py": "import lib.util", "lib/util.py": "print('one')"}),
+        )
+        assert b"one\n" == first["stdout"]
+        assert "main.py" in first["files"]
+        assert "lib/util.py" in first["files"]
+        assert 1 == first["files"].count("PEX-INFO")
+        assert "main" == first["info"]["entry_point"]
+
+        # Editing a source changes the code hash, which keys the cache of extracted sources.
+        second = self.append_and_run(
+            base,
+            self.create_sources({"main.py": "import lib.util", "lib/util.py": "print('two')"}),
+        )
+        assert b"two\n" == second["stdout"]
+        assert first["info"]["code_hash"] != second["info"]["code_hash"]
+
+    def test_loose_pex(self) -> None:
+        pex = self.request_with_options(Pex, PexRequest(output_filename="requirements.pex"))
+        loose_pex = self.request_with_options(
+            LoosePex, LoosePexRequest(pex, launcher_name="launcher")
+        )
+        sources = self.create_sources({"main.py": "print('loose')"})
+        digest = self.request_single_product(Digest, MergeDigests([loose_pex.digest, sources]))
+        snapshot = self.request_single_product(Snapshot, digest)
+        assert "launcher" in snapshot.files
+        assert "requirements.pex-loose/PEX-INFO" in snapshot.files
+        assert "requirements.pex" not in snapshot.files
+
+        result = self.request_single_product(
+            ProcessResult,
+            Process(
+                argv=("./launcher", "-m", "main"),
+                env={"PATH": os.getenv("PATH", ""), "PEX_EXTRA_SYS_PATH": "."},
+                input_digest=digest,
+                description="Run the loose pex",
+            ),
+        )
+        assert b"loose\n" == result.stdout
@@ -1,16 +1,22 @@
 # Copyright 2019 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import dataclasses
+import itertools
+import json
+import logging
 import os
+import subprocess
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Optional, Tuple
+from typing import Iterable, Mapping, Optional, Tuple, cast
 
 from pants.backend.python.subsystems import subprocess_environment
 from pants.backend.python.subsystems.subprocess_environment import SubprocessEnvironment
+from pants.base.build_environment import get_buildroot
 from pants.engine import process
 from pants.engine.engine_aware import EngineAware
-from pants.engine.process import BinaryPathRequest, BinaryPaths
-from pants.engine.rules import Get, MultiGet, collect_rules, rule
+from pants.engine.process import BinaryPathRequest, BinaryPaths, FallibleProcessResult, Process
+from pants.engine.rules import Get, MultiGet, RootRule, _uncacheable_rule, collect_rules, rule
 from pants.option.subsystem import Subsystem
 from pants.python.python_setup import PythonSetup
 from pants.util.frozendict import FrozenDict
@@ -19,6 +25,8 @@ from pants.util.memo import memoized_property
 from pants.util.ordered_set import OrderedSet
 from pants.util.strutil import create_path_env_var
 
+logger = logging.getLogger(__name__)
+
 
 class PexRuntimeEnvironment(Subsystem):
     """How Pants uses Pex to run Python subprocesses."""
@@ -110,6 +118,226 @@ class PexEnvironment(EngineAware):
         return f"Selected {self.bootstrap_python} to bootstrap PEXes with."
 
 
+# Prints the identity of the interpreter which runs it as JSON.
+#
+# NB: This must run under any interpreter that we might identify, including Python 2.7.
+_IDENTIFY_SCRIPT = """\
+import json, platform, sys
+implementation = platform.python_implementation()
+abi_tag = "{}{}{}{}".format(
+    {"CPython": "cp", "PyPy": "pp"}.get(implementation, "py"),
+    sys.version_info[0],
+    sys.version_info[1],
+    getattr(sys, "abiflags", ""),
+)
+json.dump(
+    {
+        "implementation": implementation,
+        "version": list(sys.version_info[:3]),
+        "abi_tag": abi_tag,
+    },
+    sys.stdout,
+)
+"""
+
+
+# Prints the resolved path of the interpreter which runs it.
+_RESOLVE_SCRIPT = "import os, sys; sys.stdout.write(os.path.realpath(sys.executable))"
+
+
+@dataclass(frozen=True)
+class PythonInterpreter:
+    """The identity of a Python interpreter binary."""
+
+    path: str
+    implementation: str
+    version: Tuple[int, int, int]
+    abi_tag: str
+
+    @property
+    def can_bootstrap_pex(self) -> bool:
+        """Whether the interpreter can run the bootstrap code of a PEX: Python 2.7 or 3.5+."""
+        return self.version[:2] == (2, 7) or self.version[:2] >= (3, 5)
+
+    def __str__(self) -> str:
+        return f"{self.implementation}-{'.'.join(str(v) for v in self.version)} ({self.path})"
+
+
+@dataclass(frozen=True)
+class PythonInterpreterFingerprintRequest:
+    path: str
+
+
+@dataclass(frozen=True)
+class PythonInterpreterFingerprint:
+    """The state on disk of a Python interpreter binary.
+
+    :param stat_key: The device, inode, mtime and size of the file that the path resolves to, or
+        None if it does not exist. An interpreter which is upgraded or replaced in place is
+        therefore identified again.
+    :param is_script: Whether the path is a script (e.g. a pyenv shim) which runs an interpreter.
+    """
+
+    path: str
+    stat_key: Optional[Tuple[int, int, int, int]]
+    is_script: bool
+
+
+@dataclass(frozen=True)
+class PythonInterpreterProbe:
+    """The result of running a Python interpreter binary to identify it."""
+
+    interpreter: Optional[PythonInterpreter] = None
+
+
+@dataclass(frozen=True)
+class PythonInterpreterScriptRequest:
+    path: str
+
+
+@dataclass(frozen=True)
+class ResolvedPythonInterpreterScript:
+    """The interpreter that a script (e.g. a pyenv shim) runs, in the current environment.
+
+    :param executable: The resolved path of the interpreter, or None if the script failed to run.
+    """
+
+    executable: Optional[str]
+
+
+@dataclass(frozen=True)
+class PythonInterpreterRequest:
+    path: str
+
+
+@dataclass(frozen=True)
+class IdentifiedPythonInterpreter:
+    """The identity of the interpreter at the requested path, or None if it is not a working
+    interpreter."""
+
+    interpreter: Optional[PythonInterpreter]
+
+
+# NB: This rule is uncacheable so that it re-runs in each session, but that is cheap: it only stats
+# the binary.
+@_uncacheable_rule
+def fingerprint_python_interpreter(
+    request: PythonInterpreterFingerprintRequest,
+) -> PythonInterpreterFingerprint:
+    try:
+        st = os.stat(request.path)
+        with open(request.path, "rb") as fp:
+            is_script = fp.read(2) == b"#!"
+    except OSError:
+        return PythonInterpreterFingerprint(request.path, stat_key=None, is_script=False)
+    return PythonInterpreterFingerprint(
+        request.path,
+        stat_key=(st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size),
+        is_script=is_script,
+    )
+
+
+@rule
+async def probe_python_interpreter(
+    fingerprint: PythonInterpreterFingerprint, pex_runtime_environment: PexRuntimeEnvironment
+) -> PythonInterpreterProbe:
+    if fingerprint.stat_key is None:
+        return PythonInterpreterProbe()
+    result = await Get(
+        FallibleProcessResult,
+        Process(
+            # NB: The stat key is passed as an (unused) argument so that the cached result of the
+            # process is invalidated when the binary changes.
+            argv=(fingerprint.path, "-c", _IDENTIFY_SCRIPT, json.dumps(fingerprint.stat_key)),
+            env={"PATH": create_path_env_var(pex_runtime_environment.path)},
+            description=f"Identify the Python interpreter at {fingerprint.path}",
+            level=LogLevel.DEBUG,
+            timeout_seconds=30,
+        ),
+    )
+    if result.exit_code != 0:
+        logger.debug(
+            f"Failed to identify the Python interpreter at {fingerprint.path}: "
+            f"{result.stderr.decode(errors='replace')}"
+        )
+        return PythonInterpreterProbe()
+    try:
+        identity = json.loads(result.stdout.decode())
+    except ValueError as e:
+        logger.debug(f"Failed to identify the Python interpreter at {fingerprint.path}: {e!r}")
+        return PythonInterpreterProbe()
+    return PythonInterpreterProbe(
+        interpreter=PythonInterpreter(
+            path=fingerprint.path,
+            implementation=identity["implementation"],
+            version=cast(Tuple[int, int, int], tuple(identity["version"])),
+            abi_tag=identity["abi_tag"],
+        )
+    )
+
+
+# NB: This rule is uncacheable, and runs the script directly rather than as a Process, because the
+# interpreter that a script selects depends on more than its own content: e.g. a pyenv shim reads
+# `PYENV_VERSION`, the `.python-version` files above its working directory, and pyenv's global
+# version. So the script is run in the buildroot, with the environment of Pants itself, in each
+# session.
+@_uncacheable_rule
+def resolve_python_interpreter_script(
+    request: PythonInterpreterScriptRequest,
+) -> ResolvedPythonInterpreterScript:
+    try:
+        result = subprocess.run(
+            [request.path, "-c", _RESOLVE_SCRIPT],
+            cwd=get_buildroot(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Failed to run the Python interpreter script at {request.path}: {e!r}")
+        return ResolvedPythonInterpreterScript(None)
+    if result.returncode != 0:
+        logger.debug(
+            f"Failed to run the Python interpreter script at {request.path}: "
+            f"{result.stderr.decode(errors='replace')}"
+        )
+        return ResolvedPythonInterpreterScript(None)
+    return ResolvedPythonInterpreterScript(result.stdout.decode().strip() or None)
+
+
+@rule
+async def identify_python_interpreter(
+    request: PythonInterpreterRequest,
+) -> IdentifiedPythonInterpreter:
+    fingerprint = await Get(
+        PythonInterpreterFingerprint, PythonInterpreterFingerprintRequest(request.path)
+    )
+    if not fingerprint.is_script:
+        probe = await Get(PythonInterpreterProbe, PythonInterpreterFingerprint, fingerprint)
+        return IdentifiedPythonInterpreter(probe.interpreter)
+
+    # A script (e.g. a pyenv shim) is run in each session to find the interpreter that it resolves
+    # to, which is then identified by its own fingerprint. So only the identity of the resolved
+    # interpreter is cached.
+    resolved = await Get(
+        ResolvedPythonInterpreterScript, PythonInterpreterScriptRequest(request.path)
+    )
+    if resolved.executable is None:
+        return IdentifiedPythonInterpreter(None)
+    target_fingerprint = await Get(
+        PythonInterpreterFingerprint, PythonInterpreterFingerprintRequest(resolved.executable)
+    )
+    target_probe = await Get(
+        PythonInterpreterProbe, PythonInterpreterFingerprint, target_fingerprint
+    )
+    if target_probe.interpreter is None:
+        return IdentifiedPythonInterpreter(None)
+    return IdentifiedPythonInterpreter(
+        dataclasses.replace(target_probe.interpreter, path=request.path)
+    )
+
+
 @rule(desc="Find PEX Python")
 async def find_pex_python(
     python_setup: PythonSetup,
@@ -132,19 +360,39 @@ async def find_pex_python(
         ]
     )
 
-    def first_python_binary() -> Optional[str]:
-        for binary_paths in all_python_binary_paths:
-            if binary_paths.first_path:
-                return binary_paths.first_path
-        return None
+    # Skip candidates which cannot bootstrap PEXes, such as broken shims. NB: The identities of
+    # interpreter binaries are cached (including by the process cache, across runs), so this only
+    # runs binaries that have not been seen before, or that have changed, and the shims which
+    # select them.
+    bootstrap_python: Optional[str] = None
+    for path in itertools.chain.from_iterable(
+        binary_paths.paths for binary_paths in all_python_binary_paths
+    ):
+        identified = await Get(IdentifiedPythonInterpreter, PythonInterpreterRequest(path))
+        if identified.interpreter and identified.interpreter.can_bootstrap_pex:
+            bootstrap_python = path
+            break
+    else:
+        # If no candidate could be identified as able to bootstrap PEXes, use the first found.
+        bootstrap_python = next(
+            (bp.first_path for bp in all_python_binary_paths if bp.first_path), None
+        )
 
     return PexEnvironment(
         path=pex_runtime_environment.path,
         interpreter_search_paths=tuple(python_setup.interpreter_search_paths),
         subprocess_environment_dict=FrozenDict(subprocess_environment.environment_dict),
-        bootstrap_python=first_python_binary(),
+        bootstrap_python=bootstrap_python,
     )
 
 
 def rules():
-    return [*collect_rules(), *process.rules(), *subprocess_environment.rules()]
+    return [
+        *collect_rules(),
+        *process.rules(),
+        *subprocess_environment.rules(),
+        RootRule(PythonInterpreterFingerprint),
+        RootRule(PythonInterpreterFingerprintRequest),
+        RootRule(PythonInterpreterScriptRequest),
+        RootRule(PythonInterpreterRequest),
+    ]
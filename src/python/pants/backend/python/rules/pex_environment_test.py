@@ -0,0 +1,234 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import json
+import os
+import sys
+from typing import Dict, List, Optional, cast
+
+from pants.backend.python.rules.pex_environment import (
+    IdentifiedPythonInterpreter,
+    PexRuntimeEnvironment,
+    PythonInterpreter,
+    PythonInterpreterFingerprint,
+    PythonInterpreterFingerprintRequest,
+    PythonInterpreterProbe,
+    PythonInterpreterRequest,
+    PythonInterpreterScriptRequest,
+    ResolvedPythonInterpreterScript,
+    find_pex_python,
+    fingerprint_python_interpreter,
+    identify_python_interpreter,
+    probe_python_interpreter,
+    resolve_python_interpreter_script,
+)
+from pants.backend.python.subsystems.subprocess_environment import SubprocessEnvironment
+from pants.engine.fs import EMPTY_DIGEST
+from pants.engine.process import BinaryPathRequest, BinaryPaths, FallibleProcessResult, Process
+from pants.python.python_setup import PythonSetup
+from pants.testutil.engine.util import MockGet, create_subsystem, run_rule
+from pants.util.contextutil import environment_as, temporary_dir
+from pants.util.dirutil import chmod_plus_x, safe_file_dump
+
+
+def interpreter(path: str, version=(3, 8, 5)) -> PythonInterpreter:
+    return PythonInterpreter(path, "CPython", version, "cp38")
+
+
+def test_fingerprint() -> None:
+    with temporary_dir() as tmpdir:
+        script = os.path.join(tmpdir, "python")
+
+        def fingerprint() -> PythonInterpreterFingerprint:
+            return run_rule(
+                fingerprint_python_interpreter,
+                rule_args=[PythonInterpreterFingerprintRequest(script)],
+            )
+
+        assert fingerprint() == PythonInterpreterFingerprint(script, None, False)
+
+        safe_file_dump(script, f'#!/bin/sh\nexec {sys.executable} "$@"\n')
+        chmod_plus_x(script)
+        script_fingerprint = fingerprint()
+        assert script_fingerprint.stat_key is not None
+        assert script_fingerprint.is_script
+
+        # Replacing the binary changes its fingerprint.
+        os.unlink(script)
+        os.symlink(sys.executable, script)
+        binary_fingerprint = fingerprint()
+        assert binary_fingerprint.stat_key not in (None, script_fingerprint.stat_key)
+        assert not binary_fingerprint.is_script
+
+
+def test_probe() -> None:
+    processes: List[Process] = []
+
+    def probe(
+        fingerprint: PythonInterpreterFingerprint, result: FallibleProcessResult
+    ) -> PythonInterpreterProbe:
+        def run(process: Process) -> FallibleProcessResult:
+            processes.append(process)
+            return result
+
+        return run_rule(
+            probe_python_interpreter,
+            rule_args=[
+                fingerprint,
+                create_subsystem(PexRuntimeEnvironment, executable_search_paths=["/usr/bin"]),
+            ],
+            mock_gets=[MockGet(product_type=FallibleProcessResult, subject_type=Process, mock=run)],
+        )
+
+    identity = {
+        "implementation": "CPython",
+        "version": [3, 8, 5],
+        "abi_tag": "cp38",
+    }
+    fingerprint = PythonInterpreterFingerprint("/usr/bin/python3", (1, 2, 3, 4), False)
+    assert probe(
+        fingerprint, FallibleProcessResult(json.dumps(identity).encode(), b"", 0, EMPTY_DIGEST)
+    ) == PythonInterpreterProbe(interpreter("/usr/bin/python3"))
+    # The process is keyed by the fingerprint of the binary.
+    assert processes[0].argv[0] == "/usr/bin/python3"
+    assert processes[0].argv[-1] == "[1, 2, 3, 4]"
+
+    assert (
+        probe(fingerprint, FallibleProcessResult(b"", b"broken", 1, EMPTY_DIGEST))
+        == PythonInterpreterProbe()
+    )
+    # A missing binary is not run.
+    assert (
+        probe(PythonInterpreterFingerprint("/usr/bin/python3", None, False), None)
+        == PythonInterpreterProbe()
+    )
+    assert len(processes) == 2
+
+
+def test_resolve_script() -> None:
+    with temporary_dir() as tmpdir:
+        shim = os.path.join(tmpdir, "python")
+        # Like a pyenv shim, the interpreter is selected by the environment.
+        safe_file_dump(shim, '#!/bin/sh\nexec "$(cat "$SHIM_VERSION_FILE")" "$@"\n')
+        chmod_plus_x(shim)
+        version_file = os.path.join(tmpdir, "version")
+        safe_file_dump(version_file, sys.executable)
+        missing_version_file = os.path.join(tmpdir, "missing")
+
+        def resolve(version_file: str) -> ResolvedPythonInterpreterScript:
+            with environment_as(SHIM_VERSION_FILE=version_file):
+                return cast(
+                    ResolvedPythonInterpreterScript,
+                    run_rule(
+                        resolve_python_interpreter_script,
+                        rule_args=[PythonInterpreterScriptRequest(shim)],
+                    ),
+                )
+
+        assert resolve(version_file) == ResolvedPythonInterpreterScript(
+            os.path.realpath(sys.executable)
+        )
+        assert resolve(missing_version_file) == ResolvedPythonInterpreterScript(None)
+
+
+def identify(
+    path: str,
+    fingerprints: Dict[str, PythonInterpreterFingerprint],
+    resolved_scripts: Dict[str, Optional[str]],
+) -> IdentifiedPythonInterpreter:
+    versions = {
+        "/usr/bin/python3": (3, 8, 5),
+        "/pyenv/python3.7": (3, 7, 0),
+        "/pyenv/python3.8": (3, 8, 5),
+    }
+    return run_rule(
+        identify_python_interpreter,
+        rule_args=[PythonInterpreterRequest(path)],
+        mock_gets=[
+            MockGet(
+                product_type=PythonInterpreterFingerprint,
+                subject_type=PythonInterpreterFingerprintRequest,
+                mock=lambda request: fingerprints[request.path],
+            ),
+            MockGet(
+                product_type=PythonInterpreterProbe,
+                subject_type=PythonInterpreterFingerprint,
+                mock=lambda fingerprint: PythonInterpreterProbe(
+                    interpreter(fingerprint.path, version=versions[fingerprint.path])
+                ),
+            ),
+            MockGet(
+                product_type=ResolvedPythonInterpreterScript,
+                subject_type=PythonInterpreterScriptRequest,
+                mock=lambda request: ResolvedPythonInterpreterScript(
+                    resolved_scripts[request.path]
+                ),
+            ),
+        ],
+    )
+
+
+def test_identify() -> None:
+    fingerprints = {
+        "/usr/bin/python3": PythonInterpreterFingerprint("/usr/bin/python3", (1, 2, 3, 4), False),
+        "/shims/python": PythonInterpreterFingerprint("/shims/python", (1, 2, 3, 5), True),
+        "/pyenv/python3.7": PythonInterpreterFingerprint("/pyenv/python3.7", (1, 2, 3, 6), False),
+        "/pyenv/python3.8": PythonInterpreterFingerprint("/pyenv/python3.8", (1, 2, 3, 7), False),
+    }
+    assert identify("/usr/bin/python3", fingerprints, {}) == IdentifiedPythonInterpreter(
+        interpreter("/usr/bin/python3")
+    )
+    # A shim is identified by the interpreter that it currently resolves to.
+    assert identify(
+        "/shims/python", fingerprints, {"/shims/python": "/pyenv/python3.7"}
+    ) == IdentifiedPythonInterpreter(interpreter("/shims/python", version=(3, 7, 0)))
+    assert identify(
+        "/shims/python", fingerprints, {"/shims/python": "/pyenv/python3.8"}
+    ) == IdentifiedPythonInterpreter(interpreter("/shims/python", version=(3, 8, 5)))
+    assert identify(
+        "/shims/python", fingerprints, {"/shims/python": None}
+    ) == IdentifiedPythonInterpreter(None)
+
+
+def test_find_pex_python() -> None:
+    def find(
+        paths: Dict[str, List[str]], interpreters: Dict[str, Optional[PythonInterpreter]]
+    ) -> Optional[str]:
+        pex_environment = run_rule(
+            find_pex_python,
+            rule_args=[
+                create_subsystem(PythonSetup, interpreter_search_paths=["/usr/bin"]),
+                create_subsystem(
+                    PexRuntimeEnvironment,
+                    executable_search_paths=["/usr/bin"],
+                    bootstrap_interpreter_names=["python", "python3"],
+                ),
+                create_subsystem(SubprocessEnvironment, lang="C", lc_all="C"),
+            ],
+            mock_gets=[
+                MockGet(
+                    product_type=BinaryPaths,
+                    subject_type=BinaryPathRequest,
+                    mock=lambda request: BinaryPaths(
+                        request.binary_name, paths[request.binary_name]
+                    ),
+                ),
+                MockGet(
+                    product_type=IdentifiedPythonInterpreter,
+                    subject_type=PythonInterpreterRequest,
+                    mock=lambda request: IdentifiedPythonInterpreter(interpreters[request.path]),
+                ),
+            ],
+        )
+        return pex_environment.bootstrap_python
+
+    paths = {"python": ["/usr/bin/python"], "python3": ["/usr/bin/python3"]}
+    python26 = interpreter("/usr/bin/python", version=(2, 6, 9))
+    python38 = interpreter("/usr/bin/python3")
+    # Candidates which cannot bootstrap PEXes are skipped.
+    assert "/usr/bin/python3" == find(
+        paths, {"/usr/bin/python": python26, "/usr/bin/python3": python38}
+    )
+    # If no candidate can be identified, the first is used.
+    assert "/usr/bin/python" == find(paths, {"/usr/bin/python": None, "/usr/bin/python3": None})
+    assert find({"python": [], "python3": []}, {}) is None
@@ -6,7 +6,7 @@ import logging
 from dataclasses import dataclass
 from typing import Iterable, Optional, Tuple
 
-from pkg_resources import Requirement, parse_requirements
+from pkg_resources import Requirement
 
 from pants.backend.python.rules.pex import (
     PexInterpreterConstraints,
@@ -35,6 +35,7 @@ from pants.engine.fs import (
 from pants.engine.rules import Get, RootRule, collect_rules, rule
 from pants.engine.target import TransitiveTargets
 from pants.python.python_setup import PythonSetup
+from pants.python.requirements_file import RequirementConstraints, parse_constraints_file
 from pants.util.meta import frozen_after_init
 
 logger = logging.getLogger(__name__)
@@ -99,6 +100,29 @@ class TwoStepPexFromTargetsRequest:
     pex_from_targets_request: PexFromTargetsRequest
 
 
+@dataclass(frozen=True)
+class RequirementConstraintsRequest:
+    """Load and index the constraints file at the given path."""
+
+    path: str
+
+
+@rule
+async def load_requirement_constraints(
+    request: RequirementConstraintsRequest,
+) -> RequirementConstraints:
+    constraints_file_contents = await Get(
+        DigestContents,
+        PathGlobs(
+            [request.path],
+            glob_match_error_behavior=GlobMatchErrorBehavior.error,
+            conjunction=GlobExpansionConjunction.all_match,
+            description_of_origin="the option `--python-setup-requirement-constraints`",
+        ),
+    )
+    return parse_constraints_file(next(iter(constraints_file_contents)).content)
+
+
 @rule
 async def pex_from_targets(request: PexFromTargetsRequest, python_setup: PythonSetup) -> PexRequest:
     transitive_targets = await Get(TransitiveTargets, Addresses, request.addresses)
@@ -135,21 +159,15 @@ async def pex_from_targets(request: PexFromTargetsRequest, python_setup: PythonS
     requirements = exact_reqs
 
     if python_setup.requirement_constraints:
-        exact_req_projects = {Requirement.parse(req).project_name for req in exact_reqs}
-        constraints_file_contents = await Get(
-            DigestContents,
-            PathGlobs(
-                [python_setup.requirement_constraints],
-                glob_match_error_behavior=GlobMatchErrorBehavior.error,
-                conjunction=GlobExpansionConjunction.all_match,
-                description_of_origin="the option `--python-setup-requirement-constraints`",
-            ),
-        )
-        constraints_file_reqs = set(
-            parse_requirements(next(iter(constraints_file_contents)).content.decode())
+        # NB: The constraints file is loaded and indexed once (per change to it), rather than once
+        # per request.
+        constraints = await Get(
+            RequirementConstraints,
+            RequirementConstraintsRequest(python_setup.requirement_constraints),
         )
-        constraint_file_projects = {req.project_name for req in constraints_file_reqs}
-        unconstrained_projects = exact_req_projects - constraint_file_projects
+        unconstrained_projects = constraints.for_requirements(
+            Requirement.parse(req) for req in exact_reqs
+        ).unconstrained_projects
         if unconstrained_projects:
             logger.warning(
                 f"The constraints file {python_setup.requirement_constraints} does not contain "
@@ -163,7 +181,7 @@ async def pex_from_targets(request: PexFromTargetsRequest, python_setup: PythonS
                     "Because constraints file does not cover all requirements."
                 )
             else:
-                requirements = PexRequirements(str(req) for req in constraints_file_reqs)
+                requirements = PexRequirements(constraints.requirement_strings)
     elif python_setup.resolve_all_constraints:
         raise ValueError(
             "resolve_all_constraints in the [python-setup] scope is set, so "
@@ -194,4 +212,5 @@ def rules():
         *collect_rules(),
         RootRule(PexFromTargetsRequest),
         RootRule(TwoStepPexFromTargetsRequest),
+        RootRule(RequirementConstraintsRequest),
     ]
@@ -1,8 +1,13 @@
 # Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-from pants.backend.python.rules.create_python_binary import PythonBinaryFieldSet
+from pants.backend.python.rules.create_python_binary import (
+    PythonBinaryFieldSet,
+    use_incremental_assembly,
+)
+from pants.backend.python.rules.incremental_pex import LoosePex, LoosePexRequest
 from pants.backend.python.rules.pex import Pex, PexPlatforms
+from pants.backend.python.rules.pex_environment import PexEnvironment
 from pants.backend.python.rules.pex_from_targets import PexFromTargetsRequest
 from pants.backend.python.rules.python_sources import PythonSourceFiles, PythonSourceFilesRequest
 from pants.backend.python.target_types import PythonBinaryDefaults, PythonBinarySources
@@ -24,7 +29,9 @@ from pants.engine.unions import UnionRule
 
 @rule
 async def create_python_binary_run_request(
-    field_set: PythonBinaryFieldSet, python_binary_defaults: PythonBinaryDefaults
+    field_set: PythonBinaryFieldSet,
+    python_binary_defaults: PythonBinaryDefaults,
+    pex_environment: PexEnvironment,
 ) -> RunRequest:
     entry_point = field_set.entry_point.value
     if entry_point is None:
@@ -61,12 +68,20 @@ async def create_python_binary_run_request(
     )
     pex, sources = await MultiGet(pex_request, sources_request)
 
+    binary_digest, binary_name = pex.digest, pex.output_filename
+    if use_incremental_assembly(python_binary_defaults, pex_environment):
+        # Run the requirements unzipped, so that nothing needs to be extracted at runtime.
+        loose_pex = await Get(
+            LoosePex, LoosePexRequest(pex, launcher_name=field_set.address.target_name)
+        )
+        binary_digest, binary_name = loose_pex.digest, loose_pex.launcher_name
+
     merged_digest = await Get(
-        Digest, MergeDigests([pex.digest, sources.source_files.snapshot.digest])
+        Digest, MergeDigests([binary_digest, sources.source_files.snapshot.digest])
     )
     return RunRequest(
         digest=merged_digest,
-        binary_name=pex.output_filename,
+        binary_name=binary_name,
         prefix_args=("-m", entry_point),
         env={"PEX_EXTRA_SYS_PATH": ":".join(sources.source_roots)},
     )
@@ -11,6 +11,12 @@ from pants.util.contextutil import temporary_dir
 
 class RunPythonBinaryIntegrationTest(PantsRunIntegrationTest):
     def test_sample_script(self) -> None:
+        self.assert_sample_script_runs()
+
+    def test_sample_script_incremental(self) -> None:
+        self.assert_sample_script_runs("--python-binary-incremental")
+
+    def assert_sample_script_runs(self, *extra_args: str) -> None:
         """Test that we properly run a `python_binary` target.
 
         This checks a few things:
@@ -58,6 +64,7 @@ class RunPythonBinaryIntegrationTest(PantsRunIntegrationTest):
                     ),
                     "--pants-ignore=__pycache__",
                     "--pants-ignore=/src/python",
+                    *extra_args,
                     "run",
                     f"{tmpdir_relative}/src_root1/project/app.py",
                 ]
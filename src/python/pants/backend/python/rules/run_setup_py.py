@@ -4,8 +4,10 @@
 import itertools
 import json
 import logging
+import os
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import List, Set, Tuple, cast
+from typing import Dict, Iterable, List, Set, Tuple, cast
 
 from pants.backend.python.python_artifact import PythonArtifact
 from pants.backend.python.rules.pex import (
@@ -62,6 +64,7 @@ from pants.engine.target import (
 from pants.engine.unions import UnionMembership
 from pants.option.custom_types import shell_str
 from pants.python.python_setup import PythonSetup
+from pants.util.frozendict import FrozenDict
 from pants.util.logging import LogLevel
 from pants.util.ordered_set import FrozenOrderedSet
 
@@ -113,9 +116,14 @@ class DependencyOwner:
     We need this type to prevent rule ambiguities when computing the list of targets owned by an
     ExportedTarget (which involves going from ExportedTarget -> dep -> owner (which is itself an
     ExportedTarget) and checking if owner is this the original ExportedTarget.
+
+    The owners of the targets in the ExportedTarget's closure are looked up in the owners computed
+    for `owners_request`, which must include the ExportedTarget's address. Sharing one request
+    between all of the ExportedTargets that are being built computes their owners only once.
     """
 
     exported_target: ExportedTarget
+    owners_request: "ExportedTargetOwnersRequest"
 
 
 @dataclass(frozen=True)
@@ -126,15 +134,62 @@ class OwnedDependency:
 
     The owner of a target T is T's closest filesystem ancestor among the exported targets
     that directly or indirectly depend on it (including T itself).
+
+    The owner is looked up in the owners computed for `owners_request`, which must include the
+    target's address in its closure.
     """
 
     target: Target
+    owners_request: "ExportedTargetOwnersRequest"
 
 
 class OwnedDependencies(Collection[OwnedDependency]):
     pass
 
 
+@dataclass(frozen=True)
+class ExportedTargetOwnersRequest:
+    """A request for the owners of all targets in the transitive closure of some addresses."""
+
+    addresses: Addresses
+
+    @classmethod
+    def for_exported_targets(
+        cls, exported_targets: Iterable["ExportedTarget"]
+    ) -> "ExportedTargetOwnersRequest":
+        # NB: The addresses are sorted so that the same exported targets always make an equal
+        # request, which the engine computes once.
+        return cls(Addresses(sorted({et.target.address for et in exported_targets})))
+
+
+@dataclass(frozen=True)
+class ExportedTargetOwners:
+    """The owning ExportedTarget of each target in a transitive closure.
+
+    See `OwnedDependency` for the definition of ownership. Targets which have no owner, or whose
+    owner is ambiguous, are recorded as such, and raise an error when their owner is requested.
+    """
+
+    owners: FrozenDict[Address, ExportedTarget]
+    # Targets with ambiguous owners -> all of their closest owners.
+    ambiguous_owners: FrozenDict[Address, Tuple[Address, ...]]
+
+    def owner_of(self, target: Target) -> ExportedTarget:
+        owner = self.owners.get(target.address)
+        if owner is not None:
+            return owner
+        ambiguous_owners = self.ambiguous_owners.get(target.address)
+        if ambiguous_owners:
+            owner_address, *sibling_addresses = ambiguous_owners
+            raise AmbiguousOwnerError(
+                f"Exporting owners for {target.address} are "
+                f"ambiguous. Found {owner_address} and "
+                f"{len(sibling_addresses)} others: "
+                f'{", ".join(addr.spec for addr in sibling_addresses)}'
+            )
+        raise NoOwnerError(f"No exported target owner found for {target.address}")
+
+
 class ExportedTargetRequirements(DeduplicatedCollection[str]):
     """The requirements of an ExportedTarget.
 
@@ -172,6 +227,8 @@ class SetupPyChrootRequest:
 
     exported_target: ExportedTarget
     py2: bool  # Whether to use py2 or py3 package semantics.
+    # The owners request shared by all of the chroots being created. See `DependencyOwner`.
+    owners_request: ExportedTargetOwnersRequest
 
 
 @dataclass(frozen=True)
@@ -298,15 +355,18 @@ async def run_setup_pys(
 
     if setup_py_subsystem.transitive:
         # Expand out to all owners of the entire dep closure.
-        transitive_targets = await Get(
-            TransitiveTargets, Addresses(et.target.address for et in exported_targets)
+        owners_request = ExportedTargetOwnersRequest.for_exported_targets(exported_targets)
+        transitive_targets, exported_target_owners = await MultiGet(
+            Get(TransitiveTargets, Addresses, owners_request.addresses),
+            Get(ExportedTargetOwners, ExportedTargetOwnersRequest, owners_request),
         )
-        owners = await MultiGet(
-            Get(ExportedTarget, OwnedDependency(tgt))
-            for tgt in transitive_targets.closure
-            if is_ownable_target(tgt, union_membership)
+        exported_targets = list(
+            FrozenOrderedSet(
+                exported_target_owners.owner_of(tgt)
+                for tgt in transitive_targets.closure
+                if is_ownable_target(tgt, union_membership)
+            )
         )
-        exported_targets = list(FrozenOrderedSet(owners))
 
     py2 = is_python2(
         python_setup.compatibilities_or_constraints(
@@ -314,13 +374,18 @@ async def run_setup_pys(
             for target_with_origin in targets_with_origins
         )
     )
+    # The owners of the targets in the closures of all of the exported targets are computed once,
+    # and shared by every chroot.
+    owners_request = ExportedTargetOwnersRequest.for_exported_targets(exported_targets)
     chroots = await MultiGet(
-        Get(SetupPyChroot, SetupPyChrootRequest(exported_target, py2))
+        Get(SetupPyChroot, SetupPyChrootRequest(exported_target, py2, owners_request))
         for exported_target in exported_targets
     )
 
     # If args were provided, run setup.py with them; Otherwise just dump chroots.
     if setup_py_subsystem.args:
+        # NB: All of the runs are requested at once, and the number running concurrently is
+        # bounded by process execution.
         setup_py_results = await MultiGet(
             Get(
                 RunSetupPyResult,
@@ -329,18 +394,26 @@ async def run_setup_pys(
             for exported_target, chroot in zip(exported_targets, chroots)
         )
 
-        for exported_target, setup_py_result in zip(exported_targets, setup_py_results):
-            addr = exported_target.target.address.spec
-            console.print_stderr(f"Writing dist for {addr} under {distdir.relpath}/.")
-            workspace.write_digest(setup_py_result.output, path_prefix=str(distdir.relpath))
+        # Write all dists at once.
+        output_digest = await Get(
+            Digest, MergeDigests(result.output for result in setup_py_results)
+        )
+        addrs = ", ".join(
+            exported_target.target.address.spec for exported_target in exported_targets
+        )
+        console.print_stderr(f"Writing dists for {addrs} under {distdir.relpath}/.")
+        workspace.write_digest(output_digest, path_prefix=str(distdir.relpath))
     else:
-        # Just dump the chroot.
+        # Just dump the chroots, all at once.
+        prefixed_chroots = []
         for exported_target, chroot in zip(exported_targets, chroots):
             addr = exported_target.target.address.spec
             provides = exported_target.provides
             setup_py_dir = distdir.relpath / f"{provides.name}-{provides.version}"
             console.print_stderr(f"Writing setup.py chroot for {addr} to {setup_py_dir}")
-            workspace.write_digest(chroot.digest, path_prefix=str(setup_py_dir))
+            prefixed_chroots.append(AddPrefix(chroot.digest, str(setup_py_dir)))
+        prefixed_digests = await MultiGet(Get(Digest, AddPrefix, p) for p in prefixed_chroots)
+        workspace.write_digest(await Get(Digest, MergeDigests(prefixed_digests)))
 
     return SetupPy(0)
 
@@ -389,8 +462,9 @@ async def run_setup_py(
 @rule
 async def generate_chroot(request: SetupPyChrootRequest) -> SetupPyChroot:
     exported_target = request.exported_target
+    dependency_owner = DependencyOwner(exported_target, request.owners_request)
 
-    owned_deps = await Get(OwnedDependencies, DependencyOwner(exported_target))
+    owned_deps = await Get(OwnedDependencies, DependencyOwner, dependency_owner)
     transitive_targets = await Get(TransitiveTargets, Addresses([exported_target.target.address]))
     # files() targets aren't owned by a single exported target - they aren't code, so
     # we allow them to be in multiple dists. This is helpful for, e.g., embedding
@@ -398,7 +472,7 @@ async def generate_chroot(request: SetupPyChrootRequest) -> SetupPyChroot:
     files_targets = (tgt for tgt in transitive_targets.closure if tgt.has_field(FilesSources))
     targets = Targets(itertools.chain((od.target for od in owned_deps), files_targets))
     sources = await Get(SetupPySources, SetupPySourcesRequest(targets, py2=request.py2))
-    requirements = await Get(ExportedTargetRequirements, DependencyOwner(exported_target))
+    requirements = await Get(ExportedTargetRequirements, DependencyOwner, dependency_owner)
 
     # Nest the sources under the src/ prefix.
     src_digest = await Get(Digest, AddPrefix(sources.digest, CHROOT_SOURCE_ROOT))
@@ -504,18 +578,21 @@ def _is_exported(target: Target) -> bool:
 async def get_requirements(
     dep_owner: DependencyOwner, union_membership: UnionMembership
 ) -> ExportedTargetRequirements:
-    transitive_targets = await Get(
-        TransitiveTargets, Addresses([dep_owner.exported_target.target.address])
+    transitive_targets, exported_target_owners = await MultiGet(
+        Get(TransitiveTargets, Addresses([dep_owner.exported_target.target.address])),
+        Get(ExportedTargetOwners, ExportedTargetOwnersRequest, dep_owner.owners_request),
     )
 
-    ownable_tgts = [
-        tgt for tgt in transitive_targets.closure if is_ownable_target(tgt, union_membership)
-    ]
-    owners = await MultiGet(Get(ExportedTarget, OwnedDependency(tgt)) for tgt in ownable_tgts)
     owned_by_us: Set[Target] = set()
-    owned_by_others: Set[Target] = set()
-    for tgt, owner in zip(ownable_tgts, owners):
-        (owned_by_us if owner == dep_owner.exported_target else owned_by_others).add(tgt)
+    owners_we_depend_on: Set[ExportedTarget] = set()
+    for tgt in transitive_targets.closure:
+        if not is_ownable_target(tgt, union_membership):
+            continue
+        owner = exported_target_owners.owner_of(tgt)
+        if owner == dep_owner.exported_target:
+            owned_by_us.add(tgt)
+        else:
+            owners_we_depend_on.add(owner)
 
     # Get all 3rdparty deps of our owned deps.
     #
@@ -542,10 +619,7 @@ async def get_requirements(
     req_strs = list(reqs)
 
     # Add the requirements on any exported targets on which we depend.
-    exported_targets_we_depend_on = await MultiGet(
-        Get(ExportedTarget, OwnedDependency(tgt)) for tgt in owned_by_others
-    )
-    req_strs.extend(et.provides.requirement for et in set(exported_targets_we_depend_on))
+    req_strs.extend(et.provides.requirement for et in owners_we_depend_on)
 
     return ExportedTargetRequirements(req_strs)
 
@@ -558,24 +632,24 @@ async def get_owned_dependencies(
 
     Includes dependency_owner itself.
     """
-    transitive_targets = await Get(
-        TransitiveTargets, Addresses([dependency_owner.exported_target.target.address])
+    transitive_targets, exported_target_owners = await MultiGet(
+        Get(TransitiveTargets, Addresses([dependency_owner.exported_target.target.address])),
+        Get(ExportedTargetOwners, ExportedTargetOwnersRequest, dependency_owner.owners_request),
     )
-    ownable_targets = [
-        tgt for tgt in transitive_targets.closure if is_ownable_target(tgt, union_membership)
-    ]
-    owners = await MultiGet(Get(ExportedTarget, OwnedDependency(tgt)) for tgt in ownable_targets)
     owned_dependencies = [
         tgt
-        for owner, tgt in zip(owners, ownable_targets)
-        if owner == dependency_owner.exported_target
+        for tgt in transitive_targets.closure
+        if is_ownable_target(tgt, union_membership)
+        and exported_target_owners.owner_of(tgt) == dependency_owner.exported_target
     ]
-    return OwnedDependencies(OwnedDependency(t) for t in owned_dependencies)
+    return OwnedDependencies(
+        OwnedDependency(t, dependency_owner.owners_request) for t in owned_dependencies
+    )
 
 
-@rule(desc="Get exporting owner for target")
-async def get_exporting_owner(owned_dependency: OwnedDependency) -> ExportedTarget:
-    """Find the exported target that owns the given target (and therefore exports it).
+@rule(desc="Compute exporting owners of targets")
+async def get_exported_target_owners(request: ExportedTargetOwnersRequest) -> ExportedTargetOwners:
+    """Find the exported target that owns each target in the closure of the given addresses.
 
     The owner of T (i.e., the exported target in whose artifact T's code is published) is:
 
@@ -583,41 +657,64 @@ async def get_exporting_owner(owned_dependency: OwnedDependency) -> ExportedTarg
      2. Is T's closest filesystem ancestor among those satisfying 1.
 
     If there are multiple such exported targets at the same degree of ancestry, the ownership
-    is ambiguous and an error is raised. If there is no exported target that depends on T
-    and is its ancestor, then there is no owner and an error is raised.
+    is ambiguous. If there is no exported target that depends on T and is its ancestor, then there
+    is no owner.
+
+    Rather than searching for the owner of each target independently, all candidate owners are
+    found with a single request for the ancestors of the whole closure, and each candidate's
+    closure is computed once.
+    """
+    transitive_targets = await Get(TransitiveTargets, Addresses, request.addresses)
+    spec_paths = sorted({tgt.address.spec_path for tgt in transitive_targets.closure})
+    ancestor_tgts = await Get(
+        Targets, AddressSpecs(AscendantAddresses(spec_path) for spec_path in spec_paths)
+    )
+    exported_ancestor_tgts = [t for t in ancestor_tgts if _is_exported(t)]
+    exported_closures = await MultiGet(
+        Get(TransitiveTargets, Addresses([t.address])) for t in exported_ancestor_tgts
+    )
+
+    exported_by_spec_path: Dict[str, List[Tuple[Target, TransitiveTargets]]] = defaultdict(list)
+    for exported_tgt, closure in zip(exported_ancestor_tgts, exported_closures):
+        exported_by_spec_path[exported_tgt.address.spec_path].append((exported_tgt, closure))
+
+    owners: Dict[Address, ExportedTarget] = {}
+    ambiguous_owners: Dict[Address, Tuple[Address, ...]] = {}
+    for target in transitive_targets.closure:
+        # Visit the target's own directory and then each of its ancestors, closest first.
+        spec_path = target.address.spec_path
+        while True:
+            closest_owners = sorted(
+                (
+                    exported_tgt
+                    for exported_tgt, closure in exported_by_spec_path.get(spec_path, ())
+                    if target in closure.closure
+                ),
+                key=lambda t: t.address,
+                reverse=True,
+            )
+            if len(closest_owners) == 1:
+                owners[target.address] = ExportedTarget(closest_owners[0])
+                break
+            if closest_owners:
+                ambiguous_owners[target.address] = tuple(t.address for t in closest_owners)
+                break
+            if not spec_path:
+                break
+            spec_path = os.path.dirname(spec_path)
+    return ExportedTargetOwners(FrozenDict(owners), FrozenDict(ambiguous_owners))
+
+
+@rule(desc="Get exporting owner for target")
+async def get_exporting_owner(owned_dependency: OwnedDependency) -> ExportedTarget:
+    """Find the exported target that owns the given target (and therefore exports it).
+
+    See `get_exported_target_owners`.
     """
-    target = owned_dependency.target
-    ancestor_addrs = AscendantAddresses(target.address.spec_path)
-    ancestor_tgts = await Get(Targets, AddressSpecs([ancestor_addrs]))
-    # Note that addresses sort by (spec_path, target_name), and all these targets are
-    # ancestors of the given target, i.e., their spec_paths are all prefixes. So sorting by
-    # address will effectively sort by closeness of ancestry to the given target.
-    exported_ancestor_tgts = sorted(
-        [t for t in ancestor_tgts if _is_exported(t)], key=lambda t: t.address, reverse=True,
+    exported_target_owners = await Get(
+        ExportedTargetOwners, ExportedTargetOwnersRequest, owned_dependency.owners_request
     )
-    exported_ancestor_iter = iter(exported_ancestor_tgts)
-    for exported_ancestor in exported_ancestor_iter:
-        transitive_targets = await Get(TransitiveTargets, Addresses([exported_ancestor.address]))
-        if target in transitive_targets.closure:
-            owner = exported_ancestor
-            # Find any exported siblings of owner that also depend on target. They have the
-            # same spec_path as it, so they must immediately follow it in ancestor_iter.
-            sibling_owners = []
-            sibling = next(exported_ancestor_iter, None)
-            while sibling and sibling.address.spec_path == owner.address.spec_path:
-                transitive_targets = await Get(TransitiveTargets, Addresses([sibling.address]))
-                if target in transitive_targets.closure:
-                    sibling_owners.append(sibling)
-                sibling = next(exported_ancestor_iter, None)
-            if sibling_owners:
-                raise AmbiguousOwnerError(
-                    f"Exporting owners for {target.address} are "
-                    f"ambiguous. Found {exported_ancestor.address} and "
-                    f"{len(sibling_owners)} others: "
-                    f'{", ".join(so.address.spec for so in sibling_owners)}'
-                )
-            return ExportedTarget(owner)
-    raise NoOwnerError(f"No exported target owner found for {target.address}")
+    return exported_target_owners.owner_of(owned_dependency.target)
 
 
 @rule(desc="Set up setuptools")
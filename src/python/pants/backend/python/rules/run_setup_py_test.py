@@ -3,7 +3,8 @@
 
 import json
 import textwrap
-from typing import Iterable, Type
+from pathlib import Path
+from typing import Iterable, List, Set, Type
 
 import pytest
 
@@ -13,36 +14,61 @@ from pants.backend.python.rules.run_setup_py import (
     AmbiguousOwnerError,
     DependencyOwner,
     ExportedTarget,
+    ExportedTargetOwners,
+    ExportedTargetOwnersRequest,
     ExportedTargetRequirements,
     InvalidEntryPoint,
     InvalidSetupPyArgs,
     NoOwnerError,
     OwnedDependencies,
     OwnedDependency,
+    RunSetupPyRequest,
+    RunSetupPyResult,
     SetupPyChroot,
     SetupPyChrootRequest,
     SetupPySources,
     SetupPySourcesRequest,
+    SetupPySubsystem,
     generate_chroot,
+    get_exported_target_owners,
     get_exporting_owner,
     get_owned_dependencies,
     get_requirements,
     get_sources,
+    run_setup_pys,
     validate_args,
 )
 from pants.backend.python.target_types import PythonBinary, PythonLibrary, PythonRequirementLibrary
+from pants.base.specs import SingleAddress
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.core.target_types import Files, Resources
 from pants.core.util_rules.determine_source_files import rules as determine_source_files_rules
+from pants.core.util_rules.distdir import DistDir
 from pants.core.util_rules.strip_source_roots import rules as strip_source_roots_rules
-from pants.engine.addresses import Address
-from pants.engine.fs import Snapshot
+from pants.engine.addresses import Address, Addresses
+from pants.engine.fs import EMPTY_DIGEST, AddPrefix, Digest, MergeDigests, Snapshot
 from pants.engine.internals.scheduler import ExecutionError
 from pants.engine.rules import RootRule
-from pants.engine.target import Target, Targets, WrappedTarget
+from pants.engine.target import (
+    Target,
+    Targets,
+    TargetsWithOrigins,
+    TargetWithOrigin,
+    TransitiveTargets,
+    WrappedTarget,
+)
+from pants.engine.unions import UnionMembership
 from pants.python.python_requirement import PythonRequirement
+from pants.python.python_setup import PythonSetup
 from pants.source.source_root import SourceRootConfig
-from pants.testutil.engine.util import Params
+from pants.testutil.engine.util import (
+    MockConsole,
+    MockGet,
+    Params,
+    create_goal_subsystem,
+    create_subsystem,
+    run_rule,
+)
 from pants.testutil.option.util import create_options_bootstrapper
 from pants.testutil.test_base import TestBase
 
@@ -63,6 +89,12 @@ class TestSetupPyBase(TestBase):
     def tgt(self, addr: str) -> Target:
         return self.request_single_product(WrappedTarget, Params(Address.parse(addr))).target
 
+    def dependency_owner(self, addr: str) -> DependencyOwner:
+        exported_target = ExportedTarget(self.tgt(addr))
+        return DependencyOwner(
+            exported_target, ExportedTargetOwnersRequest.for_exported_targets([exported_target])
+        )
+
 
 class TestGenerateChroot(TestSetupPyBase):
     @classmethod
@@ -73,15 +105,24 @@ class TestGenerateChroot(TestSetupPyBase):
             get_requirements,
             get_owned_dependencies,
             get_exporting_owner,
+            get_exported_target_owners,
             RootRule(SetupPyChrootRequest),
             *python_sources.rules(),
         ]
 
+    def chroot_request(self, addr: str) -> SetupPyChrootRequest:
+        exported_target = ExportedTarget(self.tgt(addr))
+        return SetupPyChrootRequest(
+            exported_target,
+            py2=False,
+            owners_request=ExportedTargetOwnersRequest.for_exported_targets([exported_target]),
+        )
+
     def assert_chroot(self, expected_files, expected_setup_kwargs, addr):
         chroot = self.request_single_product(
             SetupPyChroot,
             Params(
-                SetupPyChrootRequest(ExportedTarget(self.tgt(addr)), py2=False),
+                self.chroot_request(addr),
                 create_options_bootstrapper(args=["--source-root-patterns=src/python"]),
             ),
         )
@@ -95,7 +136,7 @@ class TestGenerateChroot(TestSetupPyBase):
             self.request_single_product(
                 SetupPyChroot,
                 Params(
-                    SetupPyChrootRequest(ExportedTarget(self.tgt(addr)), py2=False),
+                    self.chroot_request(addr),
                     create_options_bootstrapper(args=["--source-root-patterns=src/python"]),
                 ),
             )
@@ -322,13 +363,14 @@ class TestGetRequirements(TestSetupPyBase):
             get_requirements,
             get_owned_dependencies,
             get_exporting_owner,
+            get_exported_target_owners,
             RootRule(DependencyOwner),
         ]
 
     def assert_requirements(self, expected_req_strs, addr):
         reqs = self.request_single_product(
             ExportedTargetRequirements,
-            Params(DependencyOwner(ExportedTarget(self.tgt(addr))), create_options_bootstrapper()),
+            Params(self.dependency_owner(addr), create_options_bootstrapper()),
         )
         assert sorted(expected_req_strs) == list(reqs)
 
@@ -395,6 +437,7 @@ class TestGetOwnedDependencies(TestSetupPyBase):
         return super().rules() + [
             get_owned_dependencies,
             get_exporting_owner,
+            get_exported_target_owners,
             RootRule(DependencyOwner),
         ]
 
@@ -403,10 +446,7 @@ class TestGetOwnedDependencies(TestSetupPyBase):
             od.target.address.spec
             for od in self.request_single_product(
                 OwnedDependencies,
-                Params(
-                    DependencyOwner(ExportedTarget(self.tgt(exported))),
-                    create_options_bootstrapper(),
-                ),
+                Params(self.dependency_owner(exported), create_options_bootstrapper()),
             )
         )
 
@@ -472,23 +512,28 @@ class TestGetExportingOwner(TestSetupPyBase):
     def rules(cls):
         return super().rules() + [
             get_exporting_owner,
+            get_exported_target_owners,
             RootRule(OwnedDependency),
+            RootRule(ExportedTargetOwnersRequest),
         ]
 
+    def owned_dependency(self, owned: str) -> OwnedDependency:
+        return OwnedDependency(
+            self.tgt(owned), ExportedTargetOwnersRequest(Addresses([Address.parse(owned)]))
+        )
+
     def assert_is_owner(self, owner: str, owned: str):
         assert (
             owner
             == self.request_single_product(
-                ExportedTarget,
-                Params(OwnedDependency(self.tgt(owned)), create_options_bootstrapper()),
+                ExportedTarget, Params(self.owned_dependency(owned), create_options_bootstrapper()),
             ).target.address.spec
         )
 
     def assert_error(self, owned: str, exc_cls: Type[Exception]):
         with pytest.raises(ExecutionError) as excinfo:
             self.request_single_product(
-                ExportedTarget,
-                Params(OwnedDependency(self.tgt(owned)), create_options_bootstrapper()),
+                ExportedTarget, Params(self.owned_dependency(owned), create_options_bootstrapper()),
             )
         ex = excinfo.value
         assert len(ex.wrapped_exceptions) == 1
@@ -647,6 +692,135 @@ class TestGetExportingOwner(TestSetupPyBase):
         self.assert_is_owner("src/python/aaa/bbb", "src/python/aaa/bbb")
         self.assert_is_owner("src/python/aaa", "src/python/aaa")
 
+    def test_get_owners_of_closure(self) -> None:
+        self.create_file("src/python/foo/bar/baz/BUILD", "python_library(sources=[])")
+        self.create_file("src/python/foo/orphan/BUILD", "python_library(sources=[])")
+        self.create_file(
+            "src/python/foo/bar/BUILD",
+            textwrap.dedent(
+                """
+                python_library(
+                    sources=[],
+                    dependencies=['src/python/foo/bar/baz'],
+                    provides=setup_py(name='bar', version='1.1.1'),
+                )
+                """
+            ),
+        )
+        self.create_file(
+            "src/python/BUILD",
+            textwrap.dedent(
+                """
+                python_library(
+                    name='sibling1',
+                    sources=[],
+                    dependencies=['src/python/foo/orphan'],
+                    provides=setup_py(name='sibling1', version='1.1.1'),
+                )
+                python_library(
+                    name='sibling2',
+                    sources=[],
+                    dependencies=['src/python/foo/bar', 'src/python/foo/orphan'],
+                    provides=setup_py(name='sibling2', version='2.2.2'),
+                )
+                """
+            ),
+        )
+
+        owners = self.request_single_product(
+            ExportedTargetOwners,
+            Params(
+                ExportedTargetOwnersRequest(Addresses([Address.parse("src/python:sibling2")])),
+                create_options_bootstrapper(),
+            ),
+        )
+        assert {addr.spec: owner.target.address.spec for addr, owner in owners.owners.items()} == {
+            "src/python:sibling2": "src/python:sibling2",
+            "src/python/foo/bar": "src/python/foo/bar",
+            "src/python/foo/bar/baz": "src/python/foo/bar",
+        }
+        with pytest.raises(AmbiguousOwnerError):
+            owners.owner_of(self.tgt("src/python/foo/orphan"))
+
+
+def test_run_setup_pys_writes_dists_once() -> None:
+    def exported(name: str) -> TargetWithOrigin:
+        tgt = PythonLibrary(
+            {"provides": PythonArtifact(name=name, version="1.0")},
+            address=Address("src/python", target_name=name),
+        )
+        return TargetWithOrigin(tgt, SingleAddress("src/python", name))
+
+    def fake_digest(n: int) -> Digest:
+        return Digest(str(n).rjust(64, "0"), n)
+
+    runs: List[str] = []
+    merged: List[MergeDigests] = []
+    owners_requests: Set[ExportedTargetOwnersRequest] = set()
+
+    def chroot(request: SetupPyChrootRequest) -> SetupPyChroot:
+        owners_requests.add(request.owners_request)
+        name = request.exported_target.provides.name
+        return SetupPyChroot(fake_digest(ord(name)), "{}")
+
+    def run_setup_py(request: RunSetupPyRequest) -> RunSetupPyResult:
+        name = request.exported_target.provides.name
+        runs.append(name)
+        return RunSetupPyResult(fake_digest(10 + len(name)))
+
+    def merge(request: MergeDigests) -> Digest:
+        merged.append(request)
+        return EMPTY_DIGEST
+
+    class FakeWorkspace:
+        def __init__(self) -> None:
+            self.writes: List[Digest] = []
+
+        def write_digest(self, digest: Digest, *, path_prefix=None) -> None:
+            self.writes.append(digest)
+
+    workspace = FakeWorkspace()
+    console = MockConsole(use_colors=False)
+    result = run_rule(
+        run_setup_pys,
+        rule_args=[
+            TargetsWithOrigins([exported("a"), exported("b"), exported("c")]),
+            create_goal_subsystem(SetupPySubsystem, args=["bdist_wheel"], transitive=False),
+            console,
+            create_subsystem(PythonSetup, interpreter_constraints=["CPython>=3.6"]),
+            DistDir(Path("dist")),
+            workspace,
+            UnionMembership({}),
+        ],
+        mock_gets=[
+            MockGet(product_type=SetupPyChroot, subject_type=SetupPyChrootRequest, mock=chroot),
+            MockGet(
+                product_type=RunSetupPyResult, subject_type=RunSetupPyRequest, mock=run_setup_py
+            ),
+            MockGet(product_type=Digest, subject_type=MergeDigests, mock=merge),
+            # Unused without `--transitive`, or when args are passed.
+            MockGet(product_type=TransitiveTargets, subject_type=Addresses, mock=None),
+            MockGet(
+                product_type=ExportedTargetOwners,
+                subject_type=ExportedTargetOwnersRequest,
+                mock=None,
+            ),
+            MockGet(product_type=Digest, subject_type=AddPrefix, mock=None),
+        ],
+    )
+    assert result.exit_code == 0
+    assert runs == ["a", "b", "c"]
+    # The owners of all of the exported targets are computed together.
+    assert [sorted(addr.spec for addr in request.addresses) for request in owners_requests] == [
+        ["src/python:a", "src/python:b", "src/python:c"]
+    ]
+    # All dists are written at once.
+    assert len(merged) == 1
+    assert workspace.writes == [EMPTY_DIGEST]
+    assert console.stderr.getvalue().splitlines() == [
+        "Writing dists for src/python:a, src/python:b, src/python:c under dist/."
+    ]
+
 
 def test_validate_args() -> None:
     with pytest.raises(InvalidSetupPyArgs):
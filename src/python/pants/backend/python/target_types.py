@@ -108,10 +108,28 @@ class PythonBinaryDefaults(Subsystem):
             ),
         )
 
+        register(
+            "--incremental",
+            advanced=True,
+            type=bool,
+            default=False,
+            help=(
+                "Assemble PEX binaries incrementally, so that editing first-party sources does not "
+                "rebuild the requirements of the binary. `binary` appends the sources to a cached "
+                "PEX of the requirements, and `run` runs an unzipped PEX of the requirements in "
+                "place, next to the sources. Requires a bootstrap Python interpreter to be found: "
+                "see the `interpreter_search_paths` option in the `[python-setup]` scope."
+            ),
+        )
+
     @property
     def pex_emit_warnings(self) -> bool:
         return cast(bool, self.options.pex_emit_warnings)
 
+    @property
+    def incremental(self) -> bool:
+        return cast(bool, self.options.incremental)
+
 
 class PythonBinarySources(PythonSources):
     """A single file containing the executable, such as ['app.py'].
@@ -2,17 +2,32 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import functools
+import os
 import threading
 
 
+class FileNotLoadedError(Exception):
+    """Indicates that a BUILD file read a file which has not been loaded for its parse.
+
+    The engine loads files on behalf of BUILD files, so that it can track them: it catches this
+    error, loads the file, and then parses the BUILD file again with the file's content.
+    """
+
+    def __init__(self, path):
+        super().__init__(f"The file {path!r} has not been loaded.")
+        self.path = path
+
+
 class Storage(threading.local):
     def __init__(self, rel_path):
         self.clear(rel_path)
 
-    def clear(self, rel_path):
+    def clear(self, rel_path, file_contents=None):
         self.rel_path = rel_path
         self.objects_by_name = dict()
         self.objects = []
+        self.file_contents = file_contents or {}
+        self.files_read = []
 
     def add(self, obj, name=None):
         if name is not None:
@@ -94,3 +109,22 @@ class ParseContext:
         :rtype string
         """
         return self._storage.rel_path
+
+    def read_file(self, relpath):
+        """Returns the content of the file at the relpath from the BUILD file, as bytes.
+
+        Macros should use this rather than reading files directly, so that the engine is aware of
+        the file, and will re-parse the BUILD file when it changes.
+
+        :API: public
+
+        :param string relpath: The relpath from the BUILD file to the file.
+        :raises: :class:`FileNotLoadedError` if the file has not been loaded for this parse yet.
+        :rtype bytes
+        """
+        path = os.path.normpath(os.path.join(self.rel_path, relpath))
+        self._storage.files_read.append(path)
+        content = self._storage.file_contents.get(path)
+        if content is None:
+            raise FileNotLoadedError(path)
+        return content
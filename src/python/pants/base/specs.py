@@ -5,17 +5,7 @@ import itertools
 import os
 from abc import ABC, ABCMeta, abstractmethod
 from dataclasses import dataclass
-from typing import (
-    TYPE_CHECKING,
-    Iterable,
-    Iterator,
-    Mapping,
-    Optional,
-    Sequence,
-    Tuple,
-    Union,
-    cast,
-)
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Tuple, Union, cast
 
 from pants.base.exceptions import ResolveError
 from pants.build_graph.address import Address
@@ -23,12 +13,12 @@ from pants.engine.collection import Collection
 from pants.engine.fs import GlobExpansionConjunction, GlobMatchErrorBehavior, PathGlobs
 from pants.engine.internals.target_adaptor import TargetAdaptor
 from pants.util.collections import assert_single_element
-from pants.util.dirutil import fast_relpath_optional, recursive_dirname
+from pants.util.dirutil import recursive_dirname
 from pants.util.memo import memoized_property
 from pants.util.meta import frozen_after_init
 
 if TYPE_CHECKING:
-    from pants.engine.internals.mapper import AddressFamily
+    from pants.engine.internals.mapper import AddressFamily, AddressFamilyIndex
 
 
 class Spec(ABC):
@@ -44,9 +34,9 @@ def _globs_in_single_dir(dir_path: str, build_patterns: Iterable[str]) -> Tuple[
 
 
 def _address_family_for_dir(
-    dir_path: str, address_families: Mapping[str, "AddressFamily"]
+    dir_path: str, address_family_index: "AddressFamilyIndex"
 ) -> "AddressFamily":
-    maybe_af = address_families.get(dir_path)
+    maybe_af = address_family_index.get(dir_path)
     if maybe_af is None:
         raise ResolveError(f"Path '{dir_path}' does not contain any BUILD files.")
     return maybe_af
@@ -71,9 +61,9 @@ class AddressSpec(Spec, metaclass=ABCMeta):
 
     @abstractmethod
     def matching_address_families(
-        self, address_families_dict: Mapping[str, "AddressFamily"]
+        self, address_family_index: "AddressFamilyIndex"
     ) -> Tuple["AddressFamily", ...]:
-        """Given a dict of (namespace path) -> AddressFamily, return the values matching this
+        """Given an index of AddressFamilies by directory, return the AddressFamilies matching this
         address spec.
 
         :raises: :class:`ResolveError` if no address families matched this spec and this spec type
@@ -112,9 +102,9 @@ class SingleAddress(AddressSpec):
         return _globs_in_single_dir(self.directory, build_patterns)
 
     def matching_address_families(
-        self, address_families_dict: Mapping[str, "AddressFamily"]
+        self, address_family_index: "AddressFamilyIndex"
     ) -> Tuple["AddressFamily", ...]:
-        return (_address_family_for_dir(self.directory, address_families_dict),)
+        return (_address_family_for_dir(self.directory, address_family_index),)
 
     def matching_addresses(
         self, address_families: Sequence["AddressFamily"]
@@ -143,9 +133,9 @@ class SiblingAddresses(AddressSpec):
         return _globs_in_single_dir(self.directory, build_patterns)
 
     def matching_address_families(
-        self, address_families_dict: Mapping[str, "AddressFamily"]
+        self, address_family_index: "AddressFamilyIndex"
     ) -> Tuple["AddressFamily", ...]:
-        return (_address_family_for_dir(self.directory, address_families_dict),)
+        return (_address_family_for_dir(self.directory, address_family_index),)
 
     def matching_addresses(
         self, address_families: Sequence["AddressFamily"]
@@ -166,13 +156,9 @@ class DescendantAddresses(AddressSpec):
         return tuple(os.path.join(self.directory, "**", pat) for pat in build_patterns)
 
     def matching_address_families(
-        self, address_families_dict: Mapping[str, "AddressFamily"]
+        self, address_family_index: "AddressFamilyIndex"
     ) -> Tuple["AddressFamily", ...]:
-        return tuple(
-            af
-            for ns, af in address_families_dict.items()
-            if fast_relpath_optional(ns, self.directory) is not None
-        )
+        return address_family_index.descendants(self.directory)
 
     def matching_addresses(
         self, address_families: Sequence["AddressFamily"]
@@ -200,13 +186,9 @@ class AscendantAddresses(AddressSpec):
         )
 
     def matching_address_families(
-        self, address_families_dict: Mapping[str, "AddressFamily"]
+        self, address_family_index: "AddressFamilyIndex"
     ) -> Tuple["AddressFamily", ...]:
-        return tuple(
-            af
-            for ns, af in address_families_dict.items()
-            if fast_relpath_optional(self.directory, ns) is not None
-        )
+        return address_family_index.ascendants(self.directory)
 
     def matching_addresses(
         self, address_families: Sequence["AddressFamily"]
@@ -3,8 +3,9 @@
 
 import logging
 import os
+import time
 from dataclasses import dataclass
-from typing import Mapping, Optional, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from pants.base.build_environment import get_buildroot
 from pants.base.cmd_line_spec_parser import CmdLineSpecParser
@@ -57,6 +58,7 @@ class LocalPantsRunner:
     union_membership: UnionMembership
     profile_path: Optional[str]
     _run_tracker: RunTracker
+    _start_time: Optional[float] = None
 
     @staticmethod
     def parse_options(
@@ -83,12 +85,17 @@ class LocalPantsRunner:
         dynamic_ui = global_scope.dynamic_ui if global_scope.v2 else False
         use_colors = global_scope.get("colors", True)
 
-        stream_workunits = len(options.for_global_scope().streaming_workunits_handlers) != 0
+        run_tracker = RunTracker.global_instance()
+        stream_workunits = (
+            len(options.for_global_scope().streaming_workunits_handlers) != 0
+            or run_tracker.records_engine_workunits
+        )
         return graph_scheduler_helper.new_session(
-            RunTracker.global_instance().run_id,
+            run_tracker.run_id,
             dynamic_ui=dynamic_ui,
             use_colors=use_colors,
             should_report_workunits=stream_workunits,
+            should_record_node_metrics=run_tracker.records_node_metrics,
         )
 
     @classmethod
@@ -154,6 +161,13 @@ class LocalPantsRunner:
         os.environ["PANTS_PARENT_BUILD_ID"] = self._run_tracker.run_id
 
         self._run_tracker.start(self.options, run_start_time=start_time)
+        self._run_tracker.set_backend_load_timings(self.build_config.backend_load_timings)
+        self._start_time = start_time
+        client_connect_seconds = os.environ.get("PANTSD_RUNTRACKER_CLIENT_CONNECT_SECONDS")
+        if client_connect_seconds is not None:
+            self._run_tracker.run_info.add_info(
+                "pantsd_client_connect_seconds", float(client_connect_seconds), stringify=False
+            )
 
         spec_parser = CmdLineSpecParser(get_buildroot())
         specs = [str(spec_parser.parse_spec(spec)) for spec in self.options.specs]
@@ -184,6 +198,12 @@ class LocalPantsRunner:
         return exit_code
 
     def _maybe_run_v2_body(self, goals, poll: bool) -> ExitCode:
+        if self._run_tracker.run_info.get_info("startup_seconds") is None:
+            # The time from the start of the run (on the client, if running via pantsd) to the
+            # first goal being requested from the engine.
+            self._run_tracker.run_info.add_info(
+                "startup_seconds", time.time() - self._start_time, stringify=False
+            )
         return self.graph_session.run_goal_rules(
             options_bootstrapper=self.options_bootstrapper,
             union_membership=self.union_membership,
@@ -202,7 +222,9 @@ class LocalPantsRunner:
                 max_code = code
         return max_code
 
-    def _finish_run(self, code: ExitCode) -> ExitCode:
+    def _finish_run(
+        self, code: ExitCode, streaming_workunit_metrics: Optional[Dict[str, Any]] = None
+    ) -> ExitCode:
         """Checks that the RunTracker is in good shape to exit, and then returns its exit code.
 
         TODO: The RunTracker's exit code will likely not be relevant in v2: the exit codes of
@@ -214,7 +236,12 @@ class LocalPantsRunner:
 
         try:
             metrics = scheduler_session.metrics()
+            metrics.update(self.graph_session.build_file_parser_metrics())
+            if streaming_workunit_metrics:
+                metrics["streaming_workunit_handlers"] = streaming_workunit_metrics
             self._run_tracker.pantsd_stats.set_scheduler_metrics(metrics)
+            if self._run_tracker.records_node_metrics:
+                self._run_tracker.set_engine_node_metrics(scheduler_session.node_metrics())
             outcome = WorkUnit.SUCCESS if code == PANTS_SUCCEEDED_EXIT_CODE else WorkUnit.FAILURE
             self._run_tracker.set_root_outcome(outcome)
             run_tracker_result = self._run_tracker.end()
@@ -237,6 +264,15 @@ class LocalPantsRunner:
                 self.graph_session.scheduler_session,
                 callbacks=callbacks,
                 report_interval_seconds=report_interval,
+                queue_size=global_options.streaming_workunits_queue_size,
+                overflow=global_options.streaming_workunits_overflow,
+                # NB: The RunTracker receives every workunit, regardless of the overflow behavior
+                # of the streaming handlers' queues.
+                internal_callbacks=(
+                    [self._run_tracker.handle_workunits]
+                    if self._run_tracker.records_engine_workunits
+                    else []
+                ),
             )
 
             if self.options.help_request:
@@ -253,11 +289,15 @@ class LocalPantsRunner:
                 )
                 return help_printer.print_help()
 
+            engine_result = PANTS_FAILED_EXIT_CODE
             with streaming_reporter.session():
-                engine_result = PANTS_FAILED_EXIT_CODE
                 try:
                     engine_result = self._run_v2()
                 except Exception as e:
                     ExceptionSink.log_exception(e)
-                run_tracker_result = self._finish_run(engine_result)
+            # NB: The run is finished after the streaming session has ended, so that the final
+            # chunk of workunits has been delivered to the RunTracker.
+            run_tracker_result = self._finish_run(
+                engine_result, streaming_workunit_metrics=streaming_reporter.metrics()
+            )
             return self._merge_exit_codes(engine_result, run_tracker_result)
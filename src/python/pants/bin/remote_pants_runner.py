@@ -14,6 +14,8 @@ from pants.java.nailgun_client import NailgunClient
 from pants.java.nailgun_protocol import NailgunProtocol
 from pants.option.options_bootstrapper import OptionsBootstrapper
 from pants.pantsd.pants_daemon_client import PantsDaemonClient
+from pants.pantsd.process_manager import ProcessMetadataManager
+from pants.pantsd.watchers import PathWaiter
 from pants.util.dirutil import maybe_read_file
 
 logger = logging.getLogger(__name__)
@@ -103,9 +105,27 @@ class RemotePantsRunner:
             yield
 
     @staticmethod
-    def _backoff(attempt):
-        """Minimal backoff strategy for daemon restarts."""
-        time.sleep(attempt + (attempt - 1))
+    def _backoff(attempt, pantsd_handle: PantsDaemonClient.Handle):
+        """Minimal backoff strategy for daemon restarts.
+
+        Waits for up to `2 * attempt - 1` seconds, but returns early once a daemon which was
+        restarted concurrently has written a new socket (port) for us to connect to. The daemon
+        writes its other metadata (e.g. its pid and fingerprint) before it is ready to accept
+        connections, so we wait for the socket specifically.
+        """
+        socket_file = ProcessMetadataManager.metadata_file_path(
+            "pantsd", "socket", pantsd_handle.metadata_base_dir
+        )
+        deadline = time.time() + attempt + (attempt - 1)
+        with PathWaiter(socket_file) as waiter:
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return
+                port = maybe_read_file(socket_file)
+                if port and port.strip() != str(pantsd_handle.port):
+                    return
+                waiter.wait(remaining)
 
     def _run_pants_with_retry(
         self, pantsd_handle: PantsDaemonClient.Handle, retries: int = 3
@@ -127,7 +147,7 @@ class RemotePantsRunner:
                 if attempt > retries:
                     raise self.Fallback(e)
 
-                self._backoff(attempt)
+                self._backoff(attempt, pantsd_handle)
                 logger.warning(
                     "pantsd was unresponsive on port {}, retrying ({}/{})".format(
                         pantsd_handle.port, attempt, retries
@@ -156,6 +176,8 @@ class RemotePantsRunner:
             **self._env,
             **ng_env,
             "PANTSD_RUNTRACKER_CLIENT_START_TIME": str(self._start_time),
+            # The time spent launching and/or connecting to pantsd before the run was handed off.
+            "PANTSD_RUNTRACKER_CLIENT_CONNECT_SECONDS": str(time.time() - self._start_time),
             "PANTSD_REQUEST_TIMEOUT_LIMIT": str(
                 self._bootstrap_options.for_global_scope().pantsd_timeout_when_multiple_invocations
             ),
@@ -12,6 +12,7 @@ from pants.engine.rules import Rule, RuleIndex
 from pants.engine.target import Target
 from pants.engine.unions import UnionRule
 from pants.option.optionable import Optionable
+from pants.util.frozendict import FrozenDict
 from pants.util.ordered_set import FrozenOrderedSet, OrderedSet
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,9 @@ class BuildConfiguration:
     rules: FrozenOrderedSet[Rule]
     union_rules: FrozenOrderedSet[UnionRule]
     target_types: FrozenOrderedSet[Type[Target]]
+    # The wall time (in seconds) spent importing and registering each backend or plugin, in load
+    # order. Used to attribute startup cost to individual backends.
+    backend_load_timings: FrozenDict[str, float] = FrozenDict()
 
     @dataclass
     class Builder:
@@ -35,6 +39,7 @@ class BuildConfiguration:
         _rules: OrderedSet = field(default_factory=OrderedSet)
         _union_rules: OrderedSet = field(default_factory=OrderedSet)
         _target_types: OrderedSet[Type[Target]] = field(default_factory=OrderedSet)
+        _backend_load_timings: Dict[str, float] = field(default_factory=dict)
 
         def registered_aliases(self) -> BuildFileAliases:
             """Return the registered aliases exposed in BUILD files.
@@ -132,8 +137,10 @@ class BuildConfiguration:
             rules, union_rules = RuleIndex.create(rules).normalized_rules()
             self._rules.update(rules)
             self._union_rules.update(union_rules)
+            # NB: Only the newly registered rules are inspected, as the optionables of previously
+            # registered rules have already been collected.
             self.register_optionables(
-                rule.output_type for rule in self._rules if issubclass(rule.output_type, Optionable)
+                rule.output_type for rule in rules if issubclass(rule.output_type, Optionable)
             )
 
         # NB: We expect the parameter to be Iterable[Type[Target]], but we can't be confident in this
@@ -160,6 +167,12 @@ class BuildConfiguration:
                 )
             self._target_types.update(target_types)
 
+        def record_backend_load_time(self, backend: str, seconds: float) -> None:
+            """Records the time spent importing and registering the given backend or plugin."""
+            self._backend_load_timings[backend] = (
+                self._backend_load_timings.get(backend, 0.0) + seconds
+            )
+
         def create(self) -> "BuildConfiguration":
             registered_aliases = BuildFileAliases(
                 objects=self._exposed_object_by_alias.copy(),
@@ -171,4 +184,5 @@ class BuildConfiguration:
                 rules=FrozenOrderedSet(self._rules),
                 union_rules=FrozenOrderedSet(self._union_rules),
                 target_types=FrozenOrderedSet(self._target_types),
+                backend_load_timings=FrozenDict(self._backend_load_timings),
             )
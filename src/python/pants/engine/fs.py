@@ -1,6 +1,7 @@
 # Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import re
 from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, Iterable, Optional, Tuple
@@ -143,6 +144,34 @@ class PathGlobs:
                     "helpful to users when their globs fail to match."
                 )
 
+    @classmethod
+    def for_paths(
+        cls,
+        paths: Iterable[str],
+        glob_match_error_behavior: GlobMatchErrorBehavior = GlobMatchErrorBehavior.ignore,
+        description_of_origin: Optional[str] = None,
+    ) -> "PathGlobs":
+        """Returns PathGlobs which match exactly the given paths, even if they contain glob
+        metacharacters."""
+        path_set = set(paths)
+        globs = []
+        for path in sorted(path_set):
+            escaped = re.sub(r"([*?[\]])", r"[\1]", path)
+            if not escaped.startswith("!"):
+                globs.append(escaped)
+                continue
+            # A leading `!` marks an exclude, so it is matched by a character class, which must
+            # contain another character. That character is `]`, so any such path which was not
+            # requested is excluded.
+            globs.append(f"[]!]{escaped[1:]}")
+            if f"]{path[1:]}" not in path_set:
+                globs.append(f"![]]{escaped[1:]}")
+        return cls(
+            globs,
+            glob_match_error_behavior=glob_match_error_behavior,
+            description_of_origin=description_of_origin,
+        )
+
 
 @dataclass(frozen=True)
 class PathGlobsAndRoot:
@@ -738,6 +738,20 @@ class FSTest(TestBase, SchedulerTestBase):
         subset_digest = self.request_single_product(Digest, subset_input)
         assert subset_snapshot.digest == subset_digest
 
+    def test_path_globs_for_paths(self) -> None:
+        paths = ["a[1].py", "b*.py", "c?.py", "!d.py", "!e.py", "]e.py"]
+        digest = self.request_single_product(
+            Digest,
+            CreateDigest(
+                FileContent(path, b"")
+                for path in [*paths, "a1.py", "bb.py", "cc.py", "]d.py", "!f.py"]
+            ),
+        )
+        subset_snapshot = self.request_single_product(
+            Snapshot, DigestSubset(digest, PathGlobs.for_paths(paths))
+        )
+        assert set(subset_snapshot.files) == set(paths)
+
     def test_file_content_invalidated(self) -> None:
         """Test that we can update files and have the native engine invalidate previous operations
         on those files."""
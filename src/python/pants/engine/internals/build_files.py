@@ -2,9 +2,10 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import os.path
-from typing import Any, Dict
+from typing import Any, Dict, List, Set
 
 from pants.base.exceptions import ResolveError
+from pants.base.parse_context import FileNotLoadedError
 from pants.base.project_tree import Dir
 from pants.base.specs import AddressSpec, AddressSpecs, SingleAddress
 from pants.engine.addresses import (
@@ -17,7 +18,12 @@ from pants.engine.addresses import (
     BuildFileAddresses,
 )
 from pants.engine.fs import DigestContents, GlobMatchErrorBehavior, PathGlobs, Snapshot
-from pants.engine.internals.mapper import AddressFamily, AddressMap, AddressMapper
+from pants.engine.internals.mapper import (
+    AddressFamily,
+    AddressFamilyIndex,
+    AddressMap,
+    AddressMapper,
+)
 from pants.engine.internals.parser import BuildFilePreludeSymbols, error_on_imports
 from pants.engine.internals.target_adaptor import TargetAdaptor
 from pants.engine.rules import Get, MultiGet, collect_rules, rule
@@ -92,10 +98,58 @@ async def parse_address_family(
     if not digest_contents:
         raise ResolveError(f"Directory '{directory.path}' does not contain any BUILD files.")
 
-    address_maps = [
-        AddressMap.parse(fc.path, fc.content.decode(), address_mapper.parser, prelude_symbols)
-        for fc in digest_contents
-    ]
+    # BUILD files may read other files (e.g. the requirements files read by `python_requirements`),
+    # which are loaded via the engine so that changes to them invalidate this AddressFamily. We
+    # preload the files that each BUILD file read when it was last parsed, and otherwise load them
+    # as they are discovered, by parsing the BUILD file again each time it reads an unloaded file.
+    address_maps: List[AddressMap] = []
+    for fc in digest_contents:
+        build_file_content = fc.content.decode()
+        file_dependencies = address_mapper.parser.file_dependencies(fc.path, build_file_content)
+        preloaded_contents = (
+            await Get(DigestContents, PathGlobs, PathGlobs.for_paths(file_dependencies))
+            if file_dependencies
+            else DigestContents()
+        )
+        file_contents = {
+            file_content.path: file_content.content for file_content in preloaded_contents
+        }
+        requested_paths: Set[str] = set()
+        while True:
+            try:
+                address_maps.append(
+                    AddressMap.parse(
+                        fc.path,
+                        build_file_content,
+                        address_mapper.parser,
+                        prelude_symbols,
+                        file_contents,
+                    )
+                )
+                break
+            except FileNotLoadedError as e:
+                # Every parse must load a new file, or the BUILD file would be parsed forever.
+                if e.path in requested_paths:
+                    raise ResolveError(
+                        f"{fc.path} read the file {e.path!r} again after it was loaded."
+                    )
+                requested_paths.add(e.path)
+                loaded_contents = await Get(
+                    DigestContents,
+                    PathGlobs,
+                    PathGlobs.for_paths(
+                        [e.path],
+                        glob_match_error_behavior=GlobMatchErrorBehavior.error,
+                        description_of_origin=fc.path,
+                    ),
+                )
+                file_contents.update(
+                    (file_content.path, file_content.content) for file_content in loaded_contents
+                )
+                if e.path not in file_contents:
+                    raise ResolveError(
+                        f"{fc.path} read the file {e.path!r}, which could not be loaded."
+                    )
     return AddressFamily.create(directory.path, address_maps)
 
 
@@ -149,6 +203,18 @@ async def find_target_adaptor(address: Address) -> TargetAdaptor:
     return target_adaptor
 
 
+@rule
+async def index_address_families(build_files: Snapshot) -> AddressFamilyIndex:
+    """Given a Snapshot of BUILD files, index the AddressFamilies of their directories.
+
+    NB: The index is memoized by the engine for the Snapshot, so it is only recomputed when the
+    BUILD files covered by the Snapshot change.
+    """
+    dirnames = {os.path.dirname(f) for f in build_files.files}
+    address_families = await MultiGet(Get(AddressFamily, Dir(d)) for d in dirnames)
+    return AddressFamilyIndex.create(address_families)
+
+
 @rule
 async def addresses_with_origins_from_address_specs(
     address_mapper: AddressMapper, address_specs: AddressSpecs
@@ -167,16 +233,14 @@ async def addresses_with_origins_from_address_specs(
             build_ignore_patterns=address_mapper.build_ignore_patterns,
         ),
     )
-    dirnames = {os.path.dirname(f) for f in snapshot.files}
-    address_families = await MultiGet(Get(AddressFamily, Dir(d)) for d in dirnames)
-    address_family_by_directory = {af.namespace: af for af in address_families}
+    address_family_index = await Get(AddressFamilyIndex, Snapshot, snapshot)
 
     matched_addresses: OrderedSet[Address] = OrderedSet()
     addr_to_origin: Dict[Address, AddressSpec] = {}
 
     for address_spec in address_specs:
         # These may raise ResolveError, depending on the type of spec.
-        addr_families_for_spec = address_spec.matching_address_families(address_family_by_directory)
+        addr_families_for_spec = address_spec.matching_address_families(address_family_index)
         addr_target_pairs_for_spec = address_spec.matching_addresses(addr_families_for_spec)
 
         if isinstance(address_spec, SingleAddress) and not addr_target_pairs_for_spec:
@@ -26,10 +26,11 @@ from pants.engine.fs import Digest, DigestContents, FileContent, PathGlobs, Snap
 from pants.engine.internals.build_files import (
     addresses_with_origins_from_address_specs,
     evaluate_preludes,
+    index_address_families,
     parse_address_family,
     strip_address_origins,
 )
-from pants.engine.internals.mapper import AddressFamily, AddressMapper
+from pants.engine.internals.mapper import AddressFamily, AddressFamilyIndex, AddressMapper
 from pants.engine.internals.parser import BuildFilePreludeSymbols, Parser
 from pants.engine.internals.scheduler import ExecutionError
 from pants.engine.internals.target_adaptor import TargetAdaptor
@@ -59,6 +60,76 @@ def test_parse_address_family_empty() -> None:
     assert len(af.name_to_target_adaptors) == 0
 
 
+def test_parse_address_family_read_file() -> None:
+    """Test that files read by BUILD files are loaded via the engine, and preloaded when the BUILD
+    file is parsed again."""
+
+    def mock_tgts_from_file(parse_context):
+        def create(relpath: str) -> None:
+            for name in parse_context.read_file(relpath).decode().split():
+                parse_context.create_object("mock_tgt", name=name)
+
+        return create
+
+    address_mapper = AddressMapper(
+        parser=Parser(
+            target_type_aliases=["mock_tgt"],
+            object_aliases=BuildFileAliases(
+                context_aware_object_factories={"mock_tgts_from_file": mock_tgts_from_file}
+            ),
+        )
+    )
+    # NB: The file's name contains glob metacharacters, which must be escaped to load it.
+    files = {
+        "helloworld/BUILD": b"mock_tgts_from_file('names[1].txt')",
+        "helloworld/names[1].txt": b"a b",
+    }
+    requested_globs = []
+
+    def mock_digest_contents(path_globs: PathGlobs) -> DigestContents:
+        requested_globs.append(path_globs.globs)
+        return DigestContents(
+            FileContent(path, content)
+            for path, content in files.items()
+            if path == "helloworld/BUILD"
+            or PathGlobs.for_paths([path]).globs[0] in path_globs.globs
+        )
+
+    def parse() -> AddressFamily:
+        return cast(
+            AddressFamily,
+            run_rule(
+                parse_address_family,
+                rule_args=[
+                    address_mapper,
+                    BuildFilePreludeSymbols(FrozenDict()),
+                    Dir("helloworld"),
+                ],
+                mock_gets=[
+                    MockGet(
+                        product_type=DigestContents,
+                        subject_type=PathGlobs,
+                        mock=mock_digest_contents,
+                    ),
+                ],
+            ),
+        )
+
+    assert {"a", "b"} == set(parse().name_to_target_adaptors)
+    assert [("helloworld/names[[]1[]].txt",)] == requested_globs[1:]
+
+    # The second parse preloads the file, rather than discovering it by failing to parse.
+    requested_globs.clear()
+    files["helloworld/names[1].txt"] = b"c"
+    assert {"c"} == set(parse().name_to_target_adaptors)
+    assert [("helloworld/names[[]1[]].txt",)] == requested_globs[1:]
+
+    # A file which cannot be loaded fails the parse, rather than parsing the BUILD file forever.
+    del files["helloworld/names[1].txt"]
+    with pytest.raises(ResolveError, match="could not be loaded"):
+        parse()
+
+
 def resolve_addresses_with_origins_from_address_specs(
     address_specs: AddressSpecs,
     address_family: AddressFamily,
@@ -77,12 +148,34 @@ def resolve_addresses_with_origins_from_address_specs(
         rule_args=[address_mapper, address_specs],
         mock_gets=[
             MockGet(product_type=Snapshot, subject_type=PathGlobs, mock=lambda _: snapshot),
-            MockGet(product_type=AddressFamily, subject_type=Dir, mock=lambda _: address_family,),
+            MockGet(
+                product_type=AddressFamilyIndex,
+                subject_type=Snapshot,
+                mock=lambda _: AddressFamilyIndex.create([address_family]),
+            ),
         ],
     )
     return cast(AddressesWithOrigins, addresses_with_origins)
 
 
+def test_index_address_families() -> None:
+    snapshot = Snapshot(Digest("xx", 2), ("a/BUILD", "a/BUILD.other", "a/b/BUILD"), ())
+    address_family_index = run_rule(
+        index_address_families,
+        rule_args=[snapshot],
+        mock_gets=[
+            MockGet(
+                product_type=AddressFamily,
+                subject_type=Dir,
+                mock=lambda d: AddressFamily.create(d.path, []),
+            ),
+        ],
+    )
+    assert address_family_index == AddressFamilyIndex.create(
+        [AddressFamily.create("a", []), AddressFamily.create("a/b", [])]
+    )
+
+
 def test_address_specs_duplicated() -> None:
     """Test that matching the same AddressSpec twice succeeds."""
     address_spec = SingleAddress("root", "root")
@@ -303,6 +396,46 @@ class BuildFileIntegrationTest(TestBase):
             self.request_single_product(TargetAdaptor, Address("helloworld"))
 
 
+class BuildFileReadFileIntegrationTest(TestBase):
+    @classmethod
+    def target_types(cls):
+        return [MockTgt]
+
+    @classmethod
+    def alias_groups(cls):
+        def mock_tgts_from_file(parse_context):
+            def create(relpath: str) -> None:
+                for name in parse_context.read_file(relpath).decode().split():
+                    parse_context.create_object("mock_tgt", name=name)
+
+            return create
+
+        return BuildFileAliases(
+            context_aware_object_factories={"mock_tgts_from_file": mock_tgts_from_file}
+        )
+
+    def target_names(self) -> Iterable[str]:
+        address_family = self.request_single_product(AddressFamily, Dir("helloworld"))
+        return sorted(
+            address.target_name for address in address_family.addresses_to_target_adaptors
+        )
+
+    def test_read_file(self) -> None:
+        self.add_to_build_file("helloworld", "mock_tgts_from_file('names.txt')")
+        self.create_file("helloworld/names.txt", "a b")
+        assert ["a", "b"] == self.target_names()
+
+        # The file is tracked by the engine, so editing it invalidates the BUILD file.
+        self.create_file("helloworld/names.txt", "c")
+        assert ["c"] == self.target_names()
+
+    def test_read_file_nonexistent(self) -> None:
+        self.add_to_build_file("helloworld", "mock_tgts_from_file('names.txt')")
+        with pytest.raises(ExecutionError) as exc:
+            self.target_names()
+        assert "helloworld/names.txt" in str(exc.value)
+
+
 class ResolveAddressIntegrationTest(TestBase):
     @classmethod
     def rules(cls):
@@ -5,11 +5,13 @@ import functools
 import itertools
 import logging
 import os.path
+from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import PurePath
 from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Type, Union
 
 from pants.base.exceptions import ResolveError
+from pants.base.project_tree import Dir
 from pants.base.specs import (
     AddressSpecs,
     AscendantAddresses,
@@ -24,7 +26,6 @@ from pants.engine.addresses import (
     AddressesWithOrigins,
     AddressInput,
     AddressWithOrigin,
-    BuildFileAddress,
 )
 from pants.engine.collection import Collection
 from pants.engine.fs import (
@@ -36,6 +37,7 @@ from pants.engine.fs import (
     Snapshot,
     SourcesSnapshot,
 )
+from pants.engine.internals.mapper import AddressFamily, AddressMapper
 from pants.engine.internals.target_adaptor import TargetAdaptor
 from pants.engine.rules import Get, MultiGet, RootRule, collect_rules, rule
 from pants.engine.target import (
@@ -71,7 +73,9 @@ from pants.engine.target import (
 )
 from pants.engine.unions import UnionMembership
 from pants.option.global_options import GlobalOptions, OwnersNotFoundBehavior
-from pants.source.filespec import matches_filespec
+from pants.source.filespec import matches_filespecs
+from pants.util.dirutil import recursive_dirname
+from pants.util.frozendict import FrozenDict
 from pants.util.ordered_set import FrozenOrderedSet, OrderedSet
 
 logger = logging.getLogger(__name__)
@@ -347,50 +351,145 @@ class Owners(Collection[Address]):
     pass
 
 
+@dataclass(frozen=True)
+class OwnersIndex:
+    """An index of the files owned by the targets declared in a single directory.
+
+    This is computed (and memoized by the engine) once per AddressFamily, so that the cost of an
+    ownership query is proportional to the number of files queried, rather than to the number of
+    candidate targets times the number of files.
+
+    :param build_file_owners: The (expanded) addresses declared in each BUILD file.
+    :param file_owners: The generated subtarget addresses owning each existing file.
+    :param unsplit_targets: Expanded targets which did not generate subtargets, and so must still
+        be matched against existing files using their `sources` globs.
+    :param unexpanded_targets: The base targets, used to match deleted files using their `sources`
+        globs, since no subtargets can be generated for deleted files.
+    """
+
+    build_file_owners: FrozenDict[str, Tuple[Address, ...]]
+    file_owners: FrozenDict[str, Tuple[Address, ...]]
+    unsplit_targets: Tuple[Target, ...]
+    unexpanded_targets: Tuple[Target, ...]
+
+    def owners(self, sources: Iterable[str], *, live: bool) -> Tuple[Tuple[Address, ...], Set[str]]:
+        """Return the owners of the given sources, and the subset of the sources they matched.
+
+        The owners are returned in the order in which they were declared in the BUILD file(s).
+        """
+        sources_set = FrozenOrderedSet(sources)
+        matching_addresses: Set[Address] = set()
+        matching_files: Set[str] = set()
+
+        if live:
+            for source in sources_set:
+                owners = self.file_owners.get(source, ()) + self.build_file_owners.get(source, ())
+                if source in self.file_owners:
+                    matching_files.add(source)
+                matching_addresses.update(owners)
+            candidate_targets = self.unsplit_targets
+            ordered_addresses: Iterable[Address] = itertools.chain.from_iterable(
+                self.build_file_owners.values()
+            )
+        else:
+            candidate_targets = self.unexpanded_targets
+            ordered_addresses = (tgt.address for tgt in self.unexpanded_targets)
+
+        # Match all of the candidates' globs against the sources in a single native call.
+        candidates_matching_files = (
+            matches_filespecs(
+                [tgt.get(Sources).filespec for tgt in candidate_targets], paths=sources_set
+            )
+            if candidate_targets
+            else ()
+        )
+        for candidate_tgt, matching_target_files in zip(
+            candidate_targets, candidates_matching_files
+        ):
+            if matching_target_files:
+                matching_files.update(matching_target_files)
+                matching_addresses.add(candidate_tgt.address)
+
+        return (
+            tuple(address for address in ordered_addresses if address in matching_addresses),
+            matching_files,
+        )
+
+
 @rule
-async def find_owners(owners_request: OwnersRequest) -> Owners:
+async def index_owners_in_directory(directory: Dir) -> OwnersIndex:
+    address_family = await Get(AddressFamily, Dir, directory)
+    build_file_addresses = address_family.build_file_addresses
+    base_addresses = Addresses(bfa.address for bfa in build_file_addresses)
+    unexpanded_targets = await Get(UnexpandedTargets, Addresses, base_addresses)
+    base_targets_subtargets = await MultiGet(
+        Get(Subtargets, Address, address) for address in base_addresses
+    )
+
+    build_file_owners: Dict[str, List[Address]] = defaultdict(list)
+    file_owners: Dict[str, List[Address]] = defaultdict(list)
+    unsplit_targets = []
+    for bfa, subtargets in zip(build_file_addresses, base_targets_subtargets):
+        if not subtargets.subtargets:
+            unsplit_targets.append(subtargets.base)
+            build_file_owners[bfa.rel_path].append(subtargets.base.address)
+            continue
+        for subtarget in subtargets.subtargets:
+            file_owners[subtarget.address.filename].append(subtarget.address)
+            build_file_owners[bfa.rel_path].append(subtarget.address)
+
+    return OwnersIndex(
+        build_file_owners=FrozenDict((k, tuple(v)) for k, v in build_file_owners.items()),
+        file_owners=FrozenDict((k, tuple(v)) for k, v in file_owners.items()),
+        unsplit_targets=tuple(unsplit_targets),
+        unexpanded_targets=tuple(unexpanded_targets),
+    )
+
+
+@rule
+async def find_owners(owners_request: OwnersRequest, address_mapper: AddressMapper) -> Owners:
     # Determine which of the sources are live and which are deleted.
     sources_set_snapshot = await Get(Snapshot, PathGlobs(owners_request.sources))
 
     live_files = FrozenOrderedSet(sources_set_snapshot.files)
     deleted_files = FrozenOrderedSet(s for s in owners_request.sources if s not in live_files)
-    live_dirs = FrozenOrderedSet(os.path.dirname(s) for s in live_files)
-    deleted_dirs = FrozenOrderedSet(os.path.dirname(s) for s in deleted_files)
+
+    # Find the directories above the sources that contain BUILD files, and load their indexes.
+    candidate_specs = AddressSpecs(
+        AscendantAddresses(directory=d)
+        for d in FrozenOrderedSet(os.path.dirname(s) for s in owners_request.sources)
+    )
+    build_files_snapshot = await Get(
+        Snapshot,
+        PathGlobs,
+        candidate_specs.to_path_globs(
+            build_patterns=address_mapper.build_patterns,
+            build_ignore_patterns=address_mapper.build_ignore_patterns,
+        ),
+    )
+    candidate_dirs = FrozenOrderedSet(os.path.dirname(f) for f in build_files_snapshot.files)
+    owners_indexes = await MultiGet(Get(OwnersIndex, Dir(d)) for d in candidate_dirs)
+    owners_index_by_dir = dict(zip(candidate_dirs, owners_indexes))
 
     matching_addresses: OrderedSet[Address] = OrderedSet()
     unmatched_sources = set(owners_request.sources)
     for live in (True, False):
-        # Walk up the buildroot looking for targets that would conceivably claim changed sources.
-        # For live files, we use expanded Targets, which have file level precision but which are
-        # only created for existing files. For deleted files we use UnexpandedTargets, which have
-        # the original declared glob.
-        candidate_targets: Iterable[Target]
-        if live:
-            if not live_dirs:
-                continue
-            sources_set = live_files
-            candidate_specs = tuple(AscendantAddresses(directory=d) for d in live_dirs)
-            candidate_targets = await Get(Targets, AddressSpecs(candidate_specs))
-        else:
-            if not deleted_dirs:
+        # Walk up the buildroot looking for targets that would conceivably claim the sources. For
+        # live files, the index uses expanded Targets, which have file level precision but which
+        # are only created for existing files. For deleted files it uses UnexpandedTargets, which
+        # have the original declared glob.
+        sources_by_dir: Dict[str, List[str]] = defaultdict(list)
+        for source in live_files if live else deleted_files:
+            for directory in recursive_dirname(os.path.dirname(source)):
+                if directory in owners_index_by_dir:
+                    sources_by_dir[directory].append(source)
+
+        for directory, owners_index in owners_index_by_dir.items():
+            if directory not in sources_by_dir:
                 continue
-            sources_set = deleted_files
-            candidate_specs = tuple(AscendantAddresses(directory=d) for d in deleted_dirs)
-            candidate_targets = await Get(UnexpandedTargets, AddressSpecs(candidate_specs))
-
-        build_file_addresses = await MultiGet(
-            Get(BuildFileAddress, Address, tgt.address) for tgt in candidate_targets
-        )
-
-        for candidate_tgt, bfa in zip(candidate_targets, build_file_addresses):
-            matching_files = set(
-                matches_filespec(candidate_tgt.get(Sources).filespec, paths=sources_set)
-            )
-            if not matching_files and bfa.rel_path not in sources_set:
-                continue
-
+            addresses, matching_files = owners_index.owners(sources_by_dir[directory], live=live)
             unmatched_sources -= matching_files
-            matching_addresses.add(candidate_tgt.address)
+            matching_addresses.update(addresses)
 
     if (
         unmatched_sources
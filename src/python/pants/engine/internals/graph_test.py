@@ -324,6 +324,26 @@ class TestOwners(TestBase):
             ]
         )
 
+    def test_owners_ancestor_directories(self) -> None:
+        """Targets in ancestor directories may own files, whether or not those files exist."""
+        self.create_files("demo/nested", ["f1.txt", "f2.txt"])
+        self.add_to_build_file("demo", "target(sources=['nested/*.txt'])")
+        self.add_to_build_file("demo/nested", "target(sources=['f1.txt'])")
+
+        result = self.request_single_product(
+            Owners, OwnersRequest(("demo/nested/f1.txt", "demo/nested/f2.txt", "demo/deleted.txt"))
+        )
+        assert result == Owners(
+            [
+                Address("demo", relative_file_path="nested/f1.txt"),
+                Address("demo", relative_file_path="nested/f2.txt"),
+                Address("demo/nested", relative_file_path="f1.txt"),
+            ]
+        )
+
+        result = self.request_single_product(Owners, OwnersRequest(("demo/nested/deleted.txt",)))
+        assert result == Owners([Address("demo")])
+
     def test_owners_build_file(self) -> None:
         """A BUILD file owns every target defined in it."""
         self.create_files("demo", ["f1.txt", "f2.txt"])
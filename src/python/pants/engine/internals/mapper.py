@@ -1,15 +1,21 @@
 # Copyright 2015 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import bisect
+import itertools
+import os
 import re
 from dataclasses import dataclass
 from typing import Callable, Dict, Iterable, Mapping, Optional, Pattern, Tuple
 
 from pants.base.exceptions import DuplicateNameError, MappingError
+from pants.base.parse_context import FileNotLoadedError
 from pants.build_graph.address import Address, BuildFileAddress
 from pants.engine.internals.parser import BuildFilePreludeSymbols, Parser
 from pants.engine.internals.target_adaptor import TargetAdaptor
+from pants.util.dirutil import recursive_dirname
 from pants.util.filtering import and_filters, create_filters
+from pants.util.frozendict import FrozenDict
 from pants.util.memo import memoized_property
 from pants.util.meta import frozen_after_init
 
@@ -28,14 +34,21 @@ class AddressMap:
         build_file_content: str,
         parser: Parser,
         extra_symbols: BuildFilePreludeSymbols,
+        file_contents: Optional[Mapping[str, bytes]] = None,
     ) -> "AddressMap":
         """Parses a source for targets.
 
         The target adaptors are all 'thin': any targets they point to in other namespaces or even in
         the same namespace but from a separate source are left as unresolved pointers.
+
+        :raises: FileNotLoadedError if the source read a file which is not in `file_contents`.
         """
         try:
-            target_adaptors = parser.parse(filepath, build_file_content, extra_symbols)
+            target_adaptors = parser.parse(
+                filepath, build_file_content, extra_symbols, file_contents
+            )
+        except FileNotLoadedError:
+            raise
         except Exception as e:
             raise MappingError(f"Failed to parse {filepath}:\n{e}")
         name_to_target_adaptors: Dict[str, TargetAdaptor] = {}
@@ -141,6 +154,62 @@ class AddressFamily:
         )
 
 
+@dataclass(frozen=True)
+class AddressFamilyIndex:
+    """The AddressFamilies of a set of BUILD files, indexed by directory.
+
+    Queries for the families in, below or above a directory take time proportional to the number
+    of matching families (plus a binary search), rather than to the total number of families.
+
+    To create an AddressFamilyIndex, use `create`.
+    """
+
+    address_family_by_directory: FrozenDict[str, AddressFamily]
+    # The namespaces of the families, sorted so that the namespaces below a directory are adjacent.
+    sorted_namespaces: Tuple[str, ...]
+
+    @classmethod
+    def create(cls, address_families: Iterable[AddressFamily]) -> "AddressFamilyIndex":
+        # NB: The families are sorted so that equal sets of families make equal indexes.
+        address_family_by_directory = {
+            af.namespace: af for af in sorted(address_families, key=lambda af: af.namespace)
+        }
+        return cls(
+            address_family_by_directory=FrozenDict(address_family_by_directory),
+            sorted_namespaces=tuple(address_family_by_directory),
+        )
+
+    def get(self, directory: str) -> Optional[AddressFamily]:
+        """The AddressFamily of the given directory, if it has one."""
+        return self.address_family_by_directory.get(directory)
+
+    def descendants(self, directory: str) -> Tuple[AddressFamily, ...]:
+        """The AddressFamilies of the given directory and all directories below it."""
+        if not directory:
+            namespaces: Iterable[str] = self.sorted_namespaces
+        else:
+            prefix = f"{directory}{os.sep}"
+            below = itertools.takewhile(
+                lambda ns: ns.startswith(prefix),
+                itertools.islice(
+                    self.sorted_namespaces, bisect.bisect_left(self.sorted_namespaces, prefix), None
+                ),
+            )
+            namespaces = itertools.chain([directory], below)
+        return self._families(namespaces)
+
+    def ascendants(self, directory: str) -> Tuple[AddressFamily, ...]:
+        """The AddressFamilies of the given directory and all directories above it."""
+        return self._families(reversed(tuple(dict.fromkeys(recursive_dirname(directory)))))
+
+    def _families(self, namespaces: Iterable[str]) -> Tuple[AddressFamily, ...]:
+        return tuple(
+            af
+            for af in (self.address_family_by_directory.get(ns) for ns in namespaces)
+            if af is not None
+        )
+
+
 @frozen_after_init
 @dataclass(unsafe_hash=True)
 class AddressMapper:
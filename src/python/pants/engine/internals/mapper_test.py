@@ -2,6 +2,7 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 from textwrap import dedent
+from typing import List
 
 import pytest
 
@@ -10,6 +11,7 @@ from pants.build_graph.address import Address
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.engine.internals.mapper import (
     AddressFamily,
+    AddressFamilyIndex,
     AddressMap,
     AddressMapper,
     DifferingFamiliesError,
@@ -123,6 +125,29 @@ def test_address_family_duplicate_names() -> None:
         )
 
 
+def test_address_family_index() -> None:
+    namespaces = ["", "a", "a/b", "a/b/c", "a/b-c", "a/bc", "d"]
+    index = AddressFamilyIndex.create(AddressFamily.create(ns, []) for ns in reversed(namespaces))
+
+    def descendants(directory: str) -> List[str]:
+        return [af.namespace for af in index.descendants(directory)]
+
+    def ascendants(directory: str) -> List[str]:
+        return [af.namespace for af in index.ascendants(directory)]
+
+    assert descendants("") == sorted(namespaces)
+    assert descendants("a/b") == ["a/b", "a/b/c"]
+    assert descendants("a/b/c/d") == []
+    assert descendants("e") == []
+
+    assert ascendants("a/b/c/d") == ["", "a", "a/b", "a/b/c"]
+    assert ascendants("a/bc") == ["", "a", "a/bc"]
+    assert ascendants("") == [""]
+
+    assert index.get("a/b-c") == AddressFamily.create("a/b-c", [])
+    assert index.get("e") is None
+
+
 def test_match_filter_options() -> None:
     def make_target(target_name: str, **kwargs) -> TargetAdaptor:
         parsed_address = Address("", target_name=target_name)
@@ -3,7 +3,7 @@
 
 import logging
 import os
-from typing import Dict, Iterable, List, Tuple, Union, cast
+from typing import Dict, Iterable, List, Sequence, Tuple, Union, cast
 
 from typing_extensions import Protocol
 
@@ -18,6 +18,7 @@ from pants.engine.internals.native_engine import (
     PyGeneratorResponseGet,
     PyGeneratorResponseGetMulti,
     PyNailgunServer,
+    PyPathGlobsMatcher,
     PyRemotingOptions,
     PyScheduler,
     PySession,
@@ -169,6 +170,25 @@ class Native(metaclass=SingletonMetaclass):
         """Return all paths that match the PathGlobs."""
         return tuple(self.lib.match_path_globs(path_globs, tuple(paths)))
 
+    def new_path_globs_matcher(self, path_globs: PathGlobs) -> PyPathGlobsMatcher:
+        """Compile the PathGlobs into a matcher which may be applied to many batches of paths."""
+        return PyPathGlobsMatcher(path_globs)
+
+    def match_compiled_path_globs(
+        self, matcher: PyPathGlobsMatcher, paths: Iterable[str]
+    ) -> Tuple[str, ...]:
+        """Return all paths that match the compiled PathGlobs."""
+        return tuple(matcher.matches(tuple(paths)))
+
+    def match_compiled_path_globs_batch(
+        self, matchers: Sequence[PyPathGlobsMatcher], paths: Iterable[str]
+    ) -> Tuple[Tuple[str, ...], ...]:
+        """Return the paths that match each of the compiled PathGlobs, in a single native call."""
+        return tuple(
+            tuple(matches)
+            for matches in self.lib.match_path_globs_batch(tuple(matchers), tuple(paths))
+        )
+
     def nailgun_server_await_shutdown(self, nailgun_server) -> None:
         """Blocks until the server has shut down.
 
@@ -190,9 +210,16 @@ class Native(metaclass=SingletonMetaclass):
         return PyExecutionRequest()
 
     def new_session(
-        self, scheduler, dynamic_ui: bool, build_id, should_report_workunits: bool,
+        self,
+        scheduler,
+        dynamic_ui: bool,
+        build_id,
+        should_report_workunits: bool,
+        should_record_node_metrics: bool = False,
     ) -> PySession:
-        return PySession(scheduler, dynamic_ui, build_id, should_report_workunits,)
+        return PySession(
+            scheduler, dynamic_ui, build_id, should_report_workunits, should_record_node_metrics
+        )
 
     def new_scheduler(
         self,
@@ -1,18 +1,28 @@
 # Copyright 2015 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import ast
+import hashlib
+import logging
+import marshal
 import os.path
+import sys
+import threading
 import tokenize
 from dataclasses import dataclass
 from io import StringIO
-from typing import Any, Dict, Iterable, List, Tuple, cast
+from types import CodeType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union, cast
 
 from pants.base.exceptions import UnaddressableObjectError
 from pants.base.parse_context import ParseContext
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.engine.internals.target_adaptor import TargetAdaptor
+from pants.util.dirutil import maybe_read_file, safe_concurrent_creation
 from pants.util.frozendict import FrozenDict
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class BuildFilePreludeSymbols:
@@ -24,17 +34,49 @@ class ParseError(Exception):
 
 
 class Parser:
+    # The maximum number of BUILD file keys to remember as not being statically parseable.
+    _MAX_DYNAMIC_BUILD_FILES = 10000
+    # The maximum number of BUILD file keys for which to remember the files that they read.
+    _MAX_FILE_DEPENDENCIES = 10000
+
     def __init__(
-        self, *, target_type_aliases: Iterable[str], object_aliases: BuildFileAliases
+        self,
+        *,
+        target_type_aliases: Iterable[str],
+        object_aliases: BuildFileAliases,
+        bytecode_cache_dir: Optional[str] = None,
     ) -> None:
-        self._symbols, self._parse_context = self._generate_symbols(
-            target_type_aliases, object_aliases
+        """
+        :param bytecode_cache_dir: A directory in which to persist compiled BUILD files across runs.
+            At most one compiled BUILD file is retained per BUILD file path.
+        """
+        (
+            self._symbols,
+            self._parse_context,
+            self._static_target_type_aliases,
+        ) = self._generate_symbols(target_type_aliases, object_aliases)
+        self._bytecode_cache_dir = (
+            os.path.join(bytecode_cache_dir, sys.implementation.cache_tag)
+            if bytecode_cache_dir and sys.implementation.cache_tag
+            else None
         )
+        # NB: BUILD files are parsed concurrently by the engine, so the shared ParseContext is
+        # guarded by `_exec_lock`, and the state below is guarded by `_lock`.
+        self._exec_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # The keys of BUILD files which are known not to be statically parseable, oldest first. A
+        # key may include a fingerprint of the prelude symbols, if the outcome depended upon them.
+        self._dynamic_build_files: Dict[str, None] = {}
+        # The files read (via `ParseContext.read_file`) by the last parse of each BUILD file key,
+        # oldest first.
+        self._file_dependencies: Dict[str, Tuple[str, ...]] = {}
+        self._static_parse_count = 0
+        self._exec_parse_count = 0
 
     @staticmethod
     def _generate_symbols(
         target_type_aliases: Iterable[str], object_aliases: BuildFileAliases,
-    ) -> Tuple[Dict[str, Any], ParseContext]:
+    ) -> Tuple[Dict[str, Any], ParseContext, FrozenSet[str]]:
         symbols: Dict[str, Any] = {}
 
         # Compute "per path" symbols.  For performance, we use the same ParseContext, which we
@@ -50,32 +92,222 @@ class Parser:
                 self._type_alias = type_alias
 
             def __call__(self, *args, **kwargs):
-                # Target names default to the name of the directory their BUILD file is in
-                # (as long as it's not the root directory).
-                if "name" not in kwargs:
-                    dirname = os.path.basename(self._parse_context.rel_path)
-                    if not dirname:
-                        raise UnaddressableObjectError(
-                            "Targets in root-level BUILD files must be named explicitly."
-                        )
-                    kwargs["name"] = dirname
-                kwargs.setdefault("type_alias", self._type_alias)
-                target_adaptor = TargetAdaptor(**kwargs)
+                target_adaptor = _create_target_adaptor(
+                    self._parse_context.rel_path, self._type_alias, kwargs
+                )
                 self._parse_context._storage.add(target_adaptor)
                 return target_adaptor
 
-        symbols.update({alias: Registrar(parse_context, alias) for alias in target_type_aliases})
+        registrars = {alias: Registrar(parse_context, alias) for alias in target_type_aliases}
+        symbols.update(registrars)
         symbols.update(object_aliases.objects)
         for alias, object_factory in object_aliases.context_aware_object_factories.items():
             symbols[alias] = object_factory(parse_context)
 
-        return symbols, parse_context
+        # Target types which have not been shadowed by objects may be parsed statically.
+        static_target_type_aliases = frozenset(
+            alias for alias, registrar in registrars.items() if symbols[alias] is registrar
+        )
+        return symbols, parse_context, static_target_type_aliases
+
+    def _compile(self, filepath: str, build_file_content: str, key: str) -> CodeType:
+        """Compile the BUILD file, consulting and populating the on-disk bytecode cache.
+
+        The cache holds a single entry per BUILD file path, which is replaced when the content of
+        the BUILD file changes, so it is bounded by the number of BUILD files in the repo. Only
+        BUILD files which passed `error_on_imports` are cached, so a cache hit need not be
+        re-scanned.
+        """
+        cache_path = None
+        if self._bytecode_cache_dir:
+            path_digest = hashlib.sha1(filepath.encode()).hexdigest()
+            cache_path = os.path.join(self._bytecode_cache_dir, path_digest[:2], path_digest)
+            cached = maybe_read_file(cache_path, binary_mode=True)
+            if cached is not None and cached[: len(key)] == key.encode():
+                try:
+                    return cast(CodeType, marshal.loads(cached[len(key) :]))
+                except (EOFError, ValueError, TypeError) as e:
+                    logger.debug(f"Ignoring corrupt cached bytecode for {filepath}: {e!r}")
+
+        code = compile(build_file_content, filepath, "exec")
+        error_on_imports(build_file_content, filepath)
+
+        if cache_path:
+            try:
+                with safe_concurrent_creation(cache_path) as tmp_path:
+                    with open(tmp_path, "wb") as fp:
+                        fp.write(key.encode())
+                        fp.write(marshal.dumps(code))
+            except OSError as e:
+                logger.debug(f"Failed to cache bytecode for {filepath}: {e!r}")
+        return code
 
     def parse(
-        self, filepath: str, build_file_content: str, extra_symbols: BuildFilePreludeSymbols
+        self,
+        filepath: str,
+        build_file_content: str,
+        extra_symbols: BuildFilePreludeSymbols,
+        file_contents: Optional[Mapping[str, bytes]] = None,
+    ) -> List[TargetAdaptor]:
+        """Parse the BUILD file.
+
+        :param file_contents: The contents of files that have been loaded for the BUILD file to
+            read via `ParseContext.read_file`, by path. If it reads any other file, the parse
+            fails with `FileNotLoadedError`, and should be retried once that file has been loaded.
+        """
+        key = _build_file_key(filepath, build_file_content)
+        target_adaptors, parsed_statically = self._parse(
+            filepath, build_file_content, extra_symbols, key, file_contents
+        )
+        self._count_parse(parsed_statically)
+        return target_adaptors
+
+    def file_dependencies(self, filepath: str, build_file_content: str) -> Tuple[str, ...]:
+        """The files that the BUILD file read the last time that it was parsed, if any.
+
+        Loading these before parsing the BUILD file will usually avoid re-parsing it due to a
+        `FileNotLoadedError`.
+        """
+        with self._lock:
+            return self._file_dependencies.get(_build_file_key(filepath, build_file_content), ())
+
+    def _count_parse(self, parsed_statically: bool) -> None:
+        with self._lock:
+            if parsed_statically:
+                self._static_parse_count += 1
+            else:
+                self._exec_parse_count += 1
+
+    def parse_counts(self) -> Tuple[int, int]:
+        """Returns the counts of the BUILD files parsed statically and by `exec` by this Parser."""
+        with self._lock:
+            return self._static_parse_count, self._exec_parse_count
+
+    def metrics(self, since: Tuple[int, int] = (0, 0)) -> Dict[str, Union[int, float]]:
+        """Returns counts of the BUILD files parsed statically and by `exec` by this Parser.
+
+        :param since: The `parse_counts` at the start of the period to report on, such as a run.
+            A Parser lives as long as pantsd, so reporting on its whole lifetime is rarely useful.
+        """
+        static_parse_count, exec_parse_count = (
+            count - start for count, start in zip(self.parse_counts(), since)
+        )
+        total = static_parse_count + exec_parse_count
+        return {
+            "build_files_parsed_statically": static_parse_count,
+            "build_files_parsed_with_exec": exec_parse_count,
+            "build_files_parsed_statically_fraction": (
+                static_parse_count / total if total else 0.0
+            ),
+        }
+
+    def _parse(
+        self,
+        filepath: str,
+        build_file_content: str,
+        extra_symbols: BuildFilePreludeSymbols,
+        key: str,
+        file_contents: Optional[Mapping[str, bytes]] = None,
+    ) -> Tuple[List[TargetAdaptor], bool]:
+        """Parse the BUILD file, statically if possible, and otherwise by executing it.
+
+        :returns: The TargetAdaptors, and whether they were parsed statically.
+        """
+        prelude_key = _prelude_dependent_key(key, extra_symbols)
+        with self._lock:
+            is_dynamic = (
+                key in self._dynamic_build_files or prelude_key in self._dynamic_build_files
+            )
+        if not is_dynamic:
+            target_adaptors = self._parse_statically(
+                filepath, build_file_content, extra_symbols, key, prelude_key
+            )
+            if target_adaptors is not None:
+                return target_adaptors, True
+        return self._exec(filepath, build_file_content, extra_symbols, key, file_contents), False
+
+    def _parse_statically(
+        self,
+        filepath: str,
+        build_file_content: str,
+        extra_symbols: BuildFilePreludeSymbols,
+        key: str,
+        prelude_key: str,
+    ) -> Optional[List[TargetAdaptor]]:
+        """Parse a BUILD file which consists only of calls to target types with literal keyword
+        arguments, without executing it.
+
+        Returns None if the BUILD file contains anything else, in which case it must be executed.
+        The outcome is recorded so that the BUILD file is not parsed again before being executed:
+        under `key` if it depends only upon the BUILD file, and otherwise under `prelude_key`.
+        """
+        try:
+            module = ast.parse(build_file_content, filepath)
+        except SyntaxError:
+            self._mark_dynamic(key)
+            return None
+
+        calls: List[Tuple[str, Dict[str, Any]]] = []
+        for statement in module.body:
+            call = statement.value if isinstance(statement, ast.Expr) else None
+            if (
+                not isinstance(call, ast.Call)
+                or not isinstance(call.func, ast.Name)
+                or call.args
+                or any(keyword.arg is None for keyword in call.keywords)
+            ):
+                self._mark_dynamic(key)
+                return None
+            try:
+                kwargs = {
+                    cast(str, keyword.arg): ast.literal_eval(keyword.value)
+                    for keyword in call.keywords
+                }
+            except ValueError:
+                self._mark_dynamic(key)
+                return None
+            calls.append((call.func.id, kwargs))
+
+        # Calls to objects (such as `python_requirements()`) must be executed.
+        if any(alias not in self._static_target_type_aliases for alias, _ in calls):
+            self._mark_dynamic(key)
+            return None
+        # As must calls to target types which are shadowed by the prelude symbols.
+        if any(alias in extra_symbols.symbols for alias, _ in calls):
+            self._mark_dynamic(prelude_key)
+            return None
+
+        rel_path = os.path.dirname(filepath)
+        return [_create_target_adaptor(rel_path, alias, kwargs) for alias, kwargs in calls]
+
+    def _mark_dynamic(self, key: str) -> None:
+        with self._lock:
+            _bounded_set_item(
+                self._dynamic_build_files, key, None, max_size=self._MAX_DYNAMIC_BUILD_FILES
+            )
+
+    def _exec(
+        self,
+        filepath: str,
+        build_file_content: str,
+        extra_symbols: BuildFilePreludeSymbols,
+        key: str,
+        file_contents: Optional[Mapping[str, bytes]] = None,
+    ) -> List[TargetAdaptor]:
+        code = self._compile(filepath, build_file_content, key)
+        with self._exec_lock:
+            return self._exec_with_parse_context(code, filepath, extra_symbols, key, file_contents)
+
+    def _exec_with_parse_context(
+        self,
+        code: CodeType,
+        filepath: str,
+        extra_symbols: BuildFilePreludeSymbols,
+        key: str,
+        file_contents: Optional[Mapping[str, bytes]],
     ) -> List[TargetAdaptor]:
-        # Mutate the parse context with the new path.
-        self._parse_context._storage.clear(os.path.dirname(filepath))
+        # Mutate the parse context with the new path, and the files loaded for it.
+        self._parse_context._storage.clear(os.path.dirname(filepath), file_contents)
 
         # We update the known symbols with Build File Preludes. This is subtle code; functions have
         # their own globals set on __globals__ which they derive from the environment where they
@@ -91,17 +323,63 @@ class Parser:
             global_symbols[k] = v
 
         try:
-            exec(build_file_content, global_symbols)
+            exec(code, global_symbols)
         except NameError as e:
             valid_symbols = sorted(s for s in global_symbols.keys() if s != "__builtins__")
             original = e.args[0].capitalize()
             raise ParseError(f"{original}.\n\nAll registered symbols: {valid_symbols}")
-
-        error_on_imports(build_file_content, filepath)
+        finally:
+            files_read = self._parse_context._storage.files_read
+            with self._lock:
+                if files_read:
+                    _bounded_set_item(
+                        self._file_dependencies,
+                        key,
+                        tuple(dict.fromkeys(files_read)),
+                        max_size=self._MAX_FILE_DEPENDENCIES,
+                    )
+                else:
+                    self._file_dependencies.pop(key, None)
 
         return cast(List[TargetAdaptor], list(self._parse_context._storage.objects))
 
 
+def _create_target_adaptor(rel_path: str, type_alias: str, kwargs: Dict[str, Any]) -> TargetAdaptor:
+    # Target names default to the name of the directory their BUILD file is in (as long as it's not
+    # the root directory).
+    if "name" not in kwargs:
+        dirname = os.path.basename(rel_path)
+        if not dirname:
+            raise UnaddressableObjectError(
+                "Targets in root-level BUILD files must be named explicitly."
+            )
+        kwargs["name"] = dirname
+    kwargs.setdefault("type_alias", type_alias)
+    return TargetAdaptor(**kwargs)
+
+
+def _bounded_set_item(d: Dict[str, Any], key: str, value: Any, *, max_size: int) -> None:
+    """Sets the key in the insertion-ordered dict, evicting the oldest keys beyond `max_size`."""
+    d.pop(key, None)
+    d[key] = value
+    while len(d) > max_size:
+        del d[next(iter(d))]
+
+
+def _prelude_dependent_key(key: str, extra_symbols: BuildFilePreludeSymbols) -> str:
+    # NB: The hash of a FrozenDict is computed eagerly, so this is cheap. A collision would only
+    # cause a BUILD file to be executed rather than parsed statically.
+    return f"{key}:{hash(extra_symbols.symbols):x}"
+
+
+def _build_file_key(filepath: str, build_file_content: str) -> str:
+    hasher = hashlib.sha1()
+    hasher.update(filepath.encode())
+    hasher.update(b"\0")
+    hasher.update(build_file_content.encode())
+    return hasher.hexdigest()
+
+
 def error_on_imports(build_file_content: str, filepath: str) -> None:
     # This is poor sandboxing; there are many ways to get around this. But it's sufficient to tell
     # users who aren't malicious that they're doing something wrong, and it has a low performance
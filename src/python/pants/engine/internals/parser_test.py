@@ -1,10 +1,22 @@
 # Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import os
+from typing import List
+
 import pytest
 
+from pants.base.exceptions import UnaddressableObjectError
+from pants.base.parse_context import FileNotLoadedError
 from pants.build_graph.build_file_aliases import BuildFileAliases
-from pants.engine.internals.parser import BuildFilePreludeSymbols, ParseError, Parser
+from pants.engine.internals.parser import (
+    BuildFilePreludeSymbols,
+    ParseError,
+    Parser,
+    _build_file_key,
+)
+from pants.engine.internals.target_adaptor import TargetAdaptor
+from pants.util.contextutil import temporary_dir
 from pants.util.frozendict import FrozenDict
 
 
@@ -32,3 +44,149 @@ def test_unrecognized_symbol() -> None:
         str(exc.value)
         == "Name 'fake' is not defined.\n\nAll registered symbols: ['caof', 'obj', 'prelude', 'tgt']"
     )
+
+
+def test_bytecode_cache() -> None:
+    prelude_symbols = BuildFilePreludeSymbols(FrozenDict())
+    with temporary_dir() as cache_dir:
+
+        def parse(content: str) -> List[TargetAdaptor]:
+            parser = Parser(
+                target_type_aliases=["tgt"],
+                object_aliases=BuildFileAliases(),
+                bytecode_cache_dir=cache_dir,
+            )
+            return parser.parse("dir/BUILD", content, prelude_symbols)
+
+        def cached_files() -> List[str]:
+            return [os.path.join(root, f) for root, _, files in os.walk(cache_dir) for f in files]
+
+        # NB: A non-literal argument prevents the BUILD file from being parsed statically.
+        expected = [TargetAdaptor(type_alias="tgt", name="t", sources=["*.py"])]
+        assert parse("tgt(name='t', sources=['*' + '.py'])") == expected
+        assert len(cached_files()) == 1
+        assert parse("tgt(name='t', sources=['*' + '.py'])") == expected
+        assert len(cached_files()) == 1
+
+        # A changed BUILD file replaces the cached bytecode for its path.
+        assert parse("tgt(name='t' + '2')") == [TargetAdaptor(type_alias="tgt", name="t2")]
+        assert len(cached_files()) == 1
+
+        # BUILD files which fail the import check are not cached.
+        with pytest.raises(ParseError):
+            parse("import os")
+        assert len(cached_files()) == 1
+
+
+def test_static_parsing() -> None:
+    parser = Parser(
+        target_type_aliases=["tgt", "shadowed"],
+        object_aliases=BuildFileAliases(objects={"shadowed": lambda **kwargs: None}),
+    )
+    no_prelude = BuildFilePreludeSymbols(FrozenDict())
+
+    def assert_parsed(content: str, *, statically: bool) -> None:
+        before = parser.metrics()["build_files_parsed_statically"]
+        assert parser.parse("dir/BUILD", content, no_prelude) == [
+            TargetAdaptor(type_alias="tgt", name="dir", sources=["a.py"], tags={"b"})
+        ]
+        assert parser.metrics()["build_files_parsed_statically"] == before + int(statically)
+
+    assert_parsed("tgt(sources=['a.py'], tags={'b'})", statically=True)
+    assert_parsed("# A comment.\ntgt(\n  sources=['a.py'],\n  tags={'b'},\n)\n", statically=True)
+
+    # Non-literal arguments, other statements, and shadowed target types require execution.
+    assert_parsed("tgt(sources=['a' + '.py'], tags={'b'})", statically=False)
+    assert_parsed("x = ['a.py']\ntgt(sources=x, tags={'b'})", statically=False)
+    assert_parsed("tgt(sources=['a.py'], tags={'b'})\nshadowed()", statically=False)
+    prelude = BuildFilePreludeSymbols(FrozenDict({"tgt": lambda **kwargs: None}))
+    assert parser.parse("dir/BUILD", "tgt(sources=['a.py'])", prelude) == []
+
+    with pytest.raises(UnaddressableObjectError):
+        parser.parse("BUILD", "tgt()", no_prelude)
+
+    assert parser.metrics() == {
+        "build_files_parsed_statically": 2,
+        "build_files_parsed_with_exec": 4,
+        "build_files_parsed_statically_fraction": 2 / 6,
+    }
+
+    # Metrics may be reported for a period, such as a single run.
+    counts = parser.parse_counts()
+    assert_parsed("tgt(sources=['a.py'], tags={'b'})", statically=True)
+    assert parser.metrics(since=counts) == {
+        "build_files_parsed_statically": 1,
+        "build_files_parsed_with_exec": 0,
+        "build_files_parsed_statically_fraction": 1.0,
+    }
+
+
+def test_static_parsing_outcome_recorded() -> None:
+    parser = Parser(
+        target_type_aliases=["tgt"],
+        object_aliases=BuildFileAliases(objects={"obj": lambda **kwargs: None}),
+    )
+    no_prelude = BuildFilePreludeSymbols(FrozenDict())
+    prelude = BuildFilePreludeSymbols(FrozenDict({"tgt": lambda **kwargs: None}))
+
+    # A call to an object must always be executed.
+    parser.parse("dir/BUILD", "obj()", no_prelude)
+    assert list(parser._dynamic_build_files) == [_build_file_key("dir/BUILD", "obj()")]
+
+    # A call to a target type which is shadowed by the prelude must be executed, but only while
+    # it is shadowed.
+    parser.parse("dir/BUILD", "tgt()", prelude)
+    parser.parse("dir/BUILD", "tgt()", prelude)
+    assert len(parser._dynamic_build_files) == 2
+    assert parser.parse("dir/BUILD", "tgt()", no_prelude) == [
+        TargetAdaptor(type_alias="tgt", name="dir")
+    ]
+    assert parser.parse_counts() == (1, 3)
+
+
+def test_dynamic_build_files_bounded() -> None:
+    parser = Parser(target_type_aliases=["tgt"], object_aliases=BuildFileAliases())
+    parser._MAX_DYNAMIC_BUILD_FILES = 2
+    no_prelude = BuildFilePreludeSymbols(FrozenDict())
+    for i in range(3):
+        parser.parse("dir/BUILD", f"tgt(name='t' + '{i}')", no_prelude)
+    assert list(parser._dynamic_build_files) == [
+        _build_file_key("dir/BUILD", f"tgt(name='t' + '{i}')") for i in (1, 2)
+    ]
+
+
+def test_read_file() -> None:
+    def reads_file(parse_context):
+        def read(relpath: str) -> None:
+            name = parse_context.read_file(relpath).decode()
+            parse_context.create_object("tgt", name=name)
+
+        return read
+
+    parser = Parser(
+        target_type_aliases=["tgt"],
+        object_aliases=BuildFileAliases(context_aware_object_factories={"read": reads_file}),
+    )
+    prelude_symbols = BuildFilePreludeSymbols(FrozenDict())
+    build_file = ("dir/BUILD", "read('../other/name.txt')")
+    assert parser.file_dependencies(*build_file) == ()
+
+    # Reading a file which has not been loaded fails, but is recorded for the next parse.
+    with pytest.raises(FileNotLoadedError) as exc:
+        parser.parse(*build_file, prelude_symbols)
+    assert exc.value.path == "other/name.txt"
+    assert parser.file_dependencies(*build_file) == ("other/name.txt",)
+
+    assert parser.parse(*build_file, prelude_symbols, {"other/name.txt": b"t"}) == [
+        TargetAdaptor(type_alias="tgt", name="t")
+    ]
+    assert parser.file_dependencies(*build_file) == ("other/name.txt",)
+
+    # The file dependencies of the least recently parsed BUILD files are forgotten.
+    parser._MAX_FILE_DEPENDENCIES = 1
+    other_build_file = ("other/BUILD", "read('name.txt')")
+    assert parser.parse(*other_build_file, prelude_symbols, {"other/name.txt": b"t"}) == [
+        TargetAdaptor(type_alias="tgt", name="t")
+    ]
+    assert parser.file_dependencies(*other_build_file) == ("other/name.txt",)
+    assert parser.file_dependencies(*build_file) == ()
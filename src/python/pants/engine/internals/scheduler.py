@@ -309,6 +309,9 @@ class Scheduler:
     def _metrics(self, session):
         return self._native.lib.scheduler_metrics(self._scheduler, session)
 
+    def _node_metrics(self, session):
+        return self._native.lib.scheduler_node_metrics(self._scheduler, session)
+
     def poll_workunits(self, session, max_log_verbosity: LogLevel) -> PolledWorkunits:
         result: Tuple[Tuple[Workunit], Tuple[Workunit]] = self._native.lib.poll_session_workunits(
             self._scheduler, session, max_log_verbosity.level
@@ -341,13 +344,21 @@ class Scheduler:
         self._native.lib.garbage_collect_store(self._scheduler)
 
     def new_session(
-        self, build_id, dynamic_ui: bool = False, should_report_workunits: bool = False,
+        self,
+        build_id,
+        dynamic_ui: bool = False,
+        should_report_workunits: bool = False,
+        should_record_node_metrics: bool = False,
     ) -> "SchedulerSession":
         """Creates a new SchedulerSession for this Scheduler."""
         return SchedulerSession(
             self,
             self._native.new_session(
-                self._scheduler, dynamic_ui, build_id, should_report_workunits,
+                self._scheduler,
+                dynamic_ui,
+                build_id,
+                should_report_workunits,
+                should_record_node_metrics,
             ),
         )
 
@@ -462,6 +473,15 @@ class SchedulerSession:
         """Returns metrics for this SchedulerSession as a dict of metric name to metric value."""
         return self._scheduler._metrics(self._session)
 
+    def node_metrics(self):
+        """Returns per-rule and per-process counters for this SchedulerSession.
+
+        Only populated if the session was created with `should_record_node_metrics`: see
+        `scheduler_node_metrics` in the engine for the format. The process counters are only
+        returned by the first call.
+        """
+        return self._scheduler._node_metrics(self._session)
+
     def _maybe_visualize(self):
         if self._scheduler.visualize_to_dir is not None:
             name = f"graph.{self._run_count:03d}.dot"
@@ -4,6 +4,7 @@
 import dataclasses
 import itertools
 import logging
+import os
 from dataclasses import dataclass
 from textwrap import dedent
 from typing import TYPE_CHECKING, Dict, Iterable, Mapping, Optional, Tuple, Union
@@ -12,7 +13,8 @@ from pants.base.exception_sink import ExceptionSink
 from pants.engine.engine_aware import EngineAware
 from pants.engine.fs import EMPTY_DIGEST, CreateDigest, Digest, FileContent
 from pants.engine.platform import Platform, PlatformConstraint
-from pants.engine.rules import Get, RootRule, collect_rules, rule, side_effecting
+from pants.engine.rules import Get, RootRule, _uncacheable_rule, collect_rules, rule, side_effecting
+from pants.option.global_options import GlobalOptions
 from pants.util.logging import LogLevel
 from pants.util.meta import frozen_after_init
 from pants.util.ordered_set import OrderedSet
@@ -334,8 +336,32 @@ class BinaryPaths(EngineAware):
         return next(iter(self.paths), None)
 
 
-@rule(desc="Find binary path")
-async def find_binary(request: BinaryPathRequest) -> BinaryPaths:
+def search_path_for_binary(request: BinaryPathRequest) -> Tuple[str, ...]:
+    """Returns the paths of the executables with the requested name on the search path, in order,
+    as `which -a` would.
+
+    NB: Relative search path entries are ignored: they would be relative to the working directory.
+    """
+    return tuple(
+        path
+        for path in (
+            os.path.join(directory, request.binary_name)
+            for directory in request.search_path
+            if os.path.isabs(directory)
+        )
+        if os.path.isfile(path) and os.access(path, os.X_OK)
+    )
+
+
+# NB: This rule is uncacheable so that it re-runs in each session, but that is cheap: it only stats
+# one candidate per searched directory.
+@_uncacheable_rule(desc="Find binary path")
+async def find_binary(request: BinaryPathRequest, global_options: GlobalOptions) -> BinaryPaths:
+    if not global_options.options.remote_execution:
+        return BinaryPaths(binary_name=request.binary_name, paths=search_path_for_binary(request))
+
+    # With remote execution, processes may not run on this machine, so we search for the binary
+    # with a process, which runs wherever other processes do.
     # TODO(John Sirois): Replace this script with a statically linked native binary so we don't
     #  depend on either /bin/bash being available on the Process host.
     # TODO(#10507): Running the script directly from a shebang sometimes results in a "Text file
@@ -10,15 +10,18 @@ import pytest
 from pants.engine.fs import CreateDigest, Digest, DigestContents, FileContent, PathGlobs, Snapshot
 from pants.engine.internals.scheduler import ExecutionError
 from pants.engine.process import (
+    BinaryPathRequest,
     FallibleProcessResult,
     InteractiveProcess,
     Process,
     ProcessExecutionFailure,
     ProcessResult,
+    search_path_for_binary,
 )
 from pants.engine.rules import Get, RootRule, rule
 from pants.testutil.test_base import TestBase
 from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import chmod_plus_x, safe_file_dump
 
 
 @dataclass(frozen=True)
@@ -411,3 +414,29 @@ def test_running_interactive_process_in_workspace_cannot_have_input_files() -> N
     mock_digest = Digest("fake", 1)
     with pytest.raises(ValueError):
         InteractiveProcess(argv=["/bin/echo"], input_digest=mock_digest, run_in_workspace=True)
+
+
+def test_search_path_for_binary() -> None:
+    with temporary_dir() as tmpdir:
+        bin1, bin2, bin3 = (os.path.join(tmpdir, d) for d in ("bin1", "bin2", "bin3"))
+        for directory in (bin1, bin2):
+            safe_file_dump(os.path.join(directory, "tool"), "")
+            chmod_plus_x(os.path.join(directory, "tool"))
+        # Files which are not executable are not binaries.
+        safe_file_dump(os.path.join(bin3, "tool"), "")
+
+        request = BinaryPathRequest(
+            search_path=[bin1, "relative", bin3, bin2, "/does/not/exist"], binary_name="tool"
+        )
+        assert search_path_for_binary(request) == (
+            os.path.join(bin1, "tool"),
+            os.path.join(bin2, "tool"),
+        )
+
+        # The search path is searched again on each call.
+        chmod_plus_x(os.path.join(bin3, "tool"))
+        os.unlink(os.path.join(bin1, "tool"))
+        assert search_path_for_binary(request) == (
+            os.path.join(bin3, "tool"),
+            os.path.join(bin2, "tool"),
+        )
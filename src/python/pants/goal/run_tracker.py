@@ -4,6 +4,7 @@
 import ast
 import copy
 import json
+import logging
 import multiprocessing
 import os
 import sys
@@ -12,9 +13,7 @@ import time
 import uuid
 from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Any, Dict, Optional, Tuple
-
-import requests
+from typing import Any, Dict, List, Mapping, Optional, Tuple, cast
 
 from pants.auth.basic_auth import BasicAuth
 from pants.base.exiter import PANTS_FAILED_EXIT_CODE, PANTS_SUCCEEDED_EXIT_CODE, ExitCode
@@ -23,13 +22,28 @@ from pants.base.worker_pool import SubprocPool
 from pants.base.workunit import WorkUnit, WorkUnitLabel
 from pants.goal.aggregated_timings import AggregatedTimings
 from pants.goal.pantsd_stats import PantsDaemonStats
+from pants.goal.stats_spool import (
+    SpoolEntry,
+    StatsSpool,
+    ensure_sender,
+    post_stats_payload,
+    stats_spool_dir,
+    stats_upload_headers,
+)
 from pants.option.config import Config
 from pants.option.options_fingerprinter import CoercingOptionEncoder
 from pants.option.subsystem import Subsystem
 from pants.reporting.json_reporter import JsonReporter
 from pants.reporting.report import Report
+from pants.reporting.workunit_profile import (
+    CriticalPathEntry,
+    WorkunitProfile,
+    engine_detail,
+    format_engine_detail,
+)
 from pants.util.dirutil import relative_symlink, safe_file_dump
-from pants.version import VERSION
+
+logger = logging.getLogger(__name__)
 
 
 class RunTrackerOptionEncoder(CoercingOptionEncoder):
@@ -98,6 +112,32 @@ class RunTracker(Subsystem):
             default=2,
             help="Wait at most this many seconds for the stats upload to complete.",
         )
+        register(
+            "--stats-upload-async",
+            advanced=True,
+            type=bool,
+            default=False,
+            help="Rather than uploading stats before the run exits, write them to a spool under "
+            "the workdir, to be uploaded in the background (by pantsd if it is running, and "
+            "otherwise by a detached process). Background uploads are batched, and retried with "
+            "backoff.",
+        )
+        register(
+            "--stats-upload-spool-max-bytes",
+            advanced=True,
+            type=int,
+            default=32 * 1024 * 1024,
+            help="The maximum size of the spool of stats awaiting upload. When the spool is full, "
+            "the oldest stats are dropped.",
+        )
+        register(
+            "--stats-upload-max-attempts",
+            advanced=True,
+            type=int,
+            default=5,
+            help="The number of times to attempt a background upload of stats before dropping "
+            "them.",
+        )
         register(
             "--stats-version",
             advanced=True,
@@ -136,6 +176,33 @@ class RunTracker(Subsystem):
             "i.e. to get option `pantsd` in the GLOBAL scope, you'd pass "
             "`GLOBAL^pantsd`",
         )
+        register(
+            "--critical-path",
+            advanced=True,
+            type=bool,
+            default=False,
+            help="Compute the critical path through the engine's workunits for each run: the "
+            "chain of rules and processes which bounded the run's wall time. The path is logged "
+            "at the end of the run, and recorded in stats as `critical_path`.",
+        )
+        register(
+            "--stats-engine-detail",
+            advanced=True,
+            type=bool,
+            default=False,
+            help="Record per-rule engine counters in stats as `engine_detail`: invocations, memo "
+            "hits, nodes cleaned without re-running, runs and re-runs due to invalidation, and "
+            "total and self time. Also records local process cache hits and misses per process "
+            "description.",
+        )
+        register(
+            "--stats-engine-detail-summary-limit",
+            advanced=True,
+            type=int,
+            default=0,
+            help="If `--stats-engine-detail` is enabled, log a summary of up to this many of the "
+            "most expensive rules and processes at the end of the run.",
+        )
 
     def __init__(self, *args, **kwargs):
         """
@@ -145,6 +212,7 @@ class RunTracker(Subsystem):
         self._run_timestamp = time.time()
         self._cmd_line = " ".join(["pants"] + sys.argv[1:])
         self._v2_goal_rule_names: Tuple[str, ...] = tuple()
+        self._backend_load_timings: Dict[str, float] = {}
 
         self.run_uuid = uuid.uuid4().hex
         # Select a globally unique ID for the run, that sorts by time.
@@ -211,6 +279,39 @@ class RunTracker(Subsystem):
 
         self._end_memoized_result: Optional[ExitCode] = None
 
+        # Completed engine workunits, if `--critical-path` or `--stats-engine-detail` is enabled.
+        # See `handle_workunits`.
+        self._engine_workunits = WorkunitProfile()
+        self._critical_path: Optional[List[CriticalPathEntry]] = None
+        # Engine counters, if `--stats-engine-detail` is enabled. See `set_engine_node_metrics`.
+        self._engine_node_metrics: Optional[Mapping[str, Any]] = None
+        self._engine_detail: Optional[Dict[str, Any]] = None
+
+    @property
+    def records_engine_workunits(self) -> bool:
+        """Whether `handle_workunits` should receive the engine's workunits for this run."""
+        return cast(bool, self.options.critical_path or self.options.stats_engine_detail)
+
+    @property
+    def records_node_metrics(self) -> bool:
+        """Whether the engine should record per-rule counters for this run."""
+        return cast(bool, self.options.stats_engine_detail)
+
+    def set_engine_node_metrics(self, node_metrics: Mapping[str, Any]) -> None:
+        """Sets the engine's counters for this run, as returned by `SchedulerSession.node_metrics`.
+
+        Should be called before `end()`.
+        """
+        self._engine_node_metrics = node_metrics
+
+    def handle_workunits(self, *, completed_workunits, **kwargs) -> None:
+        """A `StreamingWorkunitHandler` callback which records completed engine workunits.
+
+        NB: The final chunk of workunits is delivered after the engine has completed, but before
+        `end()` is called.
+        """
+        self._engine_workunits.add(completed_workunits)
+
     def set_v2_goal_rule_names(self, v2_goal_rule_names: Tuple[str, ...]) -> None:
         self._v2_goal_rule_names = v2_goal_rule_names
 
@@ -218,6 +319,10 @@ class RunTracker(Subsystem):
     def v2_goals_rule_names(self) -> Tuple[str, ...]:
         return self._v2_goal_rule_names
 
+    def set_backend_load_timings(self, backend_load_timings: Mapping[str, float]) -> None:
+        """Record the time spent loading each backend and plugin, for inclusion in stats."""
+        self._backend_load_timings = dict(backend_load_timings)
+
     def register_thread(self, parent_workunit):
         """Register the parent workunit for all work in the calling thread.
 
@@ -374,10 +479,7 @@ class RunTracker(Subsystem):
 
     @classmethod
     def _get_headers(cls, stats_version: int) -> Dict[str, str]:
-        return {
-            "User-Agent": f"pants/v{VERSION}",
-            "X-Pants-Stats-Version": str(stats_version),
-        }
+        return stats_upload_headers(stats_version)
 
     @classmethod
     def post_stats(
@@ -393,11 +495,6 @@ class RunTracker(Subsystem):
         :return: True if upload was successful, False otherwise.
         """
 
-        def error(msg):
-            # Report already closed, so just print error.
-            print(f"WARNING: Failed to upload stats to {stats_url} due to {msg}", file=sys.stderr)
-            return False
-
         if stats_version not in cls.SUPPORTED_STATS_VERSIONS:
             raise ValueError("Invalid stats version")
 
@@ -414,42 +511,14 @@ class RunTracker(Subsystem):
             # But this will first require changing the upload receiver at every shop that uses this.
             params = {k: cls._json_dump_options(v) for (k, v) in stats.items()}  # type: ignore[assignment]
 
-        # We can't simply let requests handle redirects, as we only allow them for specific codes:
-        # 307 and 308 indicate that the redirected request must use the same method, POST in this case.
-        # So they indicate a true redirect of the POST itself, and we allow them.
-        # The other redirect codes either must, or in practice do, cause the user agent to switch the
-        # method to GET. So when they are encountered on a POST, it indicates an auth problem (a
-        # redirection to a login page).
-        def do_post(url, num_redirects_allowed):
-            if num_redirects_allowed < 0:
-                return error("too many redirects.")
-            res = requests.post(
-                url,
-                data=params,
-                timeout=timeout,
-                headers=headers,
-                allow_redirects=False,
-                **auth_data.request_args,
-            )
-            if res.status_code in {307, 308}:
-                return do_post(res.headers["location"], num_redirects_allowed - 1)
-            elif 300 <= res.status_code < 400 or res.status_code == 401:
-                error(f"HTTP error code: {res.status_code}. Reason: {res.reason}.")
-                print(
-                    f"Use `path/to/pants login --to={auth_provider}` to authenticate "
-                    "against the stats upload service.",
-                    file=sys.stderr,
-                )
-                return False
-            elif not res.ok:
-                error(f"HTTP error code: {res.status_code}. Reason: {res.reason}.")
-                return False
-            return True
-
-        try:
-            return do_post(stats_url, num_redirects_allowed=6)
-        except Exception as e:  # Broad catch - we don't want to fail the build over upload errors.
-            return error(f"Error: {e!r}")
+        return post_stats_payload(
+            stats_url,
+            data=params,
+            headers=headers,
+            timeout=timeout,
+            request_args=auth_data.request_args,
+            auth_provider=auth_provider,
+        )
 
     @classmethod
     def _json_dump_options(cls, stats: dict) -> str:
@@ -481,7 +550,12 @@ class RunTracker(Subsystem):
             "pantsd_stats": self.pantsd_stats.get_all(),
             "cumulative_timings": self.cumulative_timings.get_all(),
             "recorded_options": self._get_options_to_record(),
+            "backend_load_timings": self._backend_load_timings,
         }
+        if self._critical_path is not None:
+            stats["critical_path"] = [entry.to_json() for entry in self._critical_path]
+        if self._engine_detail is not None:
+            stats["engine_detail"] = self._engine_detail
         if self._stats_version == 2:
             stats["workunits"] = self.json_reporter.results
         else:
@@ -506,6 +580,9 @@ class RunTracker(Subsystem):
         # Upload to remote stats db.
         stats_upload_urls = copy.copy(self.options.stats_upload_urls)
         timeout = self.options.stats_upload_timeout
+        if stats_upload_urls and self.options.stats_upload_async:
+            self._spool_stats(stats, stats_upload_urls, timeout)
+            return
         for stats_url, auth_provider in stats_upload_urls.items():
             self.post_stats(
                 stats_url,
@@ -515,6 +592,34 @@ class RunTracker(Subsystem):
                 stats_version=self._stats_version,
             )
 
+    def _spool_stats(
+        self, stats: dict, stats_upload_urls: Mapping[str, Optional[str]], timeout: int
+    ) -> None:
+        """Spool stats for upload by a background sender: see `pants.goal.stats_spool`."""
+        try:
+            encoded_stats = json.loads(self._json_dump_options(stats))
+            spool = StatsSpool(
+                stats_spool_dir(self.options.pants_workdir),
+                max_bytes=self.options.stats_upload_spool_max_bytes,
+            )
+            for stats_url, auth_provider in stats_upload_urls.items():
+                auth_data = BasicAuth.global_instance().get_auth_for_provider(auth_provider)
+                cookie_jar = auth_data.request_args.get("cookies")
+                spool.add(
+                    SpoolEntry(
+                        url=stats_url,
+                        stats=encoded_stats,
+                        stats_version=self._stats_version,
+                        timeout=timeout,
+                        auth_provider=auth_provider,
+                        cookie_file=getattr(cookie_jar, "filename", None),
+                        max_attempts=self.options.stats_upload_max_attempts,
+                    )
+                )
+            ensure_sender(spool)
+        except Exception as e:  # Broad catch - we don't want to fail in stats related failure.
+            print(f"WARNING: Failed to spool stats for upload due to Error: {e!r}", file=sys.stderr)
+
     _log_levels = [Report.ERROR, Report.ERROR, Report.WARN, Report.INFO, Report.INFO]
 
     def has_ended(self) -> bool:
@@ -552,6 +657,17 @@ class RunTracker(Subsystem):
         if self._target_to_data:
             self.run_info.add_info("target_data", self._target_to_data)
 
+        if self.options.critical_path:
+            self._critical_path = self._engine_workunits.critical_path()
+            self._log_critical_path(self._critical_path)
+        if self._engine_node_metrics is not None:
+            self._engine_detail = engine_detail(
+                self._engine_node_metrics, self._engine_workunits.rule_profiles()
+            )
+            summary_limit = self.options.stats_engine_detail_summary_limit
+            if summary_limit > 0:
+                logger.info(format_engine_detail(self._engine_detail, summary_limit))
+
         self.report.close()
         self.store_stats()
 
@@ -560,6 +676,23 @@ class RunTracker(Subsystem):
         self._end_memoized_result = result
         return self._end_memoized_result
 
+    @staticmethod
+    def _log_critical_path(critical_path: List[CriticalPathEntry]) -> None:
+        if not critical_path:
+            return
+        roots = [entry for entry in critical_path if entry.depth == 0]
+        wall_secs = (
+            roots[-1].start_micros + roots[-1].duration_micros - roots[0].start_micros
+        ) / 1e6
+        lines = [f"Critical path ({wall_secs:.3f}s):"]
+        for entry in critical_path:
+            description = f" ({entry.description})" if entry.description else ""
+            lines.append(
+                f"  {entry.start_micros / 1e6:>9.3f}s {entry.duration_micros / 1e6:>9.3f}s  "
+                f"{'  ' * entry.depth}{entry.name}{description}"
+            )
+        logger.info("\n".join(lines))
+
     def end_workunit(self, workunit):
         path, duration, self_time, is_tool = workunit.end()
         self.report.end_workunit(workunit)
@@ -0,0 +1,334 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""A local spool of run stats awaiting upload, and the sender that drains it.
+
+Runs write their stats to the spool and return immediately: uploads happen in the background,
+either in the `StatsUploadService` of pantsd, or in a detached sender process launched by the run.
+The sender batches stats bound for the same URL, and retries failed uploads with exponential
+backoff. The spool is bounded in size by evicting its oldest entries.
+
+NB: This module is also the entrypoint of the detached sender process, so it should only import
+what is needed to send stats, and not (for example) the options system.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from http.cookiejar import LWPCookieJar
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import requests
+
+from pants.util.dirutil import safe_concurrent_creation, safe_delete, safe_mkdir
+from pants.version import VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def stats_spool_dir(pants_workdir: str) -> str:
+    return os.path.join(pants_workdir, "stats_spool")
+
+
+def stats_upload_headers(stats_version: int) -> Dict[str, str]:
+    return {
+        "User-Agent": f"pants/v{VERSION}",
+        "X-Pants-Stats-Version": str(stats_version),
+    }
+
+
+def post_stats_payload(
+    stats_url: str,
+    *,
+    data: Any,
+    headers: Mapping[str, str],
+    timeout: float,
+    request_args: Mapping[str, Any],
+    auth_provider: Optional[str] = None,
+) -> bool:
+    """POST an encoded stats payload to the given url.
+
+    :return: True if upload was successful, False otherwise.
+    """
+
+    def error(msg):
+        # Report already closed, so just print error.
+        print(f"WARNING: Failed to upload stats to {stats_url} due to {msg}", file=sys.stderr)
+        return False
+
+    # We can't simply let requests handle redirects, as we only allow them for specific codes:
+    # 307 and 308 indicate that the redirected request must use the same method, POST in this case.
+    # So they indicate a true redirect of the POST itself, and we allow them.
+    # The other redirect codes either must, or in practice do, cause the user agent to switch the
+    # method to GET. So when they are encountered on a POST, it indicates an auth problem (a
+    # redirection to a login page).
+    def do_post(url, num_redirects_allowed):
+        if num_redirects_allowed < 0:
+            return error("too many redirects.")
+        res = requests.post(
+            url, data=data, timeout=timeout, headers=headers, allow_redirects=False, **request_args
+        )
+        if res.status_code in {307, 308}:
+            return do_post(res.headers["location"], num_redirects_allowed - 1)
+        elif 300 <= res.status_code < 400 or res.status_code == 401:
+            error(f"HTTP error code: {res.status_code}. Reason: {res.reason}.")
+            print(
+                f"Use `path/to/pants login --to={auth_provider}` to authenticate "
+                "against the stats upload service.",
+                file=sys.stderr,
+            )
+            return False
+        elif not res.ok:
+            error(f"HTTP error code: {res.status_code}. Reason: {res.reason}.")
+            return False
+        return True
+
+    try:
+        return do_post(stats_url, num_redirects_allowed=6)
+    except Exception as e:  # Broad catch - we don't want to fail the build over upload errors.
+        return error(f"Error: {e!r}")
+
+
+@dataclass(frozen=True)
+class SpoolEntry:
+    """The stats of one run, bound for one URL.
+
+    `stats` has already been encoded to JSON-compatible values by the writer.
+    """
+
+    url: str
+    stats: Dict[str, Any]
+    stats_version: int
+    timeout: float
+    auth_provider: Optional[str] = None
+    cookie_file: Optional[str] = None
+    max_attempts: int = 5
+    attempts: int = 0
+    next_attempt_time: float = 0.0
+
+    @property
+    def batch_key(self) -> Tuple[str, int, float, Optional[str], Optional[str]]:
+        return (self.url, self.stats_version, self.timeout, self.auth_provider, self.cookie_file)
+
+    def to_json(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class StatsSpool:
+    """A directory of stats awaiting upload, bounded to a maximum size in bytes."""
+
+    # The exponential backoff between attempts to upload an entry, in seconds.
+    _BACKOFF_BASE_SECS = 2.0
+    _BACKOFF_MAX_SECS = 5 * 60.0
+
+    # The maximum number of v2 stats to upload in one request.
+    MAX_BATCH_SIZE = 20
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def _entry_paths(self) -> List[str]:
+        # NB: Entry names sort in creation order: see `add`.
+        try:
+            names = sorted(os.listdir(self._directory))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self._directory, n) for n in names if n.endswith(".json")]
+
+    def _write(self, path: str, entry: SpoolEntry) -> None:
+        with safe_concurrent_creation(path) as tmp_path:
+            with open(tmp_path, "w") as f:
+                json.dump(entry.to_json(), f)
+
+    def add(self, entry: SpoolEntry) -> None:
+        """Adds an entry, evicting the oldest entries if the spool is then over its bound."""
+        name = f"{int(time.time() * 1_000_000):020d}-{uuid.uuid4().hex}.json"
+        self._write(os.path.join(self._directory, name), entry)
+        self._evict()
+
+    def _evict(self) -> None:
+        if self._max_bytes is None:
+            return
+        sizes = []
+        for path in self._entry_paths():
+            try:
+                sizes.append((path, os.path.getsize(path)))
+            except FileNotFoundError:
+                # Concurrently sent.
+                pass
+        total = sum(size for _, size in sizes)
+        for path, size in sizes:
+            if total <= self._max_bytes:
+                break
+            logger.warning(f"Stats spool {self._directory} is full: dropping {path}.")
+            safe_delete(path)
+            total -= size
+
+    def pending(self) -> List[Tuple[str, SpoolEntry]]:
+        entries = []
+        for path in self._entry_paths():
+            try:
+                with open(path) as f:
+                    entries.append((path, SpoolEntry(**json.load(f))))
+            except FileNotFoundError:
+                pass
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Dropping unreadable stats spool entry {path}: {e!r}")
+                safe_delete(path)
+        return entries
+
+    @contextmanager
+    def sender_lock(self) -> Iterator[bool]:
+        """Yields True if this process holds the (non-blocking) lock to send the spool."""
+        safe_mkdir(self._directory)
+        with open(os.path.join(self._directory, ".sender.lock"), "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def send_pending(self, now: Optional[float] = None) -> Optional[float]:
+        """Attempts to upload all entries which are due, in batches.
+
+        Should only be called while holding the `sender_lock`.
+
+        :return: The number of seconds until the next entry is due, or None if the spool is empty.
+        """
+        now = time.time() if now is None else now
+        pending = self.pending()
+        due = [(path, entry) for path, entry in pending if entry.next_attempt_time <= now]
+        batches: Dict[Tuple[Any, ...], List[Tuple[str, SpoolEntry]]] = defaultdict(list)
+        for path, entry in due:
+            batches[entry.batch_key].append((path, entry))
+        for batch in batches.values():
+            # NB: The v1 upload protocol has one set of params per request, so can't be batched.
+            batch_size = self.MAX_BATCH_SIZE if batch[0][1].stats_version == 2 else 1
+            for i in range(0, len(batch), batch_size):
+                self._send_batch(batch[i : i + batch_size], now)
+
+        next_times = [entry.next_attempt_time for _, entry in self.pending()]
+        return max(0.0, min(next_times) - now) if next_times else None
+
+    def _send_batch(self, batch: List[Tuple[str, SpoolEntry]], now: float) -> None:
+        first = batch[0][1]
+        headers = stats_upload_headers(first.stats_version)
+        if first.stats_version == 2:
+            data: Any = json.dumps({"builds": [entry.stats for _, entry in batch]})
+            headers["Content-Type"] = "application/json"
+        else:
+            data = {k: json.dumps(v) for k, v in first.stats.items()}
+        request_args: Dict[str, Any] = {}
+        if first.cookie_file and os.path.exists(first.cookie_file):
+            cookie_jar = LWPCookieJar(first.cookie_file)
+            cookie_jar.load()
+            request_args["cookies"] = cookie_jar
+
+        succeeded = post_stats_payload(
+            first.url,
+            data=data,
+            headers=headers,
+            timeout=first.timeout,
+            request_args=request_args,
+            auth_provider=first.auth_provider,
+        )
+        for path, entry in batch:
+            attempts = entry.attempts + 1
+            if succeeded or attempts >= entry.max_attempts:
+                if not succeeded:
+                    logger.warning(
+                        f"Giving up on uploading stats to {entry.url} after {attempts} attempts."
+                    )
+                safe_delete(path)
+                continue
+            backoff = min(self._BACKOFF_BASE_SECS * 2 ** entry.attempts, self._BACKOFF_MAX_SECS)
+            self._write(
+                path,
+                SpoolEntry(
+                    **{**entry.to_json(), "attempts": attempts, "next_attempt_time": now + backoff}
+                ),
+            )
+
+    def send_until_empty(self) -> None:
+        """Sends entries until the spool is empty, sleeping between retries.
+
+        Returns immediately if another sender holds the lock for this spool.
+        """
+        while True:
+            with self.sender_lock() as acquired:
+                if not acquired:
+                    return
+                while True:
+                    wait_secs = self.send_pending()
+                    if wait_secs is None:
+                        break
+                    time.sleep(wait_secs)
+            # An entry added after we found the spool empty, but before we released the lock, will
+            # have had its sender fail to acquire the lock and exit. So check again now that the
+            # lock is released: if a new sender has acquired it in the meantime, we will exit.
+            if not self.pending():
+                return
+
+
+# The number of senders running in this process (i.e., in pantsd): while non-zero, runs do not need
+# to launch a detached sender.
+_in_process_senders = 0
+_in_process_senders_lock = threading.Lock()
+
+
+@contextmanager
+def in_process_sender() -> Iterator[None]:
+    """Marks a sender as running in this process for the duration of the context."""
+    global _in_process_senders
+    with _in_process_senders_lock:
+        _in_process_senders += 1
+    try:
+        yield
+    finally:
+        with _in_process_senders_lock:
+            _in_process_senders -= 1
+
+
+def ensure_sender(spool: StatsSpool) -> None:
+    """Ensures that a sender will drain the given spool, launching a detached one if needed."""
+    if _in_process_senders:
+        return
+    log_file = os.path.join(spool.directory, "sender.log")
+    try:
+        with open(log_file, "a") as log:
+            subprocess.Popen(
+                [sys.executable, "-m", __name__, spool.directory],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+                start_new_session=True,
+                close_fds=True,
+            )
+    except OSError as e:
+        print(f"WARNING: Failed to launch a stats sender: {e!r}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(process)d %(levelname)s %(message)s"
+    )
+    StatsSpool(sys.argv[1]).send_until_empty()
@@ -0,0 +1,132 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import json
+import os
+import unittest.mock
+from http.server import BaseHTTPRequestHandler
+from typing import Any, List, Optional
+
+from pants.goal.stats_spool import SpoolEntry, StatsSpool
+from pants.util.contextutil import http_server, temporary_dir
+
+
+class StatsHandler(BaseHTTPRequestHandler):
+    # The status codes to respond with, in order: when exhausted, responds with 200.
+    statuses: List[int] = []
+    received: List[Any] = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        StatsHandler.received.append(json.loads(body))
+        status = StatsHandler.statuses.pop(0) if StatsHandler.statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def reset_handler(*statuses: int) -> None:
+    StatsHandler.statuses = list(statuses)
+    StatsHandler.received = []
+
+
+def entry(port: int, run: int, **kwargs) -> SpoolEntry:
+    return SpoolEntry(
+        url=f"http://localhost:{port}/upload",
+        stats={"run_info": {"id": run}},
+        stats_version=2,
+        timeout=2,
+        **kwargs,
+    )
+
+
+def test_batched_upload() -> None:
+    reset_handler()
+    with temporary_dir() as spool_dir, http_server(StatsHandler) as port:
+        spool = StatsSpool(spool_dir)
+        for run in range(3):
+            spool.add(entry(port, run))
+        assert spool.send_pending() is None
+        assert StatsHandler.received == [
+            {"builds": [{"run_info": {"id": 0}}, {"run_info": {"id": 1}}, {"run_info": {"id": 2}}]}
+        ]
+        assert spool.pending() == []
+
+
+def test_retry_with_backoff() -> None:
+    reset_handler(500, 503)
+    with temporary_dir() as spool_dir, http_server(StatsHandler) as port:
+        spool = StatsSpool(spool_dir)
+        spool.add(entry(port, 0, max_attempts=3))
+
+        assert spool.send_pending(now=1000.0) == 2.0
+        # Not yet due.
+        assert spool.send_pending(now=1001.0) == 1.0
+        assert len(StatsHandler.received) == 1
+
+        assert spool.send_pending(now=1002.0) == 4.0
+        ((_, retried),) = spool.pending()
+        assert retried.attempts == 2
+
+        assert spool.send_pending(now=1006.0) is None
+        assert len(StatsHandler.received) == 3
+
+
+def test_give_up_after_max_attempts() -> None:
+    reset_handler(500, 500)
+    with temporary_dir() as spool_dir, http_server(StatsHandler) as port:
+        spool = StatsSpool(spool_dir)
+        spool.add(entry(port, 0, max_attempts=2))
+        assert spool.send_pending(now=1000.0) == 2.0
+        assert spool.send_pending(now=1002.0) is None
+        assert len(StatsHandler.received) == 2
+
+
+def test_bounded_spool() -> None:
+    with temporary_dir() as spool_dir:
+        entry_size = len(json.dumps(entry(0, 0).to_json()))
+        spool = StatsSpool(spool_dir, max_bytes=entry_size * 2)
+        for run in range(4):
+            spool.add(entry(0, run))
+        assert [e.stats["run_info"]["id"] for _, e in spool.pending()] == [2, 3]
+        assert len([n for n in os.listdir(spool_dir) if n.endswith(".json")]) == 2
+
+
+def test_sender_lock() -> None:
+    with temporary_dir() as spool_dir:
+        spool = StatsSpool(spool_dir)
+        with spool.sender_lock() as acquired:
+            assert acquired
+            with StatsSpool(spool_dir).sender_lock() as acquired_concurrently:
+                assert not acquired_concurrently
+        with spool.sender_lock() as acquired:
+            assert acquired
+
+
+def test_send_until_empty_rechecks_after_unlocking() -> None:
+    reset_handler()
+    with temporary_dir() as spool_dir, http_server(StatsHandler) as port:
+        spool = StatsSpool(spool_dir)
+        spool.add(entry(port, 0))
+        send_pending = spool.send_pending
+
+        def send_pending_then_add(now: Optional[float] = None) -> Optional[float]:
+            wait_secs = send_pending(now)
+            if len(StatsHandler.received) == 1 and len(spool.pending()) == 0:
+                # Another run adds an entry just after the spool was found to be empty, and its
+                # sender fails to acquire the lock.
+                spool.add(entry(port, 1))
+                with StatsSpool(spool_dir).sender_lock() as acquired:
+                    assert not acquired
+            return wait_secs
+
+        with unittest.mock.patch.object(spool, "send_pending", send_pending_then_add):
+            spool.send_until_empty()
+        assert spool.pending() == []
+        assert StatsHandler.received == [
+            {"builds": [{"run_info": {"id": 0}}]},
+            {"builds": [{"run_info": {"id": 1}}]},
+        ]
@@ -4,7 +4,7 @@
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, List, Optional, Set, Tuple, Type, cast
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type, Union, cast
 
 from pants.base.build_environment import get_buildroot
 from pants.base.build_root import BuildRoot
@@ -43,13 +43,28 @@ class LegacyGraphScheduler:
     scheduler: Scheduler
     build_file_aliases: Any
     goal_map: Any
+    build_file_parser: Parser
 
     def new_session(
-        self, build_id, dynamic_ui: bool = False, use_colors=True, should_report_workunits=False,
+        self,
+        build_id,
+        dynamic_ui: bool = False,
+        use_colors=True,
+        should_report_workunits=False,
+        should_record_node_metrics=False,
     ) -> "LegacyGraphSession":
-        session = self.scheduler.new_session(build_id, dynamic_ui, should_report_workunits)
+        session = self.scheduler.new_session(
+            build_id, dynamic_ui, should_report_workunits, should_record_node_metrics
+        )
         console = Console(use_colors=use_colors, session=session if dynamic_ui else None,)
-        return LegacyGraphSession(session, console, self.build_file_aliases, self.goal_map)
+        return LegacyGraphSession(
+            session,
+            console,
+            self.build_file_aliases,
+            self.goal_map,
+            self.build_file_parser,
+            self.build_file_parser.parse_counts(),
+        )
 
 
 @dataclass(frozen=True)
@@ -60,6 +75,13 @@ class LegacyGraphSession:
     console: Console
     build_file_aliases: Any
     goal_map: Any
+    build_file_parser: Parser
+    # The Parser's `parse_counts` when the session was created.
+    build_file_parse_counts: Tuple[int, int]
+
+    def build_file_parser_metrics(self) -> Dict[str, Union[int, float]]:
+        """Returns the BUILD file parsing metrics of this session."""
+        return self.build_file_parser.metrics(since=self.build_file_parse_counts)
 
     class InvalidGoals(Exception):
         """Raised when invalid v2 goals are passed in a v2-only mode."""
@@ -232,7 +254,9 @@ class EngineInitializer:
 
         registered_target_types = RegisteredTargetTypes.create(build_configuration.target_types)
         parser = Parser(
-            target_type_aliases=registered_target_types.aliases, object_aliases=build_file_aliases
+            target_type_aliases=registered_target_types.aliases,
+            object_aliases=build_file_aliases,
+            bytecode_cache_dir=os.path.join(bootstrap_options.pants_workdir, "build_file_bytecode"),
         )
         address_mapper = AddressMapper(
             parser=parser,
@@ -305,4 +329,4 @@ class EngineInitializer:
             visualize_to_dir=bootstrap_options.native_engine_visualize_to,
         )
 
-        return LegacyGraphScheduler(scheduler, build_file_aliases, goal_map)
+        return LegacyGraphScheduler(scheduler, build_file_aliases, goal_map, parser)
@@ -2,6 +2,8 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import importlib
+import logging
+import time
 import traceback
 from typing import Dict, List, Optional
 
@@ -11,6 +13,8 @@ from pants.base.exceptions import BackendConfigurationError
 from pants.build_graph.build_configuration import BuildConfiguration
 from pants.util.ordered_set import FrozenOrderedSet
 
+logger = logging.getLogger(__name__)
+
 
 class PluginLoadingError(Exception):
     pass
@@ -40,7 +44,16 @@ def load_backends_and_plugins(
     bc_builder = bc_builder or BuildConfiguration.Builder()
     load_build_configuration_from_source(bc_builder, backends)
     load_plugins(bc_builder, plugins, working_set)
-    return bc_builder.create()
+    build_configuration = bc_builder.create()
+    if logger.isEnabledFor(logging.DEBUG):
+        timings = sorted(
+            build_configuration.backend_load_timings.items(), key=lambda item: item[1], reverse=True
+        )
+        logger.debug(
+            "Backend load timings:\n%s",
+            "\n".join(f"  {seconds:.3f}s {backend}" for backend, seconds in timings),
+        )
+    return build_configuration
 
 
 def load_plugins(
@@ -71,6 +84,7 @@ def load_plugins(
     """
     loaded: Dict = {}
     for plugin in plugins or []:
+        start = time.time()
         req = Requirement.parse(plugin)
         dist = working_set.find(req)
 
@@ -95,6 +109,7 @@ def load_plugins(
             rules = entries["rules"].load()()
             build_configuration.register_rules(rules)
         loaded[dist.as_requirement().key] = dist
+        build_configuration.record_backend_load_time(plugin, time.time() - start)
 
 
 def load_build_configuration_from_source(
@@ -120,9 +135,14 @@ def load_backend(build_configuration: BuildConfiguration.Builder, backend_packag
     :param build_configuration: the BuildConfiguration to install the backend plugin into.
     :param backend_package: the package name containing the backend plugin register module that
       provides the plugin entrypoints.
+
+    The time spent importing the register module (including any modules it transitively imports
+    for the first time) and invoking its entrypoints is recorded against the backend package.
+
     :raises: :class:``pants.base.exceptions.BuildConfigurationError`` if there is a problem loading
       the build configuration.
     """
+    start = time.time()
     backend_module = backend_package + ".register"
     try:
         module = importlib.import_module(backend_module)
@@ -149,3 +169,4 @@ def load_backend(build_configuration: BuildConfiguration.Builder, backend_packag
     rules = invoke_entrypoint("rules")
     if rules:
         build_configuration.register_rules(rules)
+    build_configuration.record_backend_load_time(backend_package, time.time() - start)
@@ -4,6 +4,7 @@
 from pants.goal.run_tracker import RunTracker
 from pants.process.subprocess import Subprocess
 from pants.reporting.reporting import Reporting
+from pants.reporting.workunit_profile import WorkunitProfiler
 from pants.scm.subsystems.changed import Changed
 
 
@@ -11,4 +12,4 @@ class GlobalSubsystems:
     @classmethod
     def get(cls):
         """Subsystems used outside of any task."""
-        return {Reporting, RunTracker, Changed, Subprocess.Factory}
+        return {Reporting, RunTracker, Changed, Subprocess.Factory, WorkunitProfiler}
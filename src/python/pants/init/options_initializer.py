@@ -151,6 +151,19 @@ class OptionsInitializer:
 
         return list(invalidation_globs)
 
+    @staticmethod
+    def compute_pantsd_reloadable_globs(bootstrap_options):
+        """Computes the globs whose changes pantsd can pick up without restarting.
+
+        These are excluded from the `--pantsd-invalidation-globs`: BUILD file preludes are read via
+        the engine, which invalidates them itself.
+
+        NB: Config files are deliberately not reloadable. Options like `--backend-packages`,
+        `--plugins` and `--pythonpath` determine the BuildConfiguration, which is only computed when
+        the daemon starts, so any change to a config file must restart the daemon.
+        """
+        return list(bootstrap_options.build_file_prelude_globs)
+
     @classmethod
     def create(cls, options_bootstrapper, build_configuration, init_subsystems=True):
         global_bootstrap_options = options_bootstrapper.get_bootstrap_options().for_global_scope()
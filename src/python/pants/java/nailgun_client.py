@@ -79,7 +79,9 @@ class NailgunClientSession(NailgunProtocol, NailgunProtocol.TimeoutProvider):
         """Write a payload to a given fd (if provided) and flush the fd."""
         try:
             if payload:
-                fd.write(ensure_binary(payload))
+                # NB: Payloads received from the protocol are bytes-like (`bytearray`), and are
+                # written through without copying.
+                fd.write(payload if not isinstance(payload, str) else ensure_binary(payload))
             fd.flush()
         except (IOError, OSError) as e:
             # If a `Broken Pipe` is encountered during a stdio fd write, we're headless - bail.
@@ -141,34 +141,71 @@ class NailgunProtocol:
 
     @classmethod
     def write_chunk(cls, sock, chunk_type, payload=b""):
-        """Write a single chunk to the connected client."""
-        chunk = cls.construct_chunk(chunk_type, payload)
-        sock.sendall(chunk)
+        """Write a single chunk to the connected client.
+
+        Where the socket supports it, the header and payload are sent with a single vectored write
+        rather than being concatenated into a new buffer first.
+        """
+        payload = cls._encode_payload(payload)
+        header = struct.pack(cls.HEADER_FMT, len(payload), chunk_type)
+        cls._sendall_vectored(sock, header, payload)
 
     @classmethod
     def construct_chunk(cls, chunk_type, payload, encoding="utf-8"):
         """Construct and return a single chunk."""
-        if isinstance(payload, str):
-            payload = payload.encode(encoding)
-        elif not isinstance(payload, bytes):
-            raise TypeError("cannot encode type: {}".format(type(payload)))
-
+        payload = cls._encode_payload(payload, encoding)
         header = struct.pack(cls.HEADER_FMT, len(payload), chunk_type)
         return header + payload
 
+    @classmethod
+    def _encode_payload(cls, payload, encoding="utf-8"):
+        if isinstance(payload, str):
+            return payload.encode(encoding)
+        elif isinstance(payload, (bytes, bytearray, memoryview)):
+            return payload
+        raise TypeError("cannot encode type: {}".format(type(payload)))
+
+    @classmethod
+    def _sendall_vectored(cls, sock, *buffers):
+        """Send all of the given buffers, in order, without joining them into a single buffer.
+
+        Falls back to a single `sendall` of the joined buffers for sockets without `sendmsg`.
+        """
+        sendmsg = getattr(sock, "sendmsg", None)
+        if sendmsg is None:
+            sock.sendall(b"".join(buffers))
+            return
+
+        views = [memoryview(buf).cast("B") for buf in buffers if len(buf)]
+        while views:
+            sent = sendmsg(views)
+            # Drop fully-sent buffers, and trim any partially-sent buffer.
+            while sent:
+                if sent >= len(views[0]):
+                    sent -= len(views[0])
+                    views.pop(0)
+                else:
+                    views[0] = views[0][sent:]
+                    sent = 0
+
     @classmethod
     def _read_until(cls, sock, desired_size):
-        """Read a certain amount of content from a socket before returning."""
-        buf = b""
-        while len(buf) < desired_size:
-            recv_bytes = sock.recv(desired_size - len(buf))
-            if not recv_bytes:
+        """Read a certain amount of content from a socket before returning.
+
+        Content is received directly into a single preallocated buffer, which is returned.
+        """
+        buf = bytearray(desired_size)
+        view = memoryview(buf)
+        received = 0
+        while received < desired_size:
+            recv_size = sock.recv_into(view[received:], desired_size - received)
+            if not recv_size:
                 raise cls.TruncatedRead(
                     "Expected {} bytes before socket shutdown, instead received {}".format(
-                        desired_size, len(buf)
+                        desired_size, received
                     )
                 )
-            buf += recv_bytes
+            received += recv_size
         return buf
 
     @classmethod
@@ -182,6 +219,9 @@ class NailgunProtocol:
                 unsigned long. The high-order byte is header[0] and the low-order byte is header[3].
 
              2) A single byte identifying the type of chunk.
+
+        If `return_bytes` is True, the payload is returned as the `bytearray` it was received into,
+        without copying or decoding it: this allows stdio chunks to be passed through as-is.
         """
         try:
             # Read the chunk header from the socket.
@@ -252,7 +292,8 @@ class NailgunProtocol:
         """Generates chunks from a connected socket until an Exit chunk is sent or a timeout occurs.
 
         :param sock: the socket to read from.
-        :param bool return_bytes: If False, decode the payload into a utf-8 string.
+        :param bool return_bytes: If False, decode the payload into a utf-8 string. Otherwise, the
+                                  payload is yielded as a `bytearray`.
         :param cls.TimeoutProvider timeout_object: If provided, will be checked every iteration for a
                                                    possible timeout.
         :raises: :class:`cls.ProcessStreamTimeout`
@@ -0,0 +1,65 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import socket
+import threading
+import unittest
+
+from pants.java.nailgun_protocol import ChunkType, NailgunProtocol
+
+
+class TestNailgunProtocolFraming(unittest.TestCase):
+    def setUp(self):
+        self.client_sock, self.server_sock = socket.socketpair()
+
+    def tearDown(self):
+        self.client_sock.close()
+        self.server_sock.close()
+
+    def test_write_read_chunk(self):
+        NailgunProtocol.write_chunk(self.server_sock, ChunkType.STDOUT, "hello")
+        chunk_type, payload = NailgunProtocol.read_chunk(self.client_sock)
+        self.assertEqual(chunk_type, ChunkType.STDOUT)
+        self.assertEqual(payload, "hello")
+
+    def test_write_read_empty_chunk(self):
+        NailgunProtocol.send_start_reading_input(self.server_sock)
+        chunk_type, payload = NailgunProtocol.read_chunk(self.client_sock, return_bytes=True)
+        self.assertEqual(chunk_type, ChunkType.START_READING_INPUT)
+        self.assertEqual(payload, b"")
+
+    def test_return_bytes_passes_through_undecoded(self):
+        raw = b"\xff\xfe not utf-8"
+        NailgunProtocol.send_stderr(self.server_sock, raw)
+        chunk_type, payload = NailgunProtocol.read_chunk(self.client_sock, return_bytes=True)
+        self.assertEqual(chunk_type, ChunkType.STDERR)
+        self.assertIsInstance(payload, bytearray)
+        self.assertEqual(payload, raw)
+
+    def test_large_payload(self):
+        # Larger than the socket buffers, so both the vectored send and the receive are partial.
+        payload = bytes(range(256)) * (16 * 1024)
+        writer = threading.Thread(
+            target=NailgunProtocol.send_stdout, args=(self.server_sock, payload)
+        )
+        writer.start()
+        chunk_type, received = NailgunProtocol.read_chunk(self.client_sock, return_bytes=True)
+        writer.join()
+        self.assertEqual(chunk_type, ChunkType.STDOUT)
+        self.assertEqual(received, payload)
+
+    def test_write_chunk_matches_construct_chunk(self):
+        NailgunProtocol.write_chunk(self.server_sock, ChunkType.ARGUMENT, "arg")
+        expected = NailgunProtocol.construct_chunk(ChunkType.ARGUMENT, "arg")
+        self.assertEqual(NailgunProtocol._read_until(self.client_sock, len(expected)), expected)
+
+    def test_truncated_payload(self):
+        chunk = NailgunProtocol.construct_chunk(ChunkType.STDOUT, b"truncated")
+        self.server_sock.sendall(chunk[:-2])
+        self.server_sock.close()
+        with self.assertRaises(NailgunProtocol.TruncatedPayloadError):
+            NailgunProtocol.read_chunk(self.client_sock)
+
+    def test_construct_chunk_invalid_type(self):
+        with self.assertRaises(TypeError):
+            NailgunProtocol.construct_chunk(ChunkType.STDOUT, 1)
@@ -45,6 +45,18 @@ class OwnersNotFoundBehavior(Enum):
         return GlobMatchErrorBehavior(self.value)
 
 
+class StreamingWorkunitsOverflowBehavior(Enum):
+    """What to do when a streaming workunit handler's queue of undelivered batches is full."""
+
+    # Wait for the handler to catch up: this applies backpressure to the delivery of workunits to
+    # all handlers.
+    block = "block"
+    # Drop the oldest undelivered batch of workunits.
+    drop_oldest = "drop_oldest"
+    # Drop the batch of workunits which did not fit.
+    drop_newest = "drop_newest"
+
+
 @dataclass(frozen=True)
 class ExecutionOptions:
     """A collection of all options related to (remote) execution of processes.
@@ -960,6 +972,24 @@ class GlobalOptions(Subsystem):
             "For instance, `--streaming-workunits-handlers=\"['pants.reporting.workunit.Workunits']\"` will "
             'register a Subsystem called Workunits defined in the module "pants.reporting.workunit".',
         )
+        register(
+            "--streaming-workunits-queue-size",
+            type=int,
+            default=0,
+            advanced=True,
+            help="If positive, each streaming workunit handler is called on its own thread, which "
+            "consumes a queue of at most this many batches of workunits. A slow handler then "
+            "cannot delay the others. If 0, all handlers are called in turn on the polling thread.",
+        )
+        register(
+            "--streaming-workunits-overflow",
+            type=StreamingWorkunitsOverflowBehavior,
+            default=StreamingWorkunitsOverflowBehavior.drop_oldest,
+            advanced=True,
+            help="What to do when a handler's queue of workunit batches (see "
+            "`--streaming-workunits-queue-size`) is full. Dropped batches are recorded in the run's "
+            "stats. The final batch of a run is never dropped.",
+        )
 
     @classmethod
     def validate_instance(cls, opts):
@@ -14,6 +14,7 @@ from pants.base.build_environment import get_buildroot
 from pants.base.exception_sink import ExceptionSink
 from pants.bin.daemon_pants_runner import DaemonPantsRunner
 from pants.engine.internals.native import Native
+from pants.goal.stats_spool import stats_spool_dir
 from pants.init.engine_initializer import LegacyGraphScheduler
 from pants.init.logging import clear_logging_handlers, init_rust_logger, setup_logging_to_file
 from pants.init.options_initializer import OptionsInitializer
@@ -24,6 +25,7 @@ from pants.pantsd.pants_daemon_core import PantsDaemonCore
 from pants.pantsd.process_manager import PantsDaemonProcessManager
 from pants.pantsd.service.pants_service import PantsServices
 from pants.pantsd.service.scheduler_service import SchedulerService
+from pants.pantsd.service.stats_upload_service import StatsUploadService
 from pants.pantsd.service.store_gc_service import StoreGCService
 from pants.util.contextutil import stdio_as
 from pants.util.logging import LogLevel
@@ -130,11 +132,13 @@ class PantsDaemon(PantsDaemonProcessManager):
         invalidation_globs = OptionsInitializer.compute_pantsd_invalidation_globs(
             build_root, bootstrap_options,
         )
+        reloadable_globs = OptionsInitializer.compute_pantsd_reloadable_globs(bootstrap_options)
 
         scheduler_service = SchedulerService(
             legacy_graph_scheduler=legacy_graph_scheduler,
             build_root=build_root,
             invalidation_globs=invalidation_globs,
+            reloadable_globs=reloadable_globs,
             pidfile=PantsDaemon.metadata_file_path(
                 "pantsd", "pid", bootstrap_options.pants_subprocessdir
             ),
@@ -143,7 +147,8 @@ class PantsDaemon(PantsDaemonProcessManager):
         )
 
         store_gc_service = StoreGCService(legacy_graph_scheduler.scheduler)
-        return PantsServices(services=(scheduler_service, store_gc_service))
+        stats_upload_service = StatsUploadService(stats_spool_dir(bootstrap_options.pants_workdir))
+        return PantsServices(services=(scheduler_service, store_gc_service, stats_upload_service))
 
     def __init__(
         self,
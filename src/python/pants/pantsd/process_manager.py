@@ -19,6 +19,7 @@ from pants.base.build_environment import get_buildroot
 from pants.option.options import Options
 from pants.option.options_fingerprinter import OptionsFingerprinter
 from pants.option.scope import GLOBAL_SCOPE
+from pants.pantsd.watchers import PathWaiter, SleepWaiter, Waiter, process_waiter
 from pants.process.lock import OwnerPrintingInterProcessFileLock
 from pants.process.subprocess import Subprocess
 from pants.util.dirutil import read_file, rm_rf, safe_file_dump, safe_mkdir
@@ -123,6 +124,7 @@ class ProcessMetadataManager:
         timeout: float = FAIL_WAIT_SEC,
         wait_interval: float = WAIT_INTERVAL_SEC,
         info_interval: float = INFO_INTERVAL_SEC,
+        waiter: Optional[Waiter] = None,
     ):
         """Execute a function/closure repeatedly until a True condition or timeout is met.
 
@@ -136,9 +138,12 @@ class ProcessMetadataManager:
         :param float timeout: the maximum amount of time to wait for a true result from the closure in
                               seconds. N.B. this is timing based, so won't be exact if the runtime of
                               the closure exceeds the timeout.
-        :param float wait_interval: the amount of time to sleep between closure invocations.
+        :param float wait_interval: the maximum amount of time to wait between closure invocations.
         :param float info_interval: the amount of time to wait before and between reports via info
                                     logging that we're still waiting for the closure to succeed.
+        :param Waiter waiter: if provided, used to wait (for at most `wait_interval`) for an event
+                              that might cause the closure to succeed, rather than sleeping for the
+                              full `wait_interval` between invocations.
         :raises: :class:`ProcessManager.Timeout` on execution timeout.
         """
         now = time.time()
@@ -164,7 +169,11 @@ class ProcessMetadataManager:
                 rendered_ongoing = True
                 info_deadline = info_deadline + info_interval
             elif wait_interval:
-                time.sleep(wait_interval)
+                wait_time = min(wait_interval, max(deadline - now, 0))
+                if waiter:
+                    waiter.wait(wait_time)
+                else:
+                    time.sleep(wait_time)
 
     @classmethod
     def _wait_for_file(
@@ -176,12 +185,18 @@ class ProcessMetadataManager:
         want_content: bool = True,
     ):
         """Wait up to timeout seconds for filename to appear with a non-zero size or raise
-        Timeout()."""
+        Timeout().
+
+        Rather than polling at a fixed interval, this wakes on changes to the file's directory.
+        """
 
         def file_waiter():
             return os.path.exists(filename) and (not want_content or os.path.getsize(filename))
 
-        return cls._deadline_until(file_waiter, ongoing_msg, completed_msg, timeout=timeout)
+        with PathWaiter(filename) as waiter:
+            return cls._deadline_until(
+                file_waiter, ongoing_msg, completed_msg, timeout=timeout, waiter=waiter
+            )
 
     @staticmethod
     def _get_metadata_dir_by_name(name, metadata_base_dir):
@@ -500,12 +515,15 @@ class ProcessManager(ProcessMetadataManager):
 
                 # Wait up to kill_wait seconds to terminate or move onto the next signal.
                 try:
-                    if self._deadline_until(
-                        self.is_dead,
-                        f"{self._name} to exit",
-                        f"{self._name} exited",
-                        timeout=kill_wait,
-                    ):
+                    with process_waiter(pid) if pid else SleepWaiter() as waiter:
+                        dead = self._deadline_until(
+                            self.is_dead,
+                            f"{self._name} to exit",
+                            f"{self._name} exited",
+                            timeout=kill_wait,
+                            waiter=waiter,
+                        )
+                    if dead:
                         alive = False
                         logger.debug("successfully terminated pid {}".format(pid))
                         break
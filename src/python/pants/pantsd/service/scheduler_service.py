@@ -3,7 +3,7 @@
 
 import logging
 import time
-from typing import List, Optional, Tuple, cast
+from typing import List, Optional, Sequence, Tuple, cast
 
 import psutil
 
@@ -36,6 +36,7 @@ class SchedulerService(PantsService):
         pidfile: str,
         pid: int,
         max_memory_usage_in_bytes: int,
+        reloadable_globs: Sequence[str] = (),
     ) -> None:
         """
         :param legacy_graph_scheduler: The LegacyGraphScheduler instance for graph construction.
@@ -47,6 +48,9 @@ class SchedulerService(PantsService):
         :param pid: This processes' pid.
         :param max_memory_usage_in_bytes: The maximum memory usage of the process: the service will
                                           shut down if it observes more than this amount in use.
+        :param reloadable_globs: A list of `globs` which may overlap the `invalidation_globs`, but
+                                 which are invalidated by the engine itself, and so should not
+                                 tear down the daemon.
         """
         super().__init__()
         self._graph_helper = legacy_graph_scheduler
@@ -60,7 +64,7 @@ class SchedulerService(PantsService):
 
         # NB: We declare these as a single field so that they can be changed atomically.
         self._invalidation_globs_and_snapshot: Tuple[Tuple[str, ...], Optional[Snapshot]] = (
-            tuple(invalidation_globs),
+            (*invalidation_globs, *(f"!{glob}" for glob in reloadable_globs)),
             None,
         )
 
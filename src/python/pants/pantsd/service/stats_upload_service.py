@@ -0,0 +1,42 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import logging
+
+from pants.goal.stats_spool import StatsSpool, in_process_sender
+from pants.pantsd.service.pants_service import PantsService
+
+logger = logging.getLogger(__name__)
+
+
+class StatsUploadService(PantsService):
+    """Stats Upload Service.
+
+    This service uploads the stats that runs have spooled (see `pants.goal.stats_spool`), so that
+    runs in pantsd do not need to launch a detached sender, or wait for uploads to complete.
+    """
+
+    def __init__(self, spool_dir: str, period_secs: float = 1.0) -> None:
+        super().__init__()
+        self._spool = StatsSpool(spool_dir)
+        self._period_secs = period_secs
+
+    def _maybe_send(self) -> None:
+        try:
+            with self._spool.sender_lock() as acquired:
+                # If another sender (such as a detached process launched before pantsd started)
+                # holds the lock, it will drain the spool.
+                if acquired:
+                    self._spool.send_pending()
+        except Exception as e:
+            logger.warning(f"Failed to upload spooled stats: {e!r}")
+
+    def run(self):
+        """Main service entrypoint.
+
+        Called via Thread.start() via PantsDaemon.run().
+        """
+        with in_process_sender():
+            while not self._state.is_terminating:
+                self._maybe_send()
+                self._state.maybe_pause(timeout=self._period_secs)
@@ -0,0 +1,52 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import threading
+import time
+
+from pants.goal import stats_spool
+from pants.goal.stats_spool import StatsSpool
+from pants.goal.stats_spool_test import StatsHandler, entry, reset_handler
+from pants.pantsd.service.stats_upload_service import StatsUploadService
+from pants.util.contextutil import http_server, temporary_dir
+
+
+def wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_run() -> None:
+    reset_handler()
+    with temporary_dir() as spool_dir, http_server(StatsHandler) as port:
+        spool = StatsSpool(spool_dir)
+        service = StatsUploadService(spool_dir, period_secs=0.01)
+        service.setup(services=None)
+        thread = threading.Thread(target=service.run, name="stats-upload")
+        thread.daemon = True
+        thread.start()
+        try:
+            # While the service runs, runs in this process do not launch detached senders.
+            assert wait_for(lambda: stats_spool._in_process_senders == 1)
+
+            spool.add(entry(port, 0))
+            assert wait_for(lambda: not spool.pending())
+            assert StatsHandler.received == [{"builds": [{"run_info": {"id": 0}}]}]
+
+            # If another sender holds the lock, the service leaves the spool to it.
+            with spool.sender_lock() as acquired:
+                assert acquired
+                spool.add(entry(port, 1))
+                time.sleep(0.1)
+                assert [e for _, e in spool.pending()] == [entry(port, 1)]
+            assert wait_for(lambda: not spool.pending())
+            assert len(StatsHandler.received) == 2
+        finally:
+            service.terminate()
+            thread.join(timeout=10)
+        assert not thread.is_alive()
+        assert stats_spool._in_process_senders == 0
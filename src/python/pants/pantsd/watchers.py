@@ -0,0 +1,236 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Event-driven waits on directories and processes, used to avoid fixed-interval polling.
+
+A `Waiter` blocks until an event that _may_ satisfy the caller has occurred, or until a timeout
+elapses. Callers must always re-check their condition after waking. Where no event mechanism is
+available on the current platform, waiters degrade to sleeping for the timeout.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Waiter(ABC):
+    """Blocks until an event of interest may have occurred."""
+
+    @abstractmethod
+    def wait(self, timeout: float) -> None:
+        """Block for up to `timeout` seconds, returning early if an event may have occurred."""
+
+    def close(self) -> None:
+        """Release any resources held by this Waiter."""
+
+    def __enter__(self) -> "Waiter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SleepWaiter(Waiter):
+    """A Waiter that is not aware of any events, and so always sleeps for the full timeout."""
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(timeout)
+
+
+class _FdWaiter(Waiter):
+    """Waits for a file descriptor to become readable, and then drains it."""
+
+    def __init__(self, fd: int) -> None:
+        self._fd: Optional[int] = fd
+
+    def _drain(self) -> None:
+        pass
+
+    def wait(self, timeout: float) -> None:
+        if self._fd is None:
+            return
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            self._drain()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class _InotifyDirectoryWaiter(_FdWaiter):
+    """Wakes on the creation, modification, or removal of entries in a directory (Linux)."""
+
+    # See `man 7 inotify`.
+    _IN_MODIFY = 0x002
+    _IN_ATTRIB = 0x004
+    _IN_CLOSE_WRITE = 0x008
+    _IN_MOVED_FROM = 0x040
+    _IN_MOVED_TO = 0x080
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _IN_DELETE_SELF = 0x400
+    _IN_MOVE_SELF = 0x800
+    _MASK = (
+        _IN_MODIFY
+        | _IN_ATTRIB
+        | _IN_CLOSE_WRITE
+        | _IN_MOVED_FROM
+        | _IN_MOVED_TO
+        | _IN_CREATE
+        | _IN_DELETE
+        | _IN_DELETE_SELF
+        | _IN_MOVE_SELF
+    )
+
+    _libc = None
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            cls._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        return cls._libc
+
+    def __init__(self, directory: str) -> None:
+        libc = self._load_libc()
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        if libc.inotify_add_watch(fd, os.fsencode(directory), self._MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, os.strerror(errno), directory)
+        super().__init__(fd)
+
+    def _drain(self) -> None:
+        try:
+            while os.read(self._fd, 64 * 1024):  # type: ignore[arg-type]
+                pass
+        except BlockingIOError:
+            pass
+
+
+class _KqueueWaiter(Waiter):
+    """Wakes on a single registered kqueue event (macOS/BSD)."""
+
+    def __init__(self, kevent, fd_to_close: Optional[int] = None) -> None:
+        self._kq = select.kqueue()  # type: ignore[attr-defined]
+        self._fd_to_close = fd_to_close
+        try:
+            self._kq.control([kevent], 0, 0)
+        except BaseException:
+            self.close()
+            raise
+
+    def wait(self, timeout: float) -> None:
+        self._kq.control(None, 1, timeout)
+
+    def close(self) -> None:
+        self._kq.close()
+        if self._fd_to_close is not None:
+            os.close(self._fd_to_close)
+            self._fd_to_close = None
+
+
+def directory_waiter(directory: str) -> Waiter:
+    """Returns a Waiter that wakes when the entries of the given directory may have changed."""
+    try:
+        if sys.platform.startswith("linux"):
+            return _InotifyDirectoryWaiter(directory)
+        if hasattr(select, "kqueue"):
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                kevent = select.kevent(  # type: ignore[attr-defined]
+                    fd,
+                    filter=select.KQ_FILTER_VNODE,  # type: ignore[attr-defined]
+                    flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,  # type: ignore[attr-defined]
+                    fflags=(
+                        select.KQ_NOTE_WRITE  # type: ignore[attr-defined]
+                        | select.KQ_NOTE_EXTEND  # type: ignore[attr-defined]
+                        | select.KQ_NOTE_ATTRIB  # type: ignore[attr-defined]
+                        | select.KQ_NOTE_DELETE  # type: ignore[attr-defined]
+                        | select.KQ_NOTE_RENAME  # type: ignore[attr-defined]
+                    ),
+                )
+                return _KqueueWaiter(kevent, fd_to_close=fd)
+            except BaseException:
+                os.close(fd)
+                raise
+    except (AttributeError, OSError) as e:
+        logger.debug(f"Falling back to polling for changes to {directory}: {e!r}")
+    return SleepWaiter()
+
+
+class _ExitedWaiter(Waiter):
+    """A Waiter for a process that has already exited: never blocks."""
+
+    def wait(self, timeout: float) -> None:
+        pass
+
+
+def process_waiter(pid: int) -> Waiter:
+    """Returns a Waiter that wakes when the given process may have exited."""
+    try:
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is not None:
+            return _FdWaiter(pidfd_open(pid))
+        if hasattr(select, "kqueue"):
+            kevent = select.kevent(  # type: ignore[attr-defined]
+                pid,
+                filter=select.KQ_FILTER_PROC,  # type: ignore[attr-defined]
+                flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,  # type: ignore[attr-defined]
+                fflags=select.KQ_NOTE_EXIT,  # type: ignore[attr-defined]
+            )
+            return _KqueueWaiter(kevent)
+    except ProcessLookupError:
+        return _ExitedWaiter()
+    except OSError as e:
+        logger.debug(f"Falling back to polling for the exit of pid {pid}: {e!r}")
+    return SleepWaiter()
+
+
+class PathWaiter(Waiter):
+    """Wakes when the given path may have been created or changed.
+
+    Watches the nearest existing ancestor directory of the path, and re-targets the watch as
+    intermediate directories are created or removed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._directory = os.path.dirname(os.path.abspath(path))
+        self._watched_directory: Optional[str] = None
+        self._waiter: Waiter = SleepWaiter()
+
+    def _nearest_existing_directory(self) -> str:
+        directory = self._directory
+        while not os.path.isdir(directory):
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+        return directory
+
+    def wait(self, timeout: float) -> None:
+        directory = self._nearest_existing_directory()
+        if directory != self._watched_directory:
+            # NB: Return without waiting after (re-)installing a watch, because the event we are
+            # waiting for might have occurred between the caller's check and the watch being
+            # installed.
+            self._waiter.close()
+            self._waiter = directory_waiter(directory)
+            self._watched_directory = directory
+            return
+        self._waiter.wait(timeout)
+
+    def close(self) -> None:
+        self._waiter.close()
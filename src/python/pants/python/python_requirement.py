@@ -53,6 +53,7 @@ class PythonRequirement:
         self._name = name or self._requirement.project_name
         self._use_2to3 = use_2to3
         self.compatibility = compatibility or [""]
+        self._has_explicit_modules = bool(modules)
         self._modules = (
             tuple(modules)
             if modules
@@ -89,6 +90,14 @@ class PythonRequirement:
         """
         return self._modules
 
+    @property
+    def has_explicit_modules(self) -> bool:
+        """Whether `modules` was explicitly specified, rather than defaulted from the project name.
+
+        :API: public
+        """
+        return self._has_explicit_modules
+
     # duck-typing Requirement interface for Resolver, since Requirement cannot be
     # subclassed (curses!)
     @property
@@ -299,6 +299,10 @@ class PythonSetup(Subsystem):
 
 
 def get_pyenv_root():
+    # NB: `pyenv root` prints $PYENV_ROOT if it is set, so we can avoid running it.
+    pyenv_root = os.environ.get("PYENV_ROOT")
+    if pyenv_root:
+        return pyenv_root
     try:
         return subprocess.check_output(["pyenv", "root"]).decode().strip()
     except (OSError, subprocess.CalledProcessError):
@@ -4,7 +4,7 @@
 import os
 from contextlib import contextmanager
 
-from pants.python.python_setup import PythonSetup
+from pants.python.python_setup import PythonSetup, get_pyenv_root
 from pants.testutil.pexrc_util import setup_pexrc_with_pex_python_path
 from pants.testutil.test_base import TestBase
 from pants.util.contextutil import environment_as, temporary_dir
@@ -47,6 +47,10 @@ class TestPythonSetup(TestBase):
         assert expected_paths == paths
         assert expected_local_paths == local_paths
 
+    def test_get_pyenv_root_from_env(self):
+        with environment_as(PYENV_ROOT="/fake/pyenv"):
+            assert "/fake/pyenv" == get_pyenv_root()
+
     def test_expand_interpreter_search_paths(self):
         local_pyenv_version = "3.5.5"
         all_pyenv_versions = ["2.7.14", local_pyenv_version]
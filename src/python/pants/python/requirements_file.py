@@ -0,0 +1,111 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from pkg_resources import Requirement, parse_requirements
+
+from pants.util.frozendict import FrozenDict
+from pants.util.memo import memoized_property
+
+
+@dataclass(frozen=True)
+class ParsedRequirementsFile:
+    """The requirements and `--find-links` flags of a pip requirements file.
+
+    Other flags are ignored.
+    """
+
+    requirements: Tuple[Requirement, ...]
+    find_links: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ConstrainedRequirements:
+    """The constraints which pin a set of requirements, and the projects of any requirements which
+    are not constrained."""
+
+    pinned: Tuple[Requirement, ...]
+    unconstrained_projects: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RequirementConstraints:
+    """The requirements of a constraints file, in order, and indexed by the key (i.e. the
+    normalized project name) of each requirement.
+
+    A key may have multiple requirements, such as pins for different environments which are
+    distinguished by environment markers.
+    """
+
+    requirements: Tuple[Requirement, ...]
+    by_key: FrozenDict[str, Tuple[Requirement, ...]]
+
+    @classmethod
+    def create(cls, requirements: Iterable[Requirement]) -> "RequirementConstraints":
+        requirements = tuple(requirements)
+        by_key: Dict[str, List[Requirement]] = defaultdict(list)
+        for req in requirements:
+            by_key[req.key].append(req)
+        return cls(requirements, FrozenDict((key, tuple(reqs)) for key, reqs in by_key.items()))
+
+    @memoized_property
+    def requirement_strings(self) -> Tuple[str, ...]:
+        return tuple(str(req) for req in self.requirements)
+
+    def for_requirements(self, requirements: Iterable[Requirement]) -> ConstrainedRequirements:
+        """Looks up the constraints for the given requirements, without scanning the constraints.
+
+        Every pin of a constrained project is included, in the order the projects are first
+        required.
+
+        NB: A constraints file does not record the dependencies between its requirements, so the
+        constraints of the transitive dependencies of the requirements are not included.
+        """
+        pinned: Dict[str, Tuple[Requirement, ...]] = {}
+        unconstrained_projects = set()
+        for req in requirements:
+            constraints = self.by_key.get(req.key)
+            if constraints is None:
+                unconstrained_projects.add(req.project_name)
+            else:
+                pinned.setdefault(req.key, constraints)
+        return ConstrainedRequirements(
+            pinned=tuple(itertools.chain.from_iterable(pinned.values())),
+            unconstrained_projects=tuple(sorted(unconstrained_projects)),
+        )
+
+
+def parse_requirements_file(content: bytes) -> ParsedRequirementsFile:
+    """Parses the content of a pip requirements file.
+
+    See the requirements file spec here:
+    https://pip.pypa.io/en/latest/reference/pip_install.html#requirements-file-format
+    """
+    requirement_lines = []
+    find_links = []
+    for line in content.decode().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if not line.startswith("-"):
+            requirement_lines.append(line)
+            continue
+        # Handle the flags we know about.
+        flag_value = line.split(" ", 1)
+        if len(flag_value) == 2:
+            flag = flag_value[0].strip()
+            value = flag_value[1].strip()
+            if flag in ("-f", "--find-links"):
+                find_links.append(value)
+    return ParsedRequirementsFile(
+        requirements=tuple(parse_requirements(requirement_lines)), find_links=tuple(find_links)
+    )
+
+
+def parse_constraints_file(content: bytes) -> RequirementConstraints:
+    """Parses and indexes the content of a constraints file."""
+    return RequirementConstraints.create(parse_requirements_file(content).requirements)
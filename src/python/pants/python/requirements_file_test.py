@@ -0,0 +1,69 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from textwrap import dedent
+
+from pkg_resources import Requirement
+
+from pants.python.requirements_file import (
+    ConstrainedRequirements,
+    parse_constraints_file,
+    parse_requirements_file,
+)
+
+
+def test_parse_requirements_file() -> None:
+    content = dedent(
+        """\
+        # A comment.
+        ansicolors>=1.18.0
+        Django==3.1.0  # An inline comment.
+
+        -f https://example.com/wheels
+        --index-url https://example.com/simple
+        setuptools
+        """
+    ).encode()
+    parsed = parse_requirements_file(content)
+    assert parsed.requirements == (
+        Requirement.parse("ansicolors>=1.18.0"),
+        Requirement.parse("Django==3.1.0"),
+        Requirement.parse("setuptools"),
+    )
+    assert parsed.find_links == ("https://example.com/wheels",)
+
+
+def test_constraints_file() -> None:
+    constraints = parse_constraints_file(b"Django==3.1.0\nansicolors==1.1.8\nqux==3.4.5\n")
+    assert constraints.requirement_strings == ("Django==3.1.0", "ansicolors==1.1.8", "qux==3.4.5")
+
+    # Requirements are matched to constraints by their normalized project names.
+    assert constraints.for_requirements(
+        Requirement.parse(req) for req in ("django>=3", "ansicolors", "Foo_Bar", "Django")
+    ) == ConstrainedRequirements(
+        pinned=(Requirement.parse("Django==3.1.0"), Requirement.parse("ansicolors==1.1.8")),
+        unconstrained_projects=("Foo-Bar",),
+    )
+
+
+def test_constraints_file_environment_markers() -> None:
+    content = dedent(
+        """        foo==1.0; python_version < "3"
+        bar==3.0
+        foo==2.0; python_version >= "3"
+        """
+    ).encode()
+    constraints = parse_constraints_file(content)
+    # All pins are retained, in order, even when they share a project.
+    assert constraints.requirement_strings == (
+        'foo==1.0; python_version < "3"',
+        "bar==3.0",
+        'foo==2.0; python_version >= "3"',
+    )
+    assert constraints.by_key["foo"] == (
+        Requirement.parse('foo==1.0; python_version < "3"'),
+        Requirement.parse('foo==2.0; python_version >= "3"'),
+    )
+    assert constraints.for_requirements([Requirement.parse("foo")]) == ConstrainedRequirements(
+        pinned=constraints.by_key["foo"], unconstrained_projects=()
+    )
@@ -1,15 +1,21 @@
 # Copyright 2019 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import logging
 import threading
+import time
+from collections import deque
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 
 from pants.engine.fs import Digest
 from pants.engine.internals.scheduler import SchedulerSession
+from pants.option.global_options import StreamingWorkunitsOverflowBehavior
 from pants.util.logging import LogLevel
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class StreamingWorkunitContext:
@@ -32,6 +38,15 @@ class StreamingWorkunitHandler:
 
     workunits: Tuple[Dict[str, str], ...] - the workunit data itself
     finished: bool - this will be set to True when the last chunk of workunit data is reported to the callback
+
+    If `queue_size` is positive, each callback is called on its own thread, which consumes a queue
+    of at most `queue_size` batches of workunits, so that a slow callback cannot delay the others.
+    When a queue is full, the `overflow` behavior applies, and dropped batches are counted in
+    `metrics()`.
+
+    `internal_callbacks` are called with every batch of workunits on the polling thread, regardless
+    of `queue_size` and `overflow`: they are for consumers within Pants (such as the RunTracker)
+    whose results would be silently incomplete if a batch were dropped.
     """
 
     def __init__(
@@ -40,21 +55,47 @@ class StreamingWorkunitHandler:
         callbacks: Iterable[Callable],
         report_interval_seconds: float,
         max_workunit_verbosity: LogLevel = LogLevel.DEBUG,
+        queue_size: int = 0,
+        overflow: Optional[StreamingWorkunitsOverflowBehavior] = None,
+        internal_callbacks: Iterable[Callable] = (),
     ):
         self.scheduler = scheduler
         self.report_interval = report_interval_seconds
         self.callbacks = callbacks
+        self.internal_callbacks = tuple(internal_callbacks)
         self._thread_runner: Optional[_InnerHandler] = None
         self._context = StreamingWorkunitContext(_scheduler=self.scheduler)
         # TODO(10092) The max verbosity should be a per-client setting, rather than a global setting.
         self.max_workunit_verbosity = max_workunit_verbosity
+        self._queue_size = queue_size
+        self._overflow = overflow or StreamingWorkunitsOverflowBehavior.drop_oldest
+        self._dispatchers: Tuple[_CallbackDispatcher, ...] = ()
+
+    def _deliver(self, finished: bool, **kwargs: Any) -> None:
+        for callback in self.internal_callbacks:
+            callback(finished=finished, context=self._context, **kwargs)
+        if self._dispatchers:
+            batch = _Batch(kwargs=kwargs, finished=finished, polled_at=time.time())
+            for dispatcher in self._dispatchers:
+                dispatcher.offer(batch)
+        else:
+            for callback in self.callbacks:
+                callback(finished=finished, context=self._context, **kwargs)
 
     def start(self) -> None:
-        if self.callbacks:
+        if self.callbacks or self.internal_callbacks:
+            if self.callbacks and self._queue_size > 0:
+                self._dispatchers = tuple(
+                    _CallbackDispatcher(
+                        callback, name, self._context, self._queue_size, self._overflow
+                    )
+                    for callback, name in _unique_names(self.callbacks)
+                )
+                for dispatcher in self._dispatchers:
+                    dispatcher.start()
             self._thread_runner = _InnerHandler(
                 scheduler=self.scheduler,
-                context=self._context,
-                callbacks=self.callbacks,
+                deliver=self._deliver,
                 report_interval=self.report_interval,
                 max_workunit_verbosity=self.max_workunit_verbosity,
             )
@@ -67,14 +108,19 @@ class StreamingWorkunitHandler:
         # After stopping the thread, poll workunits one last time to make sure
         # we report any workunits that were added after the last time the thread polled.
         workunits = self.scheduler.poll_workunits(self.max_workunit_verbosity)
-        for callback in self.callbacks:
-            callback(
-                workunits=workunits["completed"],
-                started_workunits=workunits["started"],
-                completed_workunits=workunits["completed"],
-                finished=True,
-                context=self._context,
-            )
+        self._deliver(
+            workunits=workunits["completed"],
+            started_workunits=workunits["started"],
+            completed_workunits=workunits["completed"],
+            finished=True,
+        )
+        # NB: The final batch is delivered to every dispatcher, which then exits.
+        for dispatcher in self._dispatchers:
+            dispatcher.join()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Returns delivery metrics for each callback, if they are called on their own threads."""
+        return {dispatcher.callback_name: dispatcher.metrics() for dispatcher in self._dispatchers}
 
     @contextmanager
     def session(self) -> Iterator[None]:
@@ -85,36 +131,146 @@ class StreamingWorkunitHandler:
         except Exception as e:
             if self._thread_runner:
                 self._thread_runner.join()
+            for dispatcher in self._dispatchers:
+                dispatcher.abandon()
             raise e
 
 
+def _unique_names(callbacks: Iterable[Callable]) -> Iterator[Tuple[Callable, str]]:
+    seen: Dict[str, int] = {}
+    for callback in callbacks:
+        name = getattr(callback, "__qualname__", None) or type(callback).__qualname__
+        count = seen[name] = seen.get(name, 0) + 1
+        yield callback, (name if count == 1 else f"{name}#{count}")
+
+
+@dataclass(frozen=True)
+class _Batch:
+    kwargs: Dict[str, Any]
+    finished: bool
+    polled_at: float
+
+    @property
+    def num_workunits(self) -> int:
+        return len(self.kwargs["started_workunits"]) + len(self.kwargs["completed_workunits"])
+
+
+class _CallbackDispatcher(threading.Thread):
+    """Calls one callback with the batches of workunits in its bounded queue."""
+
+    def __init__(
+        self,
+        callback: Callable,
+        name: str,
+        context: StreamingWorkunitContext,
+        queue_size: int,
+        overflow: StreamingWorkunitsOverflowBehavior,
+    ):
+        super().__init__(name=f"workunits-{name}", daemon=True)
+        self.callback_name = name
+        self._callback = callback
+        self._context = context
+        self._queue_size = queue_size
+        self._overflow = overflow
+        self._queue: Deque[_Batch] = deque()
+        self._condition = threading.Condition()
+        self._abandoned = False
+
+        self._delivered_batches = 0
+        self._dropped_batches = 0
+        self._dropped_workunits = 0
+        self._max_queue_depth = 0
+        self._max_lag_seconds = 0.0
+        self._total_lag_seconds = 0.0
+        self._failures = 0
+
+    def _drop(self, batch: _Batch) -> None:
+        self._dropped_batches += 1
+        self._dropped_workunits += batch.num_workunits
+
+    def offer(self, batch: _Batch) -> None:
+        with self._condition:
+            while len(self._queue) >= self._queue_size and not self._abandoned:
+                if self._overflow == StreamingWorkunitsOverflowBehavior.block:
+                    self._condition.wait()
+                elif self._overflow == StreamingWorkunitsOverflowBehavior.drop_newest and not (
+                    batch.finished
+                ):
+                    self._drop(batch)
+                    return
+                else:
+                    # NB: The final batch is never dropped, so drop_newest falls back to making
+                    # room for it.
+                    self._drop(self._queue.popleft())
+            self._queue.append(batch)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            self._condition.notify_all()
+
+    def abandon(self) -> None:
+        """Stops delivering batches, without waiting for the queue to drain."""
+        with self._condition:
+            self._abandoned = True
+            self._queue.clear()
+            self._condition.notify_all()
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._abandoned:
+                    self._condition.wait()
+                if self._abandoned:
+                    return
+                batch = self._queue.popleft()
+                self._condition.notify_all()
+
+            lag = time.time() - batch.polled_at
+            self._max_lag_seconds = max(self._max_lag_seconds, lag)
+            self._total_lag_seconds += lag
+            try:
+                self._callback(finished=batch.finished, context=self._context, **batch.kwargs)
+            except Exception as e:
+                self._failures += 1
+                logger.warning(f"Streaming workunit handler {self.callback_name} failed: {e!r}")
+            self._delivered_batches += 1
+            if batch.finished:
+                return
+
+    def metrics(self) -> Dict[str, float]:
+        delivered = self._delivered_batches
+        return {
+            "delivered_batches": delivered,
+            "dropped_batches": self._dropped_batches,
+            "dropped_workunits": self._dropped_workunits,
+            "failed_batches": self._failures,
+            "max_queue_depth": self._max_queue_depth,
+            "max_lag_seconds": self._max_lag_seconds,
+            "mean_lag_seconds": self._total_lag_seconds / delivered if delivered else 0.0,
+        }
+
+
 class _InnerHandler(threading.Thread):
     def __init__(
         self,
         scheduler: Any,
-        context: StreamingWorkunitContext,
-        callbacks: Iterable[Callable],
+        deliver: Callable[..., None],
         report_interval: float,
         max_workunit_verbosity: LogLevel,
     ):
         super().__init__(daemon=True)
         self.scheduler = scheduler
-        self._context = context
+        self._deliver = deliver
         self.stop_request = threading.Event()
         self.report_interval = report_interval
-        self.callbacks = callbacks
         self.max_workunit_verbosity = max_workunit_verbosity
 
     def run(self):
         while not self.stop_request.isSet():
             workunits = self.scheduler.poll_workunits(self.max_workunit_verbosity)
-            for callback in self.callbacks:
-                callback(
-                    started_workunits=workunits["started"],
-                    completed_workunits=workunits["completed"],
-                    finished=False,
-                    context=self._context,
-                )
+            self._deliver(
+                started_workunits=workunits["started"],
+                completed_workunits=workunits["completed"],
+                finished=False,
+            )
             self.stop_request.wait(timeout=self.report_interval)
 
     def join(self, timeout=None):
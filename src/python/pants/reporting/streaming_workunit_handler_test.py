@@ -0,0 +1,117 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from pants.option.global_options import StreamingWorkunitsOverflowBehavior
+from pants.reporting.streaming_workunit_handler import StreamingWorkunitHandler
+from pants.util.logging import LogLevel
+
+
+class FakeScheduler:
+    """Returns one completed workunit per poll."""
+
+    def __init__(self) -> None:
+        self._polls = 0
+
+    def poll_workunits(self, max_log_verbosity: LogLevel) -> Dict[str, Any]:
+        self._polls += 1
+        return {"started": (), "completed": ({"name": f"poll-{self._polls}"},)}
+
+
+class Recorder:
+    def __init__(self, release: Optional[threading.Event] = None) -> None:
+        self.completed: List[str] = []
+        self.finished = False
+        self.called = threading.Event()
+        self._release = release
+
+    def record(self, *, completed_workunits, finished, **kwargs) -> None:
+        self.called.set()
+        if self._release:
+            self._release.wait()
+        self.completed.extend(w["name"] for w in completed_workunits)
+        self.finished = self.finished or finished
+
+
+def run_with_slow_callback(
+    overflow: StreamingWorkunitsOverflowBehavior, internal: Optional[Recorder] = None
+):
+    release = threading.Event()
+    slow = Recorder(release)
+    fast = Recorder()
+    handler = StreamingWorkunitHandler(
+        FakeScheduler(),
+        callbacks=[slow.record, fast.record],
+        report_interval_seconds=0.001,
+        queue_size=2,
+        overflow=overflow,
+        internal_callbacks=[internal.record] if internal else [],
+    )
+    handler.start()
+    slow.called.wait()
+    # The fast callback continues to receive batches while the slow callback is blocked.
+    while len(fast.completed) < 10:
+        fast.called.wait(0.01)
+    release.set()
+    handler.end()
+    return slow, fast, handler.metrics()
+
+
+def test_drop_oldest() -> None:
+    slow, fast, metrics = run_with_slow_callback(StreamingWorkunitsOverflowBehavior.drop_oldest)
+    assert slow.finished and fast.finished
+    # The final batch is always delivered.
+    assert slow.completed[-1] == fast.completed[-1]
+    assert len(slow.completed) < len(fast.completed)
+    assert metrics["Recorder.record"]["dropped_batches"] > 0
+    assert metrics["Recorder.record"]["max_queue_depth"] == 2
+    assert metrics["Recorder.record#2"]["dropped_batches"] == 0
+
+
+def test_drop_newest() -> None:
+    slow, fast, metrics = run_with_slow_callback(StreamingWorkunitsOverflowBehavior.drop_newest)
+    # The slow callback receives the batches that were queued while it was blocked, and the final
+    # batch.
+    assert slow.completed[:3] == ["poll-1", "poll-2", "poll-3"]
+    assert slow.completed[-1] == fast.completed[-1]
+    assert metrics["Recorder.record"]["dropped_batches"] > 0
+
+
+def test_inline() -> None:
+    recorder = Recorder()
+    handler = StreamingWorkunitHandler(
+        FakeScheduler(), callbacks=[recorder.record], report_interval_seconds=0.001
+    )
+    with handler.session():
+        pass
+    assert recorder.finished
+    assert handler.metrics() == {}
+
+
+def test_internal_callbacks_receive_every_batch() -> None:
+    internal = Recorder()
+    _, _, metrics = run_with_slow_callback(
+        StreamingWorkunitsOverflowBehavior.drop_oldest, internal=internal
+    )
+    assert metrics["Recorder.record"]["dropped_batches"] > 0
+    # Internal callbacks are not subject to the overflow behavior, and are not reported as queues.
+    assert internal.finished
+    assert internal.completed == [f"poll-{i}" for i in range(1, len(internal.completed) + 1)]
+    assert len(metrics) == 2
+
+
+def test_internal_callbacks_only() -> None:
+    internal = Recorder()
+    handler = StreamingWorkunitHandler(
+        FakeScheduler(),
+        callbacks=[],
+        report_interval_seconds=0.001,
+        queue_size=2,
+        internal_callbacks=[internal.record],
+    )
+    with handler.session():
+        pass
+    assert internal.finished
+    assert handler.metrics() == {}
@@ -0,0 +1,414 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Profiles of v2 engine runs, built from the workunits reported by `StreamingWorkunitHandler`.
+
+A profile can be rendered as a Chrome Trace Event file (loadable in `chrome://tracing` or
+https://ui.perfetto.dev), as folded stacks (the input format of `flamegraph.pl` and speedscope),
+or as per-rule aggregates of counts and self time.
+"""
+
+import json
+import logging
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from pants.base.build_environment import get_buildroot
+from pants.option.subsystem import Subsystem
+from pants.util.dirutil import safe_file_dump
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RuleProfile:
+    """Aggregate timings for all completed workunits with a particular name.
+
+    Self time excludes time during which at least one child workunit was running, so the self times
+    of all rules sum to (at most) the wall time covered by the profile.
+    """
+
+    name: str
+    count: int
+    self_micros: int
+    total_micros: int
+
+
+@dataclass(frozen=True)
+class CriticalPathEntry:
+    """A workunit on the critical path of a run.
+
+    Entries are nested by `depth`: each entry is followed by the entries for the chain of its
+    children which bounded its completion.
+    """
+
+    name: str
+    description: Optional[str]
+    depth: int
+    start_micros: int
+    duration_micros: int
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "depth": self.depth,
+            "start_secs": self.start_micros / 1e6,
+            "duration_secs": self.duration_micros / 1e6,
+        }
+
+
+def _micros(secs: int, nanos: int) -> int:
+    return secs * 1_000_000 + nanos // 1000
+
+
+def _covered_micros(intervals: Iterable[Tuple[int, int]]) -> int:
+    """Returns the length of the union of the given (start, end) intervals."""
+    covered = 0
+    current_start: Optional[int] = None
+    current_end = 0
+    for start, end in sorted(intervals):
+        if current_start is None or start > current_end:
+            if current_start is not None:
+                covered += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_start is not None:
+        covered += current_end - current_start
+    return covered
+
+
+@dataclass(frozen=True)
+class _Span:
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start: int
+    end: int
+    workunit: Mapping[str, Any]
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+
+class WorkunitProfile:
+    """An accumulation of completed workunits, which may be rendered in various profile formats."""
+
+    def __init__(self) -> None:
+        self._spans: Dict[str, _Span] = {}
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def add(self, completed_workunits: Iterable[Mapping[str, Any]]) -> None:
+        for workunit in completed_workunits:
+            if "duration_secs" not in workunit:
+                continue
+            start = _micros(workunit["start_secs"], workunit["start_nanos"])
+            duration = _micros(workunit["duration_secs"], workunit["duration_nanos"])
+            span_id = workunit["span_id"]
+            self._spans[span_id] = _Span(
+                span_id=span_id,
+                parent_id=workunit.get("parent_id"),
+                name=workunit["name"],
+                start=start,
+                end=start + duration,
+                workunit=workunit,
+            )
+
+    def _parent(self, span: _Span) -> Optional[_Span]:
+        # NB: A parent may be absent, either because it was filtered out by level, or because it
+        # had not completed before the profile was rendered. Either way the span becomes a root.
+        return self._spans.get(span.parent_id) if span.parent_id else None
+
+    def _children(self) -> Dict[Optional[str], List[_Span]]:
+        """Returns the children of each span id, with the roots of the profile under `None`."""
+        children: Dict[Optional[str], List[_Span]] = defaultdict(list)
+        for span in self._spans.values():
+            parent = self._parent(span)
+            children[parent.span_id if parent else None].append(span)
+        return children
+
+    def _self_micros(self) -> Dict[str, int]:
+        children: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for span in self._spans.values():
+            parent = self._parent(span)
+            if parent:
+                children[parent.span_id].append(
+                    (max(span.start, parent.start), min(span.end, parent.end))
+                )
+        return {
+            span_id: max(0, span.duration - _covered_micros(children.get(span_id, ())))
+            for span_id, span in self._spans.items()
+        }
+
+    def _lanes(self) -> Dict[str, int]:
+        """Assigns each span to a lane (a Chrome trace "thread") in which spans nest strictly.
+
+        A span is placed in its parent's lane when it fits within the innermost span open there, and
+        otherwise in the first lane in which it does not overlap anything.
+        """
+        lanes: Dict[str, int] = {}
+        # The stack of (span_id, end) open in each lane.
+        open_spans: List[List[Tuple[str, int]]] = []
+
+        def fits(lane: int, span: _Span) -> bool:
+            stack = open_spans[lane]
+            while stack and stack[-1][1] <= span.start:
+                stack.pop()
+            return not stack or stack[-1][1] >= span.end
+
+        for span in sorted(self._spans.values(), key=lambda s: (s.start, -s.end)):
+            parent = self._parent(span)
+            candidates = [lanes[parent.span_id]] if parent else []
+            candidates.extend(range(len(open_spans)))
+            lane = next((c for c in candidates if fits(c, span)), None)
+            if lane is None:
+                lane = len(open_spans)
+                open_spans.append([])
+            open_spans[lane].append((span.span_id, span.end))
+            lanes[span.span_id] = lane
+        return lanes
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Renders the profile in the Chrome Trace Event format."""
+        if not self._spans:
+            return {"traceEvents": [], "displayTimeUnit": "ms"}
+        origin = min(span.start for span in self._spans.values())
+        self_micros = self._self_micros()
+        lanes = self._lanes()
+        events = []
+        for span in sorted(self._spans.values(), key=lambda s: (s.start, -s.end)):
+            args: Dict[str, Any] = {"span_id": span.span_id, "self_us": self_micros[span.span_id]}
+            description = span.workunit.get("description")
+            if description:
+                args["description"] = description
+            level = span.workunit.get("level")
+            if level:
+                args["level"] = level
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "workunit",
+                    "ph": "X",
+                    "ts": span.start - origin,
+                    "dur": span.duration,
+                    "pid": 1,
+                    "tid": lanes[span.span_id],
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def folded_stacks(self) -> List[str]:
+        """Renders the profile as folded stacks weighted by self time in microseconds."""
+        self_micros = self._self_micros()
+        weights: Dict[str, int] = defaultdict(int)
+        for span in self._spans.values():
+            if self_micros[span.span_id] == 0:
+                continue
+            frames = []
+            current: Optional[_Span] = span
+            # NB: Guard against (malformed) cycles in parent ids.
+            while current and len(frames) <= len(self._spans):
+                frames.append(current.name.replace(";", ":").replace(" ", "_"))
+                current = self._parent(current)
+            weights[";".join(reversed(frames))] += self_micros[span.span_id]
+        return [f"{stack} {weight}" for stack, weight in sorted(weights.items())]
+
+    def critical_path(self) -> List[CriticalPathEntry]:
+        """Returns the chain of workunits which bounded the wall time of the profile.
+
+        Starting from the workunit which completed last, each step back along the path selects the
+        latest-completing workunit which completed before the current one started: that is, the
+        work that the current workunit (transitively) waited on. The same walk is then applied to
+        the children of each selected workunit.
+        """
+        if not self._spans:
+            return []
+        origin = min(span.start for span in self._spans.values())
+        children = self._children()
+        entries: List[CriticalPathEntry] = []
+
+        def chain(siblings: List[_Span], start: int) -> List[_Span]:
+            by_end = sorted(siblings, key=lambda s: (s.end, s.duration), reverse=True)
+            result: List[_Span] = []
+            cursor: Optional[int] = None
+            for span in by_end:
+                if span.start < start:
+                    continue
+                if cursor is None or span.end <= cursor:
+                    result.append(span)
+                    cursor = span.start
+            result.reverse()
+            return result
+
+        def walk(span_id: Optional[str], start: int, depth: int) -> None:
+            # NB: Guard against (malformed) cycles in parent ids.
+            if depth > len(self._spans):
+                return
+            for span in chain(children.get(span_id, []), start):
+                entries.append(
+                    CriticalPathEntry(
+                        name=span.name,
+                        description=span.workunit.get("description"),
+                        depth=depth,
+                        start_micros=span.start - origin,
+                        duration_micros=span.duration,
+                    )
+                )
+                walk(span.span_id, span.start, depth + 1)
+
+        walk(None, origin, 0)
+        return entries
+
+    def rule_profiles(self) -> List[RuleProfile]:
+        """Returns per-name aggregates, sorted by descending self time."""
+        self_micros = self._self_micros()
+        counts: Dict[str, int] = defaultdict(int)
+        self_totals: Dict[str, int] = defaultdict(int)
+        totals: Dict[str, int] = defaultdict(int)
+        for span in self._spans.values():
+            counts[span.name] += 1
+            self_totals[span.name] += self_micros[span.span_id]
+            totals[span.name] += span.duration
+        return sorted(
+            (
+                RuleProfile(
+                    name=name,
+                    count=counts[name],
+                    self_micros=self_totals[name],
+                    total_micros=totals[name],
+                )
+                for name in counts
+            ),
+            key=lambda p: (-p.self_micros, p.name),
+        )
+
+
+def engine_detail(
+    node_metrics: Mapping[str, Mapping[str, Mapping[str, int]]],
+    rule_profiles: Iterable[RuleProfile],
+) -> Dict[str, Any]:
+    """Merges the engine's per-rule and per-process counters with the self times of workunits.
+
+    :param node_metrics: As returned by `SchedulerSession.node_metrics`.
+    :param rule_profiles: The per-name aggregates of the workunits of the same run.
+    :return: A dict of `rules` and `processes`, each sorted by descending time.
+    """
+    self_micros = {p.name: p.self_micros for p in rule_profiles}
+    rules = {}
+    for name, counters in node_metrics.get("rules", {}).items():
+        rules[name] = {
+            "invocations": sum(counters[k] for k in ("memo_hits", "cleaned", "runs", "reruns")),
+            "memo_hits": counters["memo_hits"],
+            "cleaned": counters["cleaned"],
+            "runs": counters["runs"],
+            "reruns": counters["reruns"],
+            "total_secs": counters["run_time_micros"] / 1e6,
+            "self_secs": self_micros.get(name, 0) / 1e6,
+        }
+    processes = {
+        description: dict(counters)
+        for description, counters in node_metrics.get("processes", {}).items()
+    }
+    return {
+        "rules": dict(sorted(rules.items(), key=lambda kv: (-kv[1]["total_secs"], kv[0]))),
+        "processes": dict(
+            sorted(processes.items(), key=lambda kv: (-kv[1]["local_cache_misses"], kv[0]))
+        ),
+    }
+
+
+def format_engine_detail(detail: Mapping[str, Any], limit: int) -> str:
+    """Renders the `limit` most expensive rules and processes of an `engine_detail` as tables."""
+    lines = [
+        "Rules with the most run time:",
+        f"{'total (s)':>10} {'self (s)':>10} {'runs':>7} {'reruns':>7} {'cleaned':>8} "
+        f"{'memo hits':>10}  name",
+    ]
+    for name, r in list(detail["rules"].items())[:limit]:
+        lines.append(
+            f"{r['total_secs']:>10.3f} {r['self_secs']:>10.3f} {r['runs']:>7} {r['reruns']:>7} "
+            f"{r['cleaned']:>8} {r['memo_hits']:>10}  {name}"
+        )
+    if detail["processes"]:
+        lines.append("Processes with the most local cache misses:")
+        lines.append(f"{'misses':>10} {'hits':>10}  description")
+        for description, p in list(detail["processes"].items())[:limit]:
+            lines.append(
+                f"{p['local_cache_misses']:>10} {p['local_cache_hits']:>10}  {description}"
+            )
+    return "\n".join(lines)
+
+
+class WorkunitProfiler(Subsystem):
+    """Records a profile of the workunits of each run.
+
+    Enable with `--streaming-workunits-handlers="['pants.reporting.workunit_profile.WorkunitProfiler']"`.
+    """
+
+    options_scope = "workunit-profiler"
+
+    @classmethod
+    def register_options(cls, register):
+        super().register_options(register)
+        register(
+            "--chrome-trace-file",
+            type=str,
+            default=None,
+            help="Write a Chrome Trace Event file for each run to this path, relative to the "
+            "buildroot. Load it in chrome://tracing or https://ui.perfetto.dev.",
+        )
+        register(
+            "--flamegraph-file",
+            type=str,
+            default=None,
+            help="Write folded stacks for each run to this path, relative to the buildroot, "
+            "weighted by self time in microseconds. Render it with `flamegraph.pl` or speedscope.",
+        )
+        register(
+            "--summary-limit",
+            type=int,
+            default=20,
+            help="Log the rules with the most self time at the end of each run, up to this many. "
+            "Set to 0 to disable the summary.",
+        )
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # NB: Workunits for a run arrive in several chunks: they are accumulated here until the
+        # final chunk, and then the profile is reset for the next run (under pantsd).
+        self._profile = WorkunitProfile()
+
+    def handle_workunits(self, *, completed_workunits, finished: bool, **kwargs) -> None:
+        self._profile.add(completed_workunits)
+        if not finished:
+            return
+        profile, self._profile = self._profile, WorkunitProfile()
+        options = self.get_options()
+        if options.chrome_trace_file:
+            path = os.path.join(get_buildroot(), options.chrome_trace_file)
+            safe_file_dump(path, json.dumps(profile.chrome_trace()), makedirs=True)
+            logger.info(f"Wrote a Chrome trace of {len(profile)} workunits to {path}")
+        if options.flamegraph_file:
+            path = os.path.join(get_buildroot(), options.flamegraph_file)
+            safe_file_dump(
+                path, "".join(f"{line}\n" for line in profile.folded_stacks()), makedirs=True
+            )
+            logger.info(f"Wrote folded stacks of {len(profile)} workunits to {path}")
+        if options.summary_limit > 0:
+            logger.info(self._format_summary(profile.rule_profiles()[: options.summary_limit]))
+
+    @staticmethod
+    def _format_summary(rule_profiles: List[RuleProfile]) -> str:
+        lines = [f"{'self (s)':>10} {'total (s)':>10} {'count':>8}  name"]
+        lines.extend(
+            f"{p.self_micros / 1e6:>10.3f} {p.total_micros / 1e6:>10.3f} {p.count:>8}  {p.name}"
+            for p in rule_profiles
+        )
+        return "Workunits with the most self time:\n" + "\n".join(lines)
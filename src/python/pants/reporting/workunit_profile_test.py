@@ -0,0 +1,143 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from pants.reporting.workunit_profile import (
+    RuleProfile,
+    WorkunitProfile,
+    engine_detail,
+    format_engine_detail,
+)
+
+
+def workunit(span_id, name, start_micros, duration_micros, parent_id=None):
+    result = {
+        "name": name,
+        "span_id": span_id,
+        "level": "INFO",
+        "start_secs": 100 + start_micros // 1_000_000,
+        "start_nanos": (start_micros % 1_000_000) * 1000,
+        "duration_secs": duration_micros // 1_000_000,
+        "duration_nanos": (duration_micros % 1_000_000) * 1000,
+    }
+    if parent_id:
+        result["parent_id"] = parent_id
+    return result
+
+
+def create_profile() -> WorkunitProfile:
+    # A root which runs two overlapping children, one of which has a child of its own.
+    profile = WorkunitProfile()
+    profile.add([workunit("c", "child", 100, 300, parent_id="r")])
+    profile.add(
+        [
+            workunit("g", "grandchild", 150, 100, parent_id="c"),
+            workunit("d", "child", 200, 400, parent_id="r"),
+            workunit("r", "root", 0, 1000),
+        ]
+    )
+    return profile
+
+
+def test_rule_profiles() -> None:
+    assert create_profile().rule_profiles() == [
+        RuleProfile(name="child", count=2, self_micros=600, total_micros=700),
+        RuleProfile(name="root", count=1, self_micros=500, total_micros=1000),
+        RuleProfile(name="grandchild", count=1, self_micros=100, total_micros=100),
+    ]
+
+
+def test_folded_stacks() -> None:
+    assert create_profile().folded_stacks() == [
+        "root 500",
+        "root;child 600",
+        "root;child;grandchild 100",
+    ]
+
+
+def test_chrome_trace() -> None:
+    events = create_profile().chrome_trace()["traceEvents"]
+    assert [(e["name"], e["ph"], e["ts"], e["dur"], e["tid"]) for e in events] == [
+        ("root", "X", 0, 1000, 0),
+        ("child", "X", 100, 300, 0),
+        ("grandchild", "X", 150, 100, 0),
+        # Overlaps its sibling without nesting in it, and so must be moved to another lane.
+        ("child", "X", 200, 400, 1),
+    ]
+    assert events[0]["args"]["self_us"] == 500
+
+
+def test_missing_parent() -> None:
+    profile = WorkunitProfile()
+    profile.add(
+        [
+            workunit("a", "orphan", 0, 10, parent_id="filtered"),
+            # Not yet completed, and so ignored.
+            {"name": "running", "span_id": "b", "start_secs": 100, "start_nanos": 0},
+        ]
+    )
+    assert len(profile) == 1
+    assert profile.folded_stacks() == ["orphan 10"]
+    assert WorkunitProfile().chrome_trace()["traceEvents"] == []
+
+
+def test_critical_path() -> None:
+    profile = WorkunitProfile()
+    profile.add(
+        [
+            workunit("r", "root", 0, 1000),
+            # `slow` completes last, and so bounds the root. It started after `first` completed,
+            # but not after `parallel` completed, so `first` precedes it on the critical path.
+            workunit("a", "first", 0, 300, parent_id="r"),
+            workunit("b", "parallel", 0, 500, parent_id="r"),
+            workunit("c", "slow", 400, 600, parent_id="r"),
+            workunit("d", "process", 450, 500, parent_id="c"),
+            # A root that completed before the last root started is on the path too.
+            workunit("s", "setup", 0, 0),
+        ]
+    )
+    critical_path = profile.critical_path()
+    assert [(e.depth, e.name, e.start_micros, e.duration_micros) for e in critical_path] == [
+        (0, "setup", 0, 0),
+        (0, "root", 0, 1000),
+        (1, "first", 0, 300),
+        (1, "slow", 400, 600),
+        (2, "process", 450, 500),
+    ]
+
+
+def test_engine_detail() -> None:
+    def counters(memo_hits, cleaned, runs, reruns, run_time_micros):
+        return dict(
+            memo_hits=memo_hits,
+            cleaned=cleaned,
+            runs=runs,
+            reruns=reruns,
+            run_time_micros=run_time_micros,
+        )
+
+    node_metrics = {
+        "rules": {"cheap": counters(10, 1, 2, 0, 1000), "expensive": counters(0, 0, 1, 1, 5000)},
+        "processes": {
+            "Run isort": {"local_cache_hits": 3, "local_cache_misses": 0},
+            "Run black": {"local_cache_hits": 1, "local_cache_misses": 2},
+        },
+    }
+    detail = engine_detail(node_metrics, [RuleProfile("expensive", 2, 4000, 5000)])
+    assert list(detail["rules"]) == ["expensive", "cheap"]
+    assert detail["rules"]["expensive"] == {
+        "invocations": 2,
+        "memo_hits": 0,
+        "cleaned": 0,
+        "runs": 1,
+        "reruns": 1,
+        "total_secs": 0.005,
+        "self_secs": 0.004,
+    }
+    assert detail["rules"]["cheap"]["invocations"] == 13
+    assert detail["rules"]["cheap"]["self_secs"] == 0
+    assert list(detail["processes"]) == ["Run black", "Run isort"]
+
+    summary = format_engine_detail(detail, limit=1).splitlines()
+    assert "expensive" in summary[2]
+    assert not any("cheap" in line for line in summary)
+    assert "Run black" in summary[-1]
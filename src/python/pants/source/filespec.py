@@ -1,7 +1,8 @@
 # Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-from typing import Iterable, List, Tuple
+import functools
+from typing import Iterable, List, Sequence, Tuple
 
 from typing_extensions import TypedDict
 
@@ -24,7 +25,63 @@ class Filespec(_IncludesDict, total=False):
     excludes: List[str]
 
 
+# The maximum number of compiled FilespecMatchers to retain: one per distinct `sources` field is
+# typical, so this comfortably covers the targets of a large repository.
+_MAX_CACHED_MATCHERS = 16 * 1024
+
+
+class FilespecMatcher:
+    """A Filespec whose globs have been compiled once, so that it may be cheaply applied to many
+    batches of paths.
+
+    Use `FilespecMatcher.create` rather than the constructor, in order to share compiled matchers
+    between equal Filespecs.
+    """
+
+    def __init__(self, globs: Tuple[str, ...]) -> None:
+        self._globs = globs
+        self._matcher = Native().new_path_globs_matcher(PathGlobs(globs=globs))
+
+    @classmethod
+    def create(cls, spec: Filespec) -> "FilespecMatcher":
+        include_patterns = spec["includes"]
+        exclude_patterns = [f"!{e}" for e in spec.get("excludes", [])]
+        return _compile_globs((*include_patterns, *exclude_patterns))
+
+    @property
+    def globs(self) -> Tuple[str, ...]:
+        return self._globs
+
+    def matches(self, paths: Iterable[str]) -> Tuple[str, ...]:
+        """Return the given paths which match this Filespec."""
+        return Native().match_compiled_path_globs(self._matcher, paths)
+
+    @staticmethod
+    def matches_batch(
+        matchers: Sequence["FilespecMatcher"], *, paths: Iterable[str]
+    ) -> Tuple[Tuple[str, ...], ...]:
+        """Return the given paths which match each of the given matchers, in order.
+
+        The paths are matched against all of the matchers in a single native call.
+        """
+        return Native().match_compiled_path_globs_batch(
+            tuple(matcher._matcher for matcher in matchers), paths
+        )
+
+
+@functools.lru_cache(maxsize=_MAX_CACHED_MATCHERS)
+def _compile_globs(globs: Tuple[str, ...]) -> FilespecMatcher:
+    return FilespecMatcher(globs)
+
+
 def matches_filespec(spec: Filespec, *, paths: Iterable[str]) -> Tuple[str, ...]:
-    include_patterns = spec["includes"]
-    exclude_patterns = [f"!{e}" for e in spec.get("excludes", [])]
-    return Native().match_path_globs(PathGlobs(globs=(*include_patterns, *exclude_patterns)), paths)
+    return FilespecMatcher.create(spec).matches(paths)
+
+
+def matches_filespecs(
+    specs: Sequence[Filespec], *, paths: Iterable[str]
+) -> Tuple[Tuple[str, ...], ...]:
+    """Return the given paths which match each of the given Filespecs, in order."""
+    return FilespecMatcher.matches_batch(
+        [FilespecMatcher.create(spec) for spec in specs], paths=paths
+    )
@@ -1,10 +1,10 @@
 # Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-from typing import Tuple
+from typing import List, Tuple
 
 from pants.engine.fs import PathGlobs, Snapshot
-from pants.source.filespec import matches_filespec
+from pants.source.filespec import Filespec, FilespecMatcher, matches_filespec, matches_filespecs
 from pants.testutil.test_base import TestBase
 
 
@@ -116,3 +116,22 @@ class FilespecTest(TestBase):
 
     def test_matches_literal_file(self) -> None:
         self.assert_rule_match("a/b/c.py", ("a/b/c.py",))
+
+    def test_matcher_reuse(self) -> None:
+        spec: Filespec = {"includes": ["a/*.py"], "excludes": ["a/ignore.py"]}
+        matcher = FilespecMatcher.create(spec)
+        # Equal Filespecs share a compiled matcher.
+        assert FilespecMatcher.create(dict(spec)) is matcher  # type: ignore[arg-type]
+        assert matcher.globs == ("a/*.py", "!a/ignore.py")
+        assert matcher.matches(["a/f.py", "a/ignore.py", "b/f.py"]) == ("a/f.py",)
+        assert matcher.matches(["a/g.py"]) == ("a/g.py",)
+
+    def test_matches_filespecs_batch(self) -> None:
+        paths = ("a/f.py", "a/b/g.py", "c/h.txt")
+        specs: List[Filespec] = [
+            {"includes": ["a/*.py"]},
+            {"includes": ["**/*.py"], "excludes": ["a/b/*"]},
+            {"includes": ["c/*.py"]},
+        ]
+        assert matches_filespecs(specs, paths=paths) == (("a/f.py",), ("a/f.py",), ())
+        assert matches_filespecs([], paths=paths) == ()
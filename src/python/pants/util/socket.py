@@ -55,5 +55,21 @@ class RecvBufferedSocket:
         return_buf, self._buffer = self._buffer[:bufsize], self._buffer[bufsize:]
         return return_buf
 
+    def recv_into(self, buffer, nbytes=0):
+        """Receives into the given writable buffer, draining any internally buffered bytes first.
+
+        Reads of at least `_chunk_size` bytes with an empty internal buffer are received directly
+        into `buffer`.
+        """
+        view = memoryview(buffer).cast("B")
+        nbytes = nbytes or len(view)
+        if not self._buffer and nbytes >= self._chunk_size:
+            if not is_readable(self._socket, timeout=self._select_timeout):
+                return 0
+            return self._socket.recv_into(view, nbytes)
+        data = self.recv(nbytes)
+        view[: len(data)] = data
+        return len(data)
+
     def __getattr__(self, attr):
         return getattr(self._socket, attr)
@@ -74,3 +74,21 @@ class TestRecvBufferedSocket(unittest.TestCase):
 
         self.assertEqual(self.mocked_buf_sock.recv(self.chunk_size), b"B" * self.chunk_size)
         self.assertEqual(self.mock_socket.recv.call_count, 2)
+
+    def test_recv_into(self):
+        self.server_sock.sendall(b"A" * 300)
+        self.assertEqual(self.buf_sock.recv(1), b"A")
+        # Drains the internal buffer before reading from the socket.
+        buf = bytearray(299)
+        self.assertEqual(self.buf_sock.recv_into(buf), 299)
+        self.assertEqual(buf, b"A" * 299)
+
+    def test_recv_into_larger_than_chunk(self):
+        double_chunk = self.chunk_size * 2
+        self.server_sock.sendall(b"B" * double_chunk)
+        buf = bytearray(double_chunk)
+        view = memoryview(buf)
+        received = 0
+        while received < double_chunk:
+            received += self.buf_sock.recv_into(view[received:], double_chunk - received)
+        self.assertEqual(buf, b"B" * double_chunk)
@@ -1,7 +1,7 @@
 use std::mem;
 use std::sync::Arc;
 
-use crate::node::{EntryId, Node, NodeContext, NodeError};
+use crate::node::{EntryId, Node, NodeContext, NodeError, NodeEvent};
 
 use futures::channel::oneshot;
 use futures::future::{self, AbortHandle, Abortable, Aborted, BoxFuture, FutureExt};
@@ -288,6 +288,7 @@ impl<N: Node> Entry<N> {
     previous_dep_generations: Option<Vec<Generation>>,
     previous_result: Option<EntryResult<N>>,
   ) -> EntryState<N> {
+    let had_previous_result = previous_result.is_some();
     // Increment the RunToken to uniquely identify this work.
     let previous_run_token = run_token;
     let run_token = run_token.next();
@@ -332,12 +333,21 @@ impl<N: Node> Entry<N> {
       if was_clean {
         // No dependencies have changed: we can complete the Node without changing its
         // previous_result or generation.
+        context.record_node_event(&node, NodeEvent::Cleaned);
         context
           .graph()
           .complete(&context, entry_id, run_token, None);
       } else {
         // The Node needs to (re-)run! Wrap the potentially long running computation in an
         // Abortable.
+        context.record_node_event(
+          &node,
+          if had_previous_result {
+            NodeEvent::Reran
+          } else {
+            NodeEvent::Ran
+          },
+        );
         let res = match Abortable::new(node.run(context.clone()), abort_registration).await {
           Ok(r) => r,
           Err(Aborted) => Err(N::Error::invalidated()),
@@ -381,6 +391,7 @@ impl<N: Node> Entry<N> {
         &mut EntryState::Running {
           ref mut waiters, ..
         } => {
+          context.record_node_event(&self.node, NodeEvent::MemoHit);
           let (send, recv) = oneshot::channel();
           waiters.push(send);
           return async move { recv.await.map_err(|_| N::Error::invalidated())? }.boxed();
@@ -390,6 +401,7 @@ impl<N: Node> Entry<N> {
           generation,
           ..
         } if result.is_clean(context) => {
+          context.record_node_event(&self.node, NodeEvent::MemoHit);
           return future::ready(Ok((result.as_ref().clone(), generation))).boxed();
         }
         _ => {
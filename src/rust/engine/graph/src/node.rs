@@ -35,6 +35,23 @@ pub trait Node: Clone + Debug + Display + Eq + Hash + Send + 'static {
   fn cacheable(&self) -> bool;
 }
 
+///
+/// An event in the lifecycle of a request for a Node: see `NodeContext::record_node_event`.
+///
+#[derive(Clone, Copy, Debug, Eq, PartialEq)]
+pub enum NodeEvent {
+  /// A memoized (or currently running) value of the Node was used.
+  MemoHit,
+  /// The Node had been invalidated, but its dependencies had not changed, so its previous value
+  /// was reused without re-running it.
+  Cleaned,
+  /// The Node ran for the first time.
+  Ran,
+  /// The Node had a previous value, but re-ran because it or its dependencies were invalidated
+  /// (or because it is not cacheable).
+  Reran,
+}
+
 pub trait NodeError: Clone + Debug + Eq + Send {
   ///
   /// Creates an instance that represents that a Node was invalidated out of the
@@ -105,6 +122,12 @@ pub trait NodeContext: Clone + Send + Sync + 'static {
   ///
   fn graph(&self) -> &Graph<Self::Node>;
 
+  ///
+  /// Records an event in the lifecycle of a request for the given Node. Called while the Graph
+  /// holds locks, so implementations should be cheap, and must not call back into the Graph.
+  ///
+  fn record_node_event(&self, _node: &Self::Node, _event: NodeEvent) {}
+
   ///
   /// Spawns a Future on an Executor provided by the context.
   ///
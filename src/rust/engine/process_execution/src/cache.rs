@@ -1,5 +1,5 @@
 use crate::{
-  Context, FallibleProcessResultWithPlatform, MultiPlatformProcess, Platform, Process,
+  CacheStats, Context, FallibleProcessResultWithPlatform, MultiPlatformProcess, Platform, Process,
   ProcessMetadata,
 };
 use std::sync::Arc;
@@ -29,6 +29,7 @@ pub struct CommandRunner {
   process_execution_store: ShardedLmdb,
   file_store: Store,
   metadata: ProcessMetadata,
+  stats: CacheStats,
 }
 
 impl CommandRunner {
@@ -37,12 +38,14 @@ impl CommandRunner {
     process_execution_store: ShardedLmdb,
     file_store: Store,
     metadata: ProcessMetadata,
+    stats: CacheStats,
   ) -> CommandRunner {
     CommandRunner {
       underlying,
       process_execution_store,
       file_store,
       metadata,
+      stats,
     }
   }
 }
@@ -63,8 +66,12 @@ impl crate::CommandRunner for CommandRunner {
     let key = digest.0;
 
     let command_runner = self.clone();
+    let description = req.user_facing_name();
     match self.lookup(key).await {
-      Ok(Some(result)) => return Ok(result),
+      Ok(Some(result)) => {
+        self.stats.record(&context, description, true);
+        return Ok(result);
+      }
       Err(err) => {
         warn!(
           "Error loading process execution result from local cache: {} - continuing to execute",
@@ -76,6 +83,7 @@ impl crate::CommandRunner for CommandRunner {
         // Falling through to execute.
       }
     }
+    self.stats.record(&context, description, false);
 
     let result = command_runner.underlying.run(req, context).await?;
     if result.exit_code == 0 {
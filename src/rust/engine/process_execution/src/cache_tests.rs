@@ -1,6 +1,6 @@
 use crate::{
-  CommandRunner as CommandRunnerTrait, Context, FallibleProcessResultWithPlatform, NamedCaches,
-  Process, ProcessMetadata,
+  CacheStats, CommandRunner as CommandRunnerTrait, Context, FallibleProcessResultWithPlatform,
+  NamedCaches, Process, ProcessMetadata,
 };
 use std::io::Write;
 use std::path::PathBuf;
@@ -74,6 +74,7 @@ async fn run_roundtrip(script_exit_code: i8) -> RoundtripResults {
     process_execution_store,
     store.clone(),
     metadata,
+    CacheStats::default(),
   );
 
   let uncached_result = caching
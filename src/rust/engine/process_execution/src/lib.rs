@@ -33,13 +33,15 @@ extern crate derivative;
 use async_trait::async_trait;
 pub use log::Level;
 use serde::{Deserialize, Serialize};
-use std::collections::{BTreeMap, BTreeSet};
+use std::collections::{BTreeMap, BTreeSet, HashMap};
 use std::convert::TryFrom;
 use std::ops::AddAssign;
 use std::path::{Component, Path, PathBuf};
 use std::sync::Arc;
 use std::time::Duration;
 use store::UploadSummary;
+
+use parking_lot::Mutex;
 use workunit_store::{with_workunit, WorkunitMetadata, WorkunitStore};
 
 use async_semaphore::AsyncSemaphore;
@@ -459,6 +461,46 @@ impl Context {
   }
 }
 
+///
+/// Counts of lookups in a process cache for processes with a particular description.
+///
+#[derive(Clone, Copy, Debug, Default, Eq, PartialEq)]
+pub struct CacheCounts {
+  pub hits: u64,
+  pub misses: u64,
+}
+
+///
+/// Per-build counts of process cache lookups, keyed by process description.
+///
+/// Counts are only recorded for builds which have been `enable`d, and are discarded when they are
+/// `take`n, so that a long-lived process does not accumulate counts for every build it has run.
+///
+#[derive(Clone, Default)]
+pub struct CacheStats(Arc<Mutex<HashMap<String, HashMap<String, CacheCounts>>>>);
+
+impl CacheStats {
+  pub fn enable(&self, build_id: &str) {
+    self.0.lock().entry(build_id.to_owned()).or_default();
+  }
+
+  pub fn record(&self, context: &Context, description: String, hit: bool) {
+    let mut stats = self.0.lock();
+    if let Some(counts_by_description) = stats.get_mut(&context.build_id) {
+      let counts = counts_by_description.entry(description).or_default();
+      if hit {
+        counts.hits += 1;
+      } else {
+        counts.misses += 1;
+      }
+    }
+  }
+
+  pub fn take(&self, build_id: &str) -> HashMap<String, CacheCounts> {
+    self.0.lock().remove(build_id).unwrap_or_default()
+  }
+}
+
 #[async_trait]
 pub trait CommandRunner: Send + Sync {
   ///
@@ -17,11 +17,11 @@ use crate::tasks::{Rule, Tasks};
 use crate::types::Types;
 
 use fs::{safe_create_dir_all_ioerror, GitignoreStyleExcludes, PosixFS};
-use graph::{EntryId, Graph, InvalidationResult, NodeContext, RunToken};
+use graph::{EntryId, Graph, InvalidationResult, NodeContext, NodeEvent, RunToken};
 use log::info;
 use process_execution::{
-  self, speculate::SpeculatingCommandRunner, BoundedCommandRunner, CommandRunner, NamedCaches,
-  Platform, ProcessMetadata,
+  self, speculate::SpeculatingCommandRunner, BoundedCommandRunner, CacheStats, CommandRunner,
+  NamedCaches, Platform, ProcessMetadata,
 };
 use rand::seq::SliceRandom;
 use rule_graph::RuleGraph;
@@ -46,6 +46,7 @@ pub struct Core {
   pub executor: Executor,
   store: Store,
   pub command_runner: Box<dyn process_execution::CommandRunner>,
+  pub process_cache_stats: CacheStats,
   pub http_client: reqwest::Client,
   pub vfs: PosixFS,
   pub watcher: Arc<InvalidationWatcher>,
@@ -232,6 +233,7 @@ impl Core {
       };
     }
 
+    let process_cache_stats = CacheStats::default();
     if exec_strategy_opts.use_local_cache {
       let process_execution_store = ShardedLmdb::new(
         local_store_dir2.join("processes"),
@@ -245,6 +247,7 @@ impl Core {
         process_execution_store,
         store.clone(),
         process_execution_metadata,
+        process_cache_stats.clone(),
       ));
     }
     let graph = Arc::new(InvalidatableGraph(Graph::new()));
@@ -278,6 +281,7 @@ impl Core {
       executor: executor.clone(),
       store,
       command_runner,
+      process_cache_stats,
       http_client,
       // TODO: Errors in initialization should definitely be exposed as python
       // exceptions, rather than as panics.
@@ -397,6 +401,20 @@ impl NodeContext for Context {
     &self.core.graph
   }
 
+  fn record_node_event(&self, node: &NodeKey, event: NodeEvent) {
+    if !self.session.should_record_node_metrics() {
+      return;
+    }
+    self
+      .session
+      .update_node_metrics(node.workunit_name(), |metrics| match event {
+        NodeEvent::MemoHit => metrics.memo_hits += 1,
+        NodeEvent::Cleaned => metrics.cleaned += 1,
+        NodeEvent::Ran => metrics.runs += 1,
+        NodeEvent::Reran => metrics.reruns += 1,
+      });
+  }
+
   fn spawn<F>(&self, future: F)
   where
     F: Future<Output = ()> + Send + 'static,
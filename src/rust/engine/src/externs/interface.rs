@@ -135,6 +135,14 @@ py_module_initializer!(native_engine, |py, m| {
     "match_path_globs",
     py_fn!(py, match_path_globs(a: PyObject, b: Vec<String>)),
   )?;
+  m.add(
+    py,
+    "match_path_globs_batch",
+    py_fn!(
+      py,
+      match_path_globs_batch(a: Vec<PyPathGlobsMatcher>, b: Vec<String>)
+    ),
+  )?;
   m.add(
     py,
     "write_digest",
@@ -335,6 +343,11 @@ py_module_initializer!(native_engine, |py, m| {
     "scheduler_metrics",
     py_fn!(py, scheduler_metrics(a: PyScheduler, b: PySession)),
   )?;
+  m.add(
+    py,
+    "scheduler_node_metrics",
+    py_fn!(py, scheduler_node_metrics(a: PyScheduler, b: PySession)),
+  )?;
   m.add(
     py,
     "scheduler_create",
@@ -373,6 +386,7 @@ py_module_initializer!(native_engine, |py, m| {
   m.add_class::<PyExecutionStrategyOptions>(py)?;
   m.add_class::<PyExecutor>(py)?;
   m.add_class::<PyNailgunServer>(py)?;
+  m.add_class::<PyPathGlobsMatcher>(py)?;
   m.add_class::<PyRemotingOptions>(py)?;
   m.add_class::<PyResult>(py)?;
   m.add_class::<PyScheduler>(py)?;
@@ -551,13 +565,15 @@ py_class!(class PySession |py| {
           scheduler_ptr: PyScheduler,
           should_render_ui: bool,
           build_id: String,
-          should_report_workunits: bool
+          should_report_workunits: bool,
+          should_record_node_metrics: bool
     ) -> CPyResult<Self> {
       Self::create_instance(py, Session::new(
           scheduler_ptr.scheduler(py),
           should_render_ui,
           build_id,
           should_report_workunits,
+          should_record_node_metrics,
         )
       )
     }
@@ -575,6 +591,23 @@ py_class!(class PyNailgunServer |py| {
     }
 });
 
+// A PathGlobs instance which has been parsed and compiled once, so that it may be used to match
+// many batches of paths without re-parsing its patterns.
+py_class!(class PyPathGlobsMatcher |py| {
+    data path_globs: fs::PreparedPathGlobs;
+
+    def __new__(_cls, path_globs: PyObject) -> CPyResult<Self> {
+      let path_globs = nodes::Snapshot::lift_path_globs(&path_globs.into())
+        .map_err(|e| PyErr::new::<exc::ValueError, _>(py, (e,)))?;
+      Self::create_instance(py, path_globs)
+    }
+
+    def matches(&self, paths: Vec<String>) -> CPyResult<Vec<String>> {
+      let path_globs = self.path_globs(py);
+      Ok(py.allow_threads(|| matching_paths(path_globs, &paths)))
+    }
+});
+
 py_class!(class PyExecutionRequest |py| {
     data execution_request: RefCell<ExecutionRequest>;
     def __new__(_cls) -> CPyResult<Self> {
@@ -949,6 +982,64 @@ fn scheduler_metrics(
   })
 }
 
+///
+/// Returns the per-Node-name metrics of a Session which was created with
+/// `should_record_node_metrics`, along with the process cache lookups made by the Session, as:
+///   {"rules": {name: {counter: value}}, "processes": {description: {counter: value}}}
+///
+/// Process cache lookups are returned only once: subsequent calls will not include them.
+///
+fn scheduler_node_metrics(
+  py: Python,
+  scheduler_ptr: PyScheduler,
+  session_ptr: PySession,
+) -> CPyResult<PyObject> {
+  with_scheduler(py, scheduler_ptr, |scheduler| {
+    with_session(py, session_ptr, |session| {
+      let counters = |counters: Vec<(&'static str, u64)>| {
+        externs::store_dict(
+          counters
+            .into_iter()
+            .map(|(name, value)| (externs::store_utf8(name), externs::store_u64(value)))
+            .collect(),
+        )
+      };
+      let rules = session
+        .node_metrics()
+        .into_iter()
+        .map(|(name, metrics)| {
+          let value = counters(vec![
+            ("memo_hits", metrics.memo_hits),
+            ("cleaned", metrics.cleaned),
+            ("runs", metrics.runs),
+            ("reruns", metrics.reruns),
+            ("run_time_micros", metrics.run_time.as_micros() as u64),
+          ])?;
+          Ok((externs::store_utf8(&name), value))
+        })
+        .collect::<Result<Vec<_>, PyErr>>()?;
+      let processes = scheduler
+        .core
+        .process_cache_stats
+        .take(session.build_id())
+        .into_iter()
+        .map(|(description, counts)| {
+          let value = counters(vec![
+            ("local_cache_hits", counts.hits),
+            ("local_cache_misses", counts.misses),
+          ])?;
+          Ok((externs::store_utf8(&description), value))
+        })
+        .collect::<Result<Vec<_>, PyErr>>()?;
+      externs::store_dict(vec![
+        (externs::store_utf8("rules"), externs::store_dict(rules)?),
+        (externs::store_utf8("processes"), externs::store_dict(processes)?),
+      ])
+      .map(|d| d.consume_into_py_object(py))
+    })
+  })
+}
+
 fn scheduler_execute(
   py: Python,
   scheduler_ptr: PyScheduler,
@@ -1333,6 +1424,35 @@ fn match_path_globs(
     .collect::<Result<Vec<_>, _>>()
 }
 
+///
+/// Matches a single batch of paths against many compiled PathGlobs, returning the matching paths
+/// for each PathGlobs in order.
+///
+fn match_path_globs_batch(
+  py: Python,
+  matchers: Vec<PyPathGlobsMatcher>,
+  paths: Vec<String>,
+) -> CPyResult<Vec<Vec<String>>> {
+  let path_globs = matchers
+    .iter()
+    .map(|matcher| matcher.path_globs(py))
+    .collect::<Vec<_>>();
+  Ok(py.allow_threads(|| {
+    path_globs
+      .into_iter()
+      .map(|path_globs| matching_paths(path_globs, &paths))
+      .collect()
+  }))
+}
+
+fn matching_paths(path_globs: &fs::PreparedPathGlobs, paths: &[String]) -> Vec<String> {
+  paths
+    .iter()
+    .filter(|path| path_globs.matches(Path::new(path)))
+    .cloned()
+    .collect()
+}
+
 fn capture_snapshots(
   py: Python,
   scheduler_ptr: PyScheduler,
@@ -7,7 +7,7 @@ use std::fmt::Display;
 use std::io::Write;
 use std::path::{Path, PathBuf};
 use std::sync::Arc;
-use std::time::Duration;
+use std::time::{Duration, Instant};
 use std::{self, fmt};
 
 use async_trait::async_trait;
@@ -1073,7 +1073,7 @@ impl NodeKey {
   /// Provides the `name` field in workunits associated with this node. These names
   /// should be friendly to machine-parsing (i.e. "my_node" rather than "My awesome node!").
   ///
-  fn workunit_name(&self) -> String {
+  pub(crate) fn workunit_name(&self) -> String {
     match self {
       NodeKey::Task(ref task) => task.task.display_info.name.clone(),
       NodeKey::MultiPlatformExecuteProcess(mp_epr) => mp_epr.0.workunit_name(),
@@ -1123,6 +1123,12 @@ impl Node for NodeKey {
 
     let user_facing_name = self.user_facing_name();
     let workunit_name = self.workunit_name();
+    let started = Instant::now();
+    let node_metrics_session = if context.session.should_record_node_metrics() {
+      Some((context.session.clone(), workunit_name.clone()))
+    } else {
+      None
+    };
     let failure_name = user_facing_name
       .clone()
       .unwrap_or_else(|| workunit_name.clone());
@@ -1216,7 +1222,7 @@ impl Node for NodeKey {
       (result, final_metadata)
     };
 
-    with_workunit(
+    let result = with_workunit(
       workunit_state.store,
       workunit_name,
       metadata,
@@ -1224,7 +1230,11 @@ impl Node for NodeKey {
       |result, _| result.1.clone(),
     )
     .await
-    .0
+    .0;
+    if let Some((session, name)) = node_metrics_session {
+      session.update_node_metrics(name, |metrics| metrics.run_time += started.elapsed());
+    }
+    result
   }
 
   fn cacheable(&self) -> bool {
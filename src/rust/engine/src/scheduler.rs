@@ -42,6 +42,19 @@ type ObservedValueResult = Result<(Value, Option<LastObserved>), Failure>;
 // Root requests are limited to Select nodes, which produce (python) Values.
 type Root = Select;
 
+///
+/// Counters for the requests for, and runs of, Nodes with a particular name, which for `@rule`s is
+/// the name of the rule.
+///
+#[derive(Clone, Copy, Debug, Default)]
+pub struct NodeMetrics {
+  pub memo_hits: u64,
+  pub cleaned: u64,
+  pub runs: u64,
+  pub reruns: u64,
+  pub run_time: Duration,
+}
+
 ///
 /// A Session represents a related series of requests (generally: one run of the pants CLI) on an
 /// underlying Scheduler, and is a useful scope for metrics.
@@ -73,6 +86,8 @@ struct InnerSession {
   // Session/build_id would be stable.
   run_id: Mutex<Uuid>,
   should_report_workunits: bool,
+  // Per-Node-name metrics, if enabled for this Session.
+  node_metrics: Option<Mutex<HashMap<String, NodeMetrics>>>,
 }
 
 #[derive(Clone)]
@@ -84,6 +99,7 @@ impl Session {
     should_render_ui: bool,
     build_id: String,
     should_report_workunits: bool,
+    should_record_node_metrics: bool,
   ) -> Session {
     let workunit_store = WorkunitStore::new(should_render_ui);
     let display = if should_render_ui {
@@ -95,6 +111,10 @@ impl Session {
       None
     };
 
+    if should_record_node_metrics {
+      scheduler.core.process_cache_stats.enable(&build_id);
+    }
+
     let inner_session = InnerSession {
       preceding_graph_size: scheduler.core.graph.len(),
       roots: Mutex::new(HashMap::new()),
@@ -103,6 +123,11 @@ impl Session {
       build_id,
       run_id: Mutex::new(Uuid::new_v4()),
       should_report_workunits,
+      node_metrics: if should_record_node_metrics {
+        Some(Mutex::new(HashMap::new()))
+      } else {
+        None
+      },
     };
     Session(Arc::new(inner_session))
   }
@@ -136,6 +161,34 @@ impl Session {
     self.0.should_report_workunits
   }
 
+  pub fn should_record_node_metrics(&self) -> bool {
+    self.0.node_metrics.is_some()
+  }
+
+  ///
+  /// Updates the metrics for Nodes with the given name, if node metrics are enabled.
+  ///
+  pub fn update_node_metrics<F: FnOnce(&mut NodeMetrics)>(&self, name: String, f: F) {
+    if let Some(ref node_metrics) = self.0.node_metrics {
+      f(node_metrics.lock().entry(name).or_default());
+    }
+  }
+
+  pub fn node_metrics(&self) -> Vec<(String, NodeMetrics)> {
+    self
+      .0
+      .node_metrics
+      .as_ref()
+      .map(|node_metrics| {
+        node_metrics
+          .lock()
+          .iter()
+          .map(|(name, metrics)| (name.clone(), *metrics))
+          .collect()
+      })
+      .unwrap_or_default()
+  }
+
   pub fn workunit_store(&self) -> WorkunitStore {
     self.0.workunit_store.clone()
   }
@@ -350,3 +350,15 @@ class LoaderTest(unittest.TestCase):
         # the plugin will override the alias registered by the backend
         registered_aliases = build_configuration.registered_aliases
         self.assertEqual(DummyObject2, registered_aliases.objects["override-alias"])
+
+    def test_backend_load_timings(self):
+        self.working_set.add(self.get_mock_plugin("timed-plugin", "0.0.1"))
+        with self.create_register() as backend_package:
+            build_configuration = load_backends_and_plugins(
+                ["timed-plugin"], self.working_set, [backend_package], bc_builder=self.bc_builder,
+            )
+        timings = build_configuration.backend_load_timings
+        self.assertIn(backend_package, timings)
+        self.assertIn("timed-plugin", timings)
+        self.assertIn("pants.core", timings)
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
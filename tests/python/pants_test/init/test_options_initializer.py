@@ -1,6 +1,7 @@
 # Copyright 2015 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import os
 import unittest
 
 from pants.base.build_environment import get_buildroot
@@ -43,3 +44,21 @@ class OptionsInitializerTest(unittest.TestCase):
         )
         for glob in globs:
             assert suffix not in glob
+
+    def test_reloadable_globs(self) -> None:
+        ob = OptionsBootstrapper.create(
+            env={},
+            args=[
+                "--build-file-prelude-globs=prelude/*.py",
+                f"--pants-config-files={os.path.join(get_buildroot(), 'pants.toml')}",
+            ],
+            allow_pantsrc=False,
+        )
+        bootstrap_options = ob.bootstrap_options.for_global_scope()
+        reloadable = OptionsInitializer.compute_pantsd_reloadable_globs(bootstrap_options)
+        assert "prelude/*.py" in reloadable
+        assert "pants.toml" not in reloadable
+        # Config files determine the BuildConfiguration, so changes to them must restart pantsd.
+        assert "pants.toml" in OptionsInitializer.compute_pantsd_invalidation_globs(
+            get_buildroot(), bootstrap_options
+        )
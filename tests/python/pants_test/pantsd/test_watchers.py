@@ -0,0 +1,57 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import subprocess
+import threading
+import time
+import unittest
+
+from pants.pantsd.watchers import PathWaiter, directory_waiter, process_waiter
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class WatchersTest(unittest.TestCase):
+    # Long enough that a waiter which fell back to sleeping would fail the elapsed time assertions.
+    TIMEOUT = 5.0
+
+    def _write_after_delay(self, path: str, delay: float = 0.1) -> threading.Thread:
+        thread = threading.Thread(target=lambda: (time.sleep(delay), safe_file_dump(path, "1")))
+        thread.start()
+        return thread
+
+    def test_directory_waiter_wakes_on_new_file(self):
+        with temporary_dir() as td, directory_waiter(td) as waiter:
+            writer = self._write_after_delay(os.path.join(td, "pid"))
+            start = time.time()
+            waiter.wait(self.TIMEOUT)
+            writer.join()
+            self.assertLess(time.time() - start, self.TIMEOUT)
+
+    def test_path_waiter_follows_created_directories(self):
+        with temporary_dir() as td:
+            path = os.path.join(td, "pantsd", "socket")
+            with PathWaiter(path) as waiter:
+                # The first wait installs the watch on the nearest existing directory.
+                waiter.wait(self.TIMEOUT)
+                os.mkdir(os.path.join(td, "pantsd"))
+                # The next wait re-targets the watch to the newly created directory.
+                start = time.time()
+                waiter.wait(self.TIMEOUT)
+                self.assertLess(time.time() - start, self.TIMEOUT)
+                writer = self._write_after_delay(path)
+                start = time.time()
+                waiter.wait(self.TIMEOUT)
+                writer.join()
+                self.assertLess(time.time() - start, self.TIMEOUT)
+
+    def test_process_waiter_wakes_on_exit(self):
+        process = subprocess.Popen(["sleep", "0.1"])
+        try:
+            with process_waiter(process.pid) as waiter:
+                start = time.time()
+                waiter.wait(self.TIMEOUT)
+                self.assertLess(time.time() - start, self.TIMEOUT)
+        finally:
+            process.wait()